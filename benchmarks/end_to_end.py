@@ -0,0 +1,329 @@
+"""
+End-to-end benchmark: executes every command against a local fake forge.
+
+Each command is executed in a new interpreter, as from a shell, in a
+temporary repository of each forge (GitHub, Gitlab and Bitbucket), with the
+API requests sent to a local stand-in of the forge APIs (see fake_forge.py),
+with configurable latency, pagination, dataset size and error injection. For
+each command, the wall time, the number of requests and the peak memory
+(maximum resident set size) of the process are reported.
+
+The results can be saved as JSON (--output), and compared with the saved
+results of other commit (--compare).
+
+Usage (from the repository root):
+
+    python benchmarks/end_to_end.py [--forge NAME] [--runs N] [--issues N]
+        [--comments N] [--latency MS] [--page-size N] [--error-rate RATE]
+        [--error-status CODE] [--http-cache] [--output FILE]
+        [--compare FILE]
+"""
+import argparse
+import json
+import os
+import pty
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT_PATH)
+
+from fake_forge import FakeForge
+
+FORGES = (
+    ('github', 'github.com'),
+    ('gitlab', 'gitlab.com'),
+    ('bitbucket', 'bitbucket.org'),
+)
+
+# Executed in this order: the writes after the reads, and the offline
+# commands after syncing the local mirror.
+COMMANDS = (
+    ('list', ['list']),
+    ('list --all', ['list', '--all']),
+    ('list --all --desc', ['list', '--all', '--desc']),
+    ('desc (10 issues)', ['desc'] + [str(number) for number in range(1, 11)]),
+    ('comments', ['comments', '2']),
+    ('rate-info', ['rate-info']),
+    ('comment', ['comment', '2', 'Benchmark comment']),
+    ('create', ['create', 'Benchmark issue', '--body', 'Body',
+                '--label', 'bug']),
+    ('close (5 issues)', ['close'] + [str(number) for number in range(3, 8)]),
+    ('sync --full', ['sync', '--full']),
+    ('sync', ['sync']),
+    ('list --offline', ['list', '--offline']),
+    ('desc --offline', ['desc', '--offline']
+     + [str(number) for number in range(1, 11)]),
+    ('search', ['search', 'login', 'crash']),
+)
+
+
+def run_child(base_url, arguments):
+    """
+    Executes gitssue in this process (in the child mode of the benchmark),
+    with the API URLs of the remotes pointing to the fake forge.
+    :param base_url: the URL of the fake forge.
+    :param arguments: the arguments for gitssue.
+    """
+    from gitssue.remote.bitbucket import Bitbucket
+    from gitssue.remote.github import Github
+    from gitssue.remote.gitlab import Gitlab
+
+    Github.API_URL = base_url + '/github'
+    Github.GRAPHQL_URL = Github.API_URL + '/graphql'
+    Bitbucket.API_URL = base_url + '/bitbucket/2.0'
+    gitlab_init = Gitlab.__init__
+
+    def init_gitlab(self, *args, **kwargs):
+        gitlab_init(self, *args, **kwargs)
+        self.api_url = base_url + '/gitlab/api/v4'
+
+    Gitlab.__init__ = init_gitlab
+
+    from gitssue.gitssue import cli
+
+    cli(arguments, prog_name='gitssue')
+
+
+def create_environment(directory, http_cache):
+    """
+    Creates the home directory, with the config file, and the repository of
+    each forge.
+    :param directory: the directory to create them at.
+    :param http_cache: if the HTTP cache has to be enabled.
+    :return: the environment variables for the commands, and the
+        repository directory of each forge.
+    """
+    home = os.path.join(directory, 'home')
+    os.makedirs(home)
+    settings = 'http_cache = {0}\n'.format('yes' if http_cache else 'no')
+
+    with open(os.path.join(home, '.gitssuerc'), 'w') as config_file:
+        config_file.write(
+            '[github.com]\nusername = bench\npassword = bench\n' + settings +
+            '[gitlab.com]\ntoken = bench\n' + settings +
+            '[bitbucket.org]\nusername = bench\npassword = bench\n' + settings
+        )
+
+    repositories = {}
+
+    for name, domain in FORGES:
+        repository = os.path.join(directory, name)
+        subprocess.run(['git', 'init', '-q', repository], check=True)
+        subprocess.run(['git', 'remote', 'add', 'origin',
+                        'git@{0}:bench/repo.git'.format(domain)],
+                       cwd=repository, check=True)
+        repositories[name] = repository
+
+    environment = dict(os.environ, HOME=home, PYTHONPATH=ROOT_PATH,
+                       XDG_CACHE_HOME=os.path.join(directory, 'cache'))
+
+    return environment, repositories
+
+
+def run_command(base_url, arguments, repository, environment):
+    """
+    Executes gitssue with the given arguments, in a new interpreter.
+    :return: the wall time, in milliseconds, the peak memory, in KiB, and
+        the exit status.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--child',
+               base_url] + arguments
+
+    # The color printer needs a terminal as standard input.
+    master, slave = pty.openpty()
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdin=slave,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, cwd=repository,
+                               env=environment)
+    _, status, resource_usage = os.wait4(process.pid, 0)
+    wall_time = (time.perf_counter() - start) * 1000
+
+    os.close(slave)
+    os.close(master)
+
+    process.returncode = os.WEXITSTATUS(status) \
+        if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+    # The maximum resident set size is in KiB in Linux, but in bytes in macOS.
+    peak_memory = resource_usage.ru_maxrss
+    if sys.platform == 'darwin':
+        peak_memory //= 1024
+
+    return wall_time, peak_memory, process.returncode
+
+
+def benchmark(forge, forge_name, repository, environment, runs):
+    """
+    Benchmarks every command in the repository of the forge, printing a row
+    for each one.
+    :return: the list of the results.
+    """
+    results = []
+
+    for name, arguments in COMMANDS:
+        times = []
+        memories = []
+        requests = []
+        errors = []
+        status = 0
+
+        for _ in range(runs):
+            forge.reset_stats()
+            wall_time, peak_memory, run_status = run_command(
+                forge.url, arguments, repository, environment
+            )
+            request_count, error_count = forge.reset_stats()
+
+            times.append(wall_time)
+            memories.append(peak_memory)
+            requests.append(request_count)
+            errors.append(error_count)
+            status = status or run_status
+
+        results.append({
+            'forge': forge_name,
+            'command': name,
+            'wall_ms': statistics.median(times),
+            'requests': statistics.median(requests),
+            'errors': sum(errors),
+            'peak_kib': max(memories),
+            'status': status,
+        })
+
+    return results
+
+
+def print_results(results, baseline=None):
+    """
+    Prints the results, with the change from the baseline results, if any.
+    """
+    baseline_results = {
+        (result['forge'], result['command']): result
+        for result in (baseline or {}).get('results', ())
+    }
+
+    header = '{0:<10} {1:<20} {2:>9} {3:>9} {4:>7} {5:>9} {6:>7}'.format(
+        'forge', 'command', 'wall ms', 'requests', 'errors', 'peak MiB',
+        'status'
+    )
+    if baseline is not None:
+        header += ' {0:>9} {1:>9}'.format('wall diff', 'req diff')
+    print(header)
+
+    for result in results:
+        row = '{0:<10} {1:<20} {2:>9.1f} {3:>9g} {4:>7} {5:>9.1f} {6:>7}'.format(
+            result['forge'], result['command'], result['wall_ms'],
+            result['requests'], result['errors'], result['peak_kib'] / 1024,
+            result['status']
+        )
+        previous = baseline_results.get((result['forge'], result['command']))
+
+        if previous is not None:
+            row += ' {0:>+8.1f}% {1:>+9g}'.format(
+                (result['wall_ms'] / previous['wall_ms'] - 1) * 100,
+                result['requests'] - previous['requests']
+            )
+
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--forge', action='append',
+                        choices=[name for name, _ in FORGES],
+                        help='Forge to benchmark (multiple options allowed; '
+                             'all of them by default).')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Executions of each command (3 by default).')
+    parser.add_argument('--issues', type=int, default=500,
+                        help='Issues of the dataset (500 by default).')
+    parser.add_argument('--comments', type=int, default=3,
+                        help='Maximum comments of each issue (3 by '
+                             'default).')
+    parser.add_argument('--latency', type=float, default=20,
+                        help='Latency of each response, in milliseconds (20 '
+                             'by default).')
+    parser.add_argument('--page-size', type=int, default=100,
+                        help='Maximum page size (100 by default).')
+    parser.add_argument('--error-rate', type=float, default=0,
+                        help='Fraction of the requests answered with an '
+                             'error (0 by default).')
+    parser.add_argument('--error-status', type=int, default=503,
+                        help='HTTP status of the injected errors (503 by '
+                             'default).')
+    parser.add_argument('--http-cache', action='store_true',
+                        help='Enable the HTTP cache (disabled by default, so '
+                             'every run makes the same requests).')
+    parser.add_argument('--output', help='File to save the results at.')
+    parser.add_argument('--compare',
+                        help='File of saved results to compare with.')
+    arguments = parser.parse_args()
+
+    settings = {
+        'issues': arguments.issues,
+        'comments': arguments.comments,
+        'latency': arguments.latency,
+        'page_size': arguments.page_size,
+        'error_rate': arguments.error_rate,
+        'error_status': arguments.error_status,
+        'http_cache': arguments.http_cache,
+        'runs': arguments.runs,
+    }
+    baseline = None
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        if baseline.get('settings') != settings:
+            print('Warning: the settings differ from the compared results: '
+                  '{0}\n'.format(baseline.get('settings')))
+
+    directory = tempfile.mkdtemp()
+    results = []
+
+    try:
+        environment, repositories = create_environment(directory,
+                                                       arguments.http_cache)
+
+        for forge_name, _ in FORGES:
+            if arguments.forge and forge_name not in arguments.forge:
+                continue
+
+            # A new dataset for each forge, so the writes of the previous
+            # forges don't change it.
+            forge = FakeForge(arguments.issues, arguments.comments,
+                              arguments.latency, arguments.page_size,
+                              arguments.error_rate, arguments.error_status)
+            forge.start()
+
+            try:
+                results += benchmark(forge, forge_name,
+                                     repositories[forge_name], environment,
+                                     arguments.runs)
+            finally:
+                forge.stop()
+    finally:
+        shutil.rmtree(directory)
+
+    print_results(results, baseline)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            json.dump({'settings': settings, 'results': results}, output_file,
+                      indent=2)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        run_child(sys.argv[2], sys.argv[3:])
+    else:
+        main()
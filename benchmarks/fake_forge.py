@@ -0,0 +1,576 @@
+"""
+Local stand-in for the GitHub, Gitlab and Bitbucket API endpoints used by
+gitssue, serving generated issues, for the end-to-end benchmark.
+
+Each forge is served under its own prefix of the same server:
+
+    /github             (instead of https://api.github.com)
+    /gitlab/api/v4      (instead of https://<domain>/api/v4)
+    /bitbucket/2.0      (instead of https://api.bitbucket.org/2.0)
+
+Only the REST endpoints are implemented (the GitHub GraphQL API, used when a
+token is set, is not).
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+LABELS = (('bug', 'fc2929'), ('enhancement', '84b6eb'),
+          ('question', 'cc317c'), ('docs', 'ffffff'))
+BITBUCKET_KINDS = ('bug', 'enhancement', 'proposal', 'task')
+WORDS = ('crash', 'login', 'error', 'page', 'slow', 'button', 'update',
+         'install', 'config', 'timeout', 'network', 'cache', 'color', 'list',
+         'remote', 'token', 'issue', 'comment', 'label', 'search')
+
+
+class FakeForge:
+    """
+    The fake forge: the generated dataset, and the HTTP server serving it.
+
+    Every request is counted, and, optionally, delayed (latency) or answered
+    with an error (error injection). The dataset is modified by the writes
+    (creating and closing issues, and creating comments).
+    """
+
+    def __init__(self, issues=500, comments=3, latency=0, page_size=100,
+                 error_rate=0, error_status=503, seed=0):
+        """
+        Constructor. The server is not started until start is called.
+        :param issues: the number of generated issues.
+        :param comments: the maximum number of comments of each issue.
+        :param latency: the delay of each response, in milliseconds.
+        :param page_size: the maximum page size (the requested one is used,
+            if it's lower).
+        :param error_rate: the fraction of the requests answered with
+            error_status instead (0 for none).
+        :param error_status: the HTTP status of the injected errors (with a
+            "Retry-After: 1" header for 429).
+        :param seed: the seed of the random generator.
+        """
+        self.latency = latency
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.issues = {}
+        self.comments = {}
+        self.request_count = 0
+        self.error_count = 0
+        self.server = None
+        self.thread = None
+        self._generate(issues, comments)
+
+    def _generate(self, issue_count, comment_count):
+        """
+        Generates the issues, and their comments.
+        """
+        for number in range(1, issue_count + 1):
+            updated_at = '2017-{0:02d}-{1:02d}T{2:02d}:00:00Z'.format(
+                number % 12 + 1, number % 28 + 1, number % 24
+            )
+            self.issues[number] = {
+                'number': number,
+                'title': self._text(6),
+                'body': self._text(60),
+                'closed': self.random.random() < 0.5,
+                'updated_at': updated_at,
+                'labels': [self.random.choice(LABELS)],
+            }
+            self.comments[number] = [
+                self._comment(self._text(30), updated_at)
+                for _ in range(self.random.randint(0, comment_count))
+            ]
+
+    def _text(self, length):
+        return ' '.join(self.random.choice(WORDS) for _ in range(length))
+
+    @staticmethod
+    def _comment(body, date):
+        return {'author': 'user', 'created_at': date, 'updated_at': date,
+                'body': body}
+
+    @property
+    def url(self):
+        """
+        The base URL of the server.
+        """
+        return 'http://127.0.0.1:{0}'.format(self.server.server_address[1])
+
+    def start(self):
+        """
+        Starts the server, in a background thread, in a free port.
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.forge = self
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_stats(self):
+        """
+        Resets the request and error counters.
+        :return: the request and error counts before resetting them.
+        """
+        with self.lock:
+            counts = self.request_count, self.error_count
+            self.request_count = 0
+            self.error_count = 0
+
+        return counts
+
+    def count_request(self):
+        """
+        Counts a request, deciding if an error has to be injected.
+        :return: the status of the error to inject; None for none.
+        """
+        with self.lock:
+            self.request_count += 1
+
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.error_count += 1
+                return self.error_status
+
+        return None
+
+    def get_issues(self, state='all', since=None, numbers=None,
+                   by_update=False):
+        """
+        Gets the issues matching the filters.
+        :param state: "open", "closed" or "all".
+        :param since: the minimum updated time; None for any.
+        :param numbers: the issue numbers; None for any.
+        :param by_update: if sort them from the least recently updated one,
+            instead of from the newest one.
+        :return: the list of the issues.
+        """
+        with self.lock:
+            issues = [
+                issue for issue in self.issues.values()
+                if (state == 'all' or issue['closed'] == (state == 'closed'))
+                and (since is None or issue['updated_at'] >= since)
+                and (numbers is None or issue['number'] in numbers)
+            ]
+
+        if by_update:
+            return sorted(issues, key=lambda issue: issue['updated_at'])
+
+        return sorted(issues, key=lambda issue: -issue['number'])
+
+    def get_comments(self, number):
+        with self.lock:
+            return list(self.comments.get(number, ()))
+
+    def create_issue(self, title, body, label):
+        with self.lock:
+            number = max(self.issues, default=0) + 1
+            self.issues[number] = {
+                'number': number,
+                'title': title,
+                'body': body or '',
+                'closed': False,
+                'updated_at': self._now(),
+                'labels': [label] if label else [],
+            }
+            self.comments[number] = []
+
+            return self.issues[number]
+
+    def close_issue(self, number):
+        with self.lock:
+            issue = self.issues.get(number)
+
+            if issue is not None:
+                issue['closed'] = True
+                issue['updated_at'] = self._now()
+
+            return issue
+
+    def create_comment(self, number, body):
+        with self.lock:
+            if number not in self.issues:
+                return None
+
+            comment = self._comment(body, self._now())
+            self.comments[number].append(comment)
+            self.issues[number]['updated_at'] = comment['updated_at']
+
+            return comment
+
+    @staticmethod
+    def _now():
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Request handler of the fake forge, dispatching each request to the
+    handler of its forge.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def _handle(self, method):
+        forge = self.server.forge
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        payload = json.loads(body.decode('utf-8')) if body else {}
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        segments = [unquote(segment) for segment in url.path.split('/')[1:]]
+
+        if forge.latency:
+            time.sleep(forge.latency / 1000)
+
+        error_status = forge.count_request()
+
+        if error_status is not None:
+            headers = {'Retry-After': '1'} if error_status == 429 else {}
+            return self._respond(error_status, {'message': 'Injected error'},
+                                 headers)
+
+        handlers = {
+            'github': _github,
+            'gitlab': _gitlab,
+            'bitbucket': _bitbucket,
+        }
+        handler = handlers.get(segments[0] if segments else None)
+        response = None
+
+        if handler is not None:
+            response = handler(forge, method, segments[1:], query, payload,
+                               self._get_base_url())
+
+        if response is None:
+            return self._respond(404, {'message': 'Not Found'})
+
+        self._respond(*response)
+
+    def _get_base_url(self):
+        return 'http://{0}'.format(self.headers.get('Host'))
+
+    def _respond(self, status, response_object, headers=None):
+        body = json.dumps(response_object).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _get_page(forge, issues, query, size_parameter, default_size):
+    """
+    Gets the requested page of the issues.
+    :return: the issues of the page, and if there are more pages.
+    """
+    page = int(query.get('page', ['1'])[0])
+    size = min(int(query.get(size_parameter, [default_size])[0]),
+               forge.page_size)
+    start = (page - 1) * size
+
+    return issues[start:start + size], page, start + size < len(issues)
+
+
+def _next_url(base_url, path, query, page):
+    """
+    Gets the URL of the next page.
+    """
+    parameters = dict(query, page=[str(page + 1)])
+    query_string = '&'.join(
+        '{0}={1}'.format(name, quote(value))
+        for name, values in parameters.items() for value in values
+    )
+
+    return '{0}{1}?{2}'.format(base_url, path, query_string)
+
+
+def _next_link(base_url, path, query, page):
+    """
+    Gets the "Link" header of the next page.
+    """
+    return {'Link': '<{0}>; rel="next"'.format(
+        _next_url(base_url, path, query, page)
+    )}
+
+
+def _github(forge, method, segments, query, payload, base_url):
+    """
+    Handles the GitHub REST API requests.
+    """
+    def to_github(issue):
+        return {
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': issue['body'],
+            'state': 'closed' if issue['closed'] else 'open',
+            'updated_at': issue['updated_at'],
+            'labels': [{'name': name, 'color': color}
+                       for name, color in issue['labels']],
+            'comments': len(forge.comments.get(issue['number'], ())),
+        }
+
+    def to_github_comment(comment):
+        return {
+            'user': {'login': comment['author']},
+            'created_at': comment['created_at'],
+            'updated_at': comment['updated_at'],
+            'body': comment['body'],
+        }
+
+    headers = {
+        'X-RateLimit-Limit': '5000',
+        'X-RateLimit-Remaining': str(max(0, 5000 - forge.request_count)),
+        'X-RateLimit-Reset': str(int(time.time()) + 3600),
+    }
+
+    if segments == ['rate_limit'] and method == 'GET':
+        return 200, {'rate': {
+            'limit': 5000,
+            'remaining': int(headers['X-RateLimit-Remaining']),
+            'reset': int(headers['X-RateLimit-Reset']),
+        }}, headers
+
+    if len(segments) < 4 or segments[0] != 'repos' \
+       or segments[3] != 'issues':
+        return None
+
+    rest = segments[4:]
+
+    if not rest and method == 'GET':
+        by_update = query.get('sort') == ['updated']
+        issues = forge.get_issues(query.get('state', ['open'])[0],
+                                  query.get('since', [None])[0],
+                                  by_update=by_update)
+        page_issues, page, has_next = _get_page(forge, issues, query,
+                                                'per_page', '30')
+        if has_next:
+            headers.update(_next_link(base_url, '/github/' + '/'.join(
+                segments), query, page))
+
+        return 200, [to_github(issue) for issue in page_issues], headers
+
+    if not rest and method == 'POST':
+        label = next((label for label in LABELS
+                      if label[0] in payload.get('labels', ())), None)
+        issue = forge.create_issue(payload['title'], payload.get('body'),
+                                   label)
+        return 201, to_github(issue), headers
+
+    number = int(rest[0])
+
+    if len(rest) == 1 and method == 'GET':
+        issues = forge.get_issues(numbers={number})
+        return (200, to_github(issues[0]), headers) if issues else None
+
+    if len(rest) == 1 and method == 'PATCH':
+        issue = forge.close_issue(number)
+        return (200, to_github(issue), headers) if issue else None
+
+    if rest[1:] == ['comments'] and method == 'GET':
+        if number not in forge.issues:
+            return None
+        return 200, [to_github_comment(comment)
+                     for comment in forge.get_comments(number)], headers
+
+    if rest[1:] == ['comments'] and method == 'POST':
+        comment = forge.create_comment(number, payload['body'])
+        return (201, to_github_comment(comment), headers) if comment else None
+
+    return None
+
+
+def _gitlab(forge, method, segments, query, payload, base_url):
+    """
+    Handles the Gitlab API requests.
+    """
+    def to_gitlab(issue):
+        return {
+            'iid': issue['number'],
+            'title': issue['title'],
+            'description': issue['body'],
+            'state': 'closed' if issue['closed'] else 'opened',
+            'updated_at': issue['updated_at'],
+            'labels': [{'name': name, 'color': '#' + color}
+                       for name, color in issue['labels']],
+            'user_notes_count': len(forge.comments.get(issue['number'], ())),
+        }
+
+    def to_gitlab_note(comment):
+        return {
+            'author': {'username': comment['author']},
+            'created_at': comment['created_at'],
+            'updated_at': comment['updated_at'],
+            'body': comment['body'],
+        }
+
+    # The project path ("user/repo") is a single, URL-encoded, segment.
+    if segments[:2] != ['api', 'v4'] or len(segments) < 5 \
+       or segments[2] != 'projects':
+        return None
+
+    rest = segments[4:]
+
+    if rest == ['labels'] and method == 'GET':
+        return 200, [{'name': name, 'color': '#' + color}
+                     for name, color in LABELS]
+
+    if not rest or rest[0] != 'issues':
+        return None
+
+    rest = rest[1:]
+
+    if not rest and method == 'GET':
+        state = {'opened': 'open', 'closed': 'closed'}.get(
+            query.get('state', ['all'])[0], 'all'
+        )
+        numbers = {int(number) for number in query.get('iids[]', ())} or None
+        by_update = query.get('order_by') == ['updated_at']
+        issues = forge.get_issues(state, query.get('updated_after', [None])[0],
+                                  numbers, by_update)
+        page_issues, page, has_next = _get_page(forge, issues, query,
+                                                'per_page', '20')
+        headers = {}
+        if has_next:
+            headers = _next_link(base_url, '/gitlab/' + '/'.join(
+                segments[:3]) + '/' + segments[3].replace('/', '%2F') +
+                '/issues', query, page)
+
+        return 200, [to_gitlab(issue) for issue in page_issues], headers
+
+    if not rest and method == 'POST':
+        labels = payload.get('labels') or ''
+        label = next((label for label in LABELS if label[0] in labels), None)
+        issue = forge.create_issue(payload['title'],
+                                   payload.get('description'), label)
+        return 201, to_gitlab(issue)
+
+    number = int(rest[0])
+
+    if len(rest) == 1 and method == 'PUT':
+        issue = forge.close_issue(number)
+        return (200, to_gitlab(issue)) if issue else None
+
+    if rest[1:] == ['notes'] and method == 'GET':
+        if number not in forge.issues:
+            return None
+        return 200, [to_gitlab_note(comment)
+                     for comment in forge.get_comments(number)]
+
+    if rest[1:] == ['notes'] and method == 'POST':
+        comment = forge.create_comment(number, payload['body'])
+        return (201, to_gitlab_note(comment)) if comment else None
+
+    return None
+
+
+def _bitbucket(forge, method, segments, query, payload, base_url):
+    """
+    Handles the Bitbucket API requests.
+    """
+    def to_bitbucket(issue):
+        kind = issue['labels'][0][0] if issue['labels'] else 'bug'
+        return {
+            'id': issue['number'],
+            'title': issue['title'],
+            'content': {'raw': issue['body']},
+            'state': 'resolved' if issue['closed'] else 'new',
+            'kind': kind if kind in BITBUCKET_KINDS else 'task',
+            'updated_on': issue['updated_at'],
+        }
+
+    def to_bitbucket_comment(comment):
+        return {
+            'user': {'username': comment['author']},
+            'created_on': comment['created_at'],
+            'updated_on': comment['updated_at'],
+            'content': {'raw': comment['body']},
+        }
+
+    if segments[:2] != ['2.0', 'repositories'] or len(segments) < 5 \
+       or segments[4] != 'issues':
+        return None
+
+    rest = segments[5:]
+
+    if not rest and method == 'GET':
+        state = 'all'
+        since = None
+        bitbucket_query = query.get('q', [''])[0]
+
+        if bitbucket_query.startswith('state != '):
+            state = 'open'
+        elif bitbucket_query.startswith('updated_on >= '):
+            since = bitbucket_query[len('updated_on >= '):]
+
+        issues = forge.get_issues(state, since,
+                                  by_update=query.get('sort') == ['updated_on'])
+        page_issues, page, has_next = _get_page(forge, issues, query,
+                                                'pagelen', '10')
+        response_object = {
+            'values': [to_bitbucket(issue) for issue in page_issues],
+        }
+        if has_next:
+            response_object['next'] = _next_url(
+                base_url, '/bitbucket/' + '/'.join(segments), query, page
+            )
+
+        return 200, response_object
+
+    if not rest and method == 'POST':
+        kind = payload.get('kind')
+        label = next((label for label in LABELS if label[0] == kind), None)
+        issue = forge.create_issue(payload['title'],
+                                   (payload.get('content') or {}).get('raw'),
+                                   label)
+        return 201, to_bitbucket(issue)
+
+    number = int(rest[0])
+
+    if len(rest) == 1 and method == 'PUT':
+        issue = forge.close_issue(number)
+        return (200, to_bitbucket(issue)) if issue else None
+
+    if rest[1:] == ['comments'] and method == 'GET':
+        if number not in forge.issues:
+            return None
+        return 200, {'values': [to_bitbucket_comment(comment)
+                                for comment in forge.get_comments(number)]}
+
+    if rest[1:] == ['comments'] and method == 'POST':
+        comment = forge.create_comment(
+            number, (payload.get('content') or {}).get('raw', '')
+        )
+        return (201, to_bitbucket_comment(comment)) if comment else None
+
+    return None
@@ -0,0 +1,152 @@
+"""
+Search benchmark: measures how long searching the local mirror takes, filling
+a temporary mirror with generated issues (and comments).
+
+Usage (from the repository root):
+
+    python benchmarks/search.py [--issues N] [--runs N]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gitssue.mirror.issue_mirror import IssueMirror
+
+VOCABULARY_SIZE = 10000
+LABELS = ('bug', 'enhancement', 'question', 'docs')
+
+
+def generate_vocabulary(random_generator):
+    """
+    Generates the vocabulary, of random lowercase words, from the most
+    frequent one.
+    :param random_generator: the random.Random object.
+    :return: the list of the words.
+    """
+    words = set()
+
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(
+            random_generator.choice(string.ascii_lowercase)
+            for _ in range(random_generator.randint(3, 10))
+        ))
+
+    return sorted(words, key=lambda word: random_generator.random())
+
+
+def get_queries(words):
+    """
+    Gets the queries to benchmark, with terms from very common to rare ones.
+    :param words: the vocabulary, from the most frequent word.
+    :return: the list of the query names with the query and the filters.
+    """
+    return (
+        ('common term', words[9], {}),
+        ('two terms', '{0} {1}'.format(words[49], words[99]), {}),
+        ('rare term', words[4999], {}),
+        ('prefix', words[29][:3] + '*', {}),
+        ('open + label', words[19], {'state': 'open', 'labels': ['bug']}),
+        ('no results', 'nonexistent', {}),
+    )
+
+
+def generate_issues(count, words, random_generator):
+    """
+    Generates the issues, with random words in the title and the body, with
+    a Zipf distribution (like in natural language).
+    :param count: the number of issues.
+    :param words: the vocabulary, from the most frequent word.
+    :param random_generator: the random.Random object.
+    :return: the issues, and their comments.
+    """
+    cumulative_weights = []
+    total = 0
+
+    for rank in range(1, len(words) + 1):
+        total += 1 / rank
+        cumulative_weights.append(total)
+
+    def text(length):
+        return ' '.join(random_generator.choices(
+            words, cum_weights=cumulative_weights, k=length
+        ))
+
+    issues = []
+    comments = {}
+
+    for number in range(1, count + 1):
+        issues.append({
+            'number': number,
+            'title': text(6),
+            'body': text(60),
+            'closed': random_generator.random() < 0.7,
+            'updated_at': '2017-01-01T00:00:00Z',
+            'labels': [{
+                'name': random_generator.choice(LABELS),
+                'color': 'ffffff',
+            }],
+        })
+        comments[number] = [{
+            'author': 'user',
+            'created_at': '2017-01-01T00:00:00Z',
+            'updated_at': '2017-01-01T00:00:00Z',
+            'body': text(30),
+        } for _ in range(random_generator.randint(0, 3))]
+
+    return issues, comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--issues', type=int, default=50000,
+                        help='Generated issues (50000 by default).')
+    parser.add_argument('--runs', type=int, default=20,
+                        help='Executions of each search (20 by default).')
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+
+    try:
+        mirror = IssueMirror(os.path.join(directory, 'mirror.sqlite'))
+        random_generator = random.Random(0)
+        words = generate_vocabulary(random_generator)
+        issues, comments = generate_issues(arguments.issues, words,
+                                           random_generator)
+
+        start = time.perf_counter()
+        mirror.update(issues, comments, int(time.time()))
+        print('Synced {0} issues in {1:.1f} ms.\n'.format(
+            arguments.issues, (time.perf_counter() - start) * 1000
+        ))
+
+        print('{0:<15} {1:>10} {2:>10} {3:>8}'.format(
+            'query', 'median ms', 'max ms', 'results'
+        ))
+
+        for name, query, filters in get_queries(words):
+            times = []
+
+            for _ in range(arguments.runs):
+                start = time.perf_counter()
+                results = mirror.search(query, **filters)
+                times.append((time.perf_counter() - start) * 1000)
+
+            print('{0:<15} {1:>10.1f} {2:>10.1f} {3:>8}'.format(
+                name, statistics.median(times), max(times), len(results)
+            ))
+
+        mirror.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
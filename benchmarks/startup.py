@@ -0,0 +1,138 @@
+"""
+Startup benchmark: measures how long gitssue takes to start for each command,
+executing each one in a new interpreter, as from a shell, and how much of that
+time is spent importing modules (with "python -X importtime").
+
+By default, the help of each subcommand is measured, which doesn't need the
+remote. With --repo, the read-only subcommands are also executed in the given
+repository (making the actual API requests).
+
+Usage (from the repository root):
+
+    python benchmarks/startup.py [--runs N] [--top N] [--repo PATH]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUBCOMMANDS = ('list', 'desc', 'comments', 'comment', 'create', 'close',
+               'rate-info', 'sync', 'search')
+
+COMMANDS = [
+    ('--version', ['--version']),
+    ('--help', ['--help']),
+] + [
+    (subcommand + ' --help', [subcommand, '--help'])
+    for subcommand in SUBCOMMANDS
+]
+
+REPO_COMMANDS = (
+    ('list', ['list']),
+    ('desc 1', ['desc', '1']),
+    ('comments 1', ['comments', '1']),
+    ('rate-info', ['rate-info']),
+)
+
+
+def run_command(arguments, cwd=None, import_time=False):
+    """
+    Executes gitssue with the given arguments.
+    :param arguments: the arguments for gitssue.
+    :param cwd: the directory to execute it in.
+    :param import_time: if the import times have to be reported.
+    :return: the wall time, in milliseconds, and the standard error output.
+    """
+    command = [sys.executable]
+
+    if import_time:
+        command += ['-X', 'importtime']
+
+    command += ['-m', 'gitssue'] + arguments
+    environment = dict(os.environ, PYTHONPATH=ROOT_PATH)
+
+    start = time.perf_counter()
+    process = subprocess.run(command, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, env=environment, cwd=cwd,
+                             universal_newlines=True)
+    wall_time = (time.perf_counter() - start) * 1000
+
+    return wall_time, process.stderr
+
+
+def parse_import_time(output):
+    """
+    Parses the "-X importtime" output.
+    :param output: the standard error output.
+    :return: the total import time, in milliseconds, and the list of the
+        top level imported modules with their cumulative time, in
+        milliseconds, from the heaviest one.
+    """
+    top_level_imports = []
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+
+        _, cumulative, module = line[len('import time:'):].split('|')
+
+        # Nested imports are indented with two spaces for each level.
+        if not module[1:].startswith(' '):
+            top_level_imports.append((module.strip(), int(cumulative) / 1000))
+
+    total = sum(cumulative for _, cumulative in top_level_imports)
+    top_level_imports.sort(key=lambda module: module[1], reverse=True)
+
+    return total, top_level_imports
+
+
+def benchmark(commands, runs, top, cwd=None):
+    """
+    Benchmarks the given commands, printing a row for each one.
+    :param commands: the list of the command names with their arguments.
+    :param runs: the times to execute each command.
+    :param top: the number of the heaviest imports to print.
+    :param cwd: the directory to execute the commands in.
+    """
+    for name, arguments in commands:
+        times = [run_command(arguments, cwd)[0] for _ in range(runs)]
+        _, output = run_command(arguments, cwd, import_time=True)
+        total_import_time, imports = parse_import_time(output)
+
+        print('{0:<18} {1:>10.1f} {2:>10.1f} {3:>10.1f}'.format(
+            name, statistics.median(times), min(times), total_import_time
+        ))
+
+        for module, cumulative in imports[:top]:
+            print('    {0:<32} {1:>10.1f}'.format(module, cumulative))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Executions of each command (10 by default).')
+    parser.add_argument('--top', type=int, default=0,
+                        help='Heaviest top level imports to show for each '
+                             'command (none by default).')
+    parser.add_argument('--repo',
+                        help='Repository to execute the read-only '
+                             'subcommands in.')
+    arguments = parser.parse_args()
+
+    print('{0:<18} {1:>10} {2:>10} {3:>10}'.format(
+        'command', 'median ms', 'min ms', 'import ms'
+    ))
+
+    benchmark(COMMANDS, arguments.runs, arguments.top)
+
+    if arguments.repo:
+        benchmark(REPO_COMMANDS, arguments.runs, arguments.top,
+                  arguments.repo)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ _PARSER_DEFAULTS = ({
     'password': '',
     'token': '',
 })
+_BOOLEAN_STATES = configparser.ConfigParser.BOOLEAN_STATES
 
 
 def get_config():
@@ -21,6 +22,8 @@ def get_config():
     priority. That is, the config will be set for the first file
     found, exiting the loop in that moment and returning the value.
     If no file was found, an empty dictionary will be returned.
+    Any other option set in a remote section (e.g. "pool_size") is also
+    returned, as a raw string, in that remote's dictionary.
     :return: A dictionary with the config, in
     "{'remote':{'username':'...'}..." format.
     """
@@ -43,6 +46,55 @@ def get_config():
                 'token': parser.get(remote, 'token'),
             }
 
+            for option in parser.options(remote):
+                if option not in _PARSER_DEFAULTS:
+                    config[remote][option] = parser.get(remote, option)
+
         break
 
     return config
+
+
+def get_int_option(remote_config, option, default):
+    """
+    Gets an integer option of a remote config section.
+    :param remote_config: the dictionary of the remote, as returned by
+        get_config.
+    :param option: the option name.
+    :param default: the value to return if the option is not set, or if it's
+        not a valid integer.
+    :return: the integer value of the option.
+    """
+    try:
+        return int(remote_config.get(option, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_boolean_option(remote_config, option, default):
+    """
+    Gets a boolean option of a remote config section. The accepted values are
+    the same as configparser's ones ("yes", "no", "on", "off", etc.).
+    :param remote_config: the dictionary of the remote, as returned by
+        get_config.
+    :param option: the option name.
+    :param default: the value to return if the option is not set, or if it's
+        not a valid boolean.
+    :return: the boolean value of the option.
+    """
+    value = str(remote_config.get(option, '')).lower()
+
+    return _BOOLEAN_STATES.get(value, default)
+
+
+def get_cache_directory(name):
+    """
+    Gets the path of a cache directory of gitssue, under $XDG_CACHE_HOME (or
+    ~/.cache, if it's not set). The directory is not created.
+    :param name: the name of the cache directory.
+    :return: the path of the directory.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(cache_home, 'gitssue', name)
@@ -1,8 +1,15 @@
 """ Application controller; the one that executes the actions from the CLI. """
 import logging
 import sys
-
-from requests.exceptions import RequestException
+import time
+
+from gitssue.mirror.mirror_not_synced_exception \
+    import MirrorNotSyncedException
+from gitssue.mirror.search_not_available_exception \
+    import SearchNotAvailableException
+from gitssue.remote.partially_closed_issues_exception \
+    import PartiallyClosedIssuesException
+from gitssue.request.request_exception import get_request_exception
 from gitssue.request.unsuccessful_http_request_exception \
     import UnsuccessfulHttpRequestException
 
@@ -20,7 +27,12 @@ class Controller:
         self.deps = dependencies
         dependencies.instantiate_remote_instance()
 
-    def enable_debug(self):
+    @staticmethod
+    def enable_debug():
+        """
+        Shows the debug messages. It's static so it can be enabled before the
+        controller (and, thus, the remote) is created.
+        """
         logger = logging.getLogger()
         logger.setLevel(logging.DEBUG)
         logger_stream_handler = logging.StreamHandler(sys.stdout)
@@ -29,12 +41,14 @@ class Controller:
         logger_stream_handler.setFormatter(formatter)
         logger.addHandler(logger_stream_handler)
 
-    def list(self, show_all=False, description=False):
+    def list(self, show_all=False, description=False, offline=False):
         """
         Lists the issues, with the labels (if any).
         :param show_all: If show all issues (that is, also closed ones), or
             not.
         :param description: If show description of the issue or not.
+        :param offline: If read the issues from the local mirror instead of
+            the remote, or not.
         """
         usernames_and_repo = self.deps.git_wrapper.get_username_and_repo()
         error = ''
@@ -43,37 +57,54 @@ class Controller:
         if len(usernames_and_repo) == 1:
             try:
                 username, repo = usernames_and_repo[0]
-                issue_list = self.deps.remote.get_issue_list(
-                    username,
-                    repo,
-                    show_all,
-                    description,
-                )
+                mirror = None
+
+                if offline:
+                    mirror = self.deps.instantiate_mirror(username, repo)
+                    issue_list = mirror.get_issue_list(show_all, description)
+                else:
+                    issue_list = self.deps.remote.get_issue_list(
+                        username,
+                        repo,
+                        show_all,
+                        description,
+                    )
+
+                # The issue list may be a generator requesting the next pages
+                # while printing, so the errors may happen while printing too.
+                self.deps.printer.print_issue_list(issue_list, description)
+
+                if mirror is not None:
+                    self.deps.printer.print_last_synced(
+                        mirror.get_last_synced()
+                    )
 
                 status = 0
             except TypeError:
                 error = 'No issue could be found.'
+            except MirrorNotSyncedException as not_synced:
+                error = str(not_synced)
             except UnsuccessfulHttpRequestException as \
                     unsuccessful_http_request:
                 error = self.deps.remote.parse_request_exception(
                     unsuccessful_http_request)
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
-            if not error:
-                self.deps.printer.print_issue_list(issue_list, description)
-            else:
+            if error:
                 self.deps.printer.print_error(error)
         else:
             self.deps.printer.print_error(self._MANY_ORIGINS_ERROR)
 
         return status
 
-    def desc(self, issue_numbers):
+    def desc(self, issue_numbers, offline=False):
         """
         Prints the description of the given issue numbers.
         :param issue_numbers: the issue number to retrieve the description of.
+        :param offline: If read the issues from the local mirror instead of
+            the remote, or not.
         """
         usernames_and_repo = self.deps.git_wrapper.get_username_and_repo()
         error = ''
@@ -84,24 +115,38 @@ class Controller:
             username, repo = usernames_and_repo[0]
 
             try:
-                issues, not_found_issues = self.deps.remote\
-                    .get_issues_description(
-                        username,
-                        repo,
-                        issue_numbers,
+                mirror = None
+
+                if offline:
+                    mirror = self.deps.instantiate_mirror(username, repo)
+                    issues, not_found_issues = mirror.get_issues_description(
+                        issue_numbers
                     )
+                else:
+                    issues, not_found_issues = self.deps.remote\
+                        .get_issues_description(
+                            username,
+                            repo,
+                            issue_numbers,
+                        )
 
                 if issues:
                     self.deps.printer.print_issue_list_with_desc(issues)
                 if not_found_issues:
                     self.deps.printer.print_not_found_issues(not_found_issues)
+                if mirror is not None:
+                    self.deps.printer.print_last_synced(
+                        mirror.get_last_synced()
+                    )
 
                 status = 0 if issues else 1
+            except MirrorNotSyncedException as not_synced:
+                error = str(not_synced)
             except UnsuccessfulHttpRequestException as \
                     unsuccessful_http_request:
                 error = self.deps.remote.parse_request_exception(
                     unsuccessful_http_request)
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
@@ -112,13 +157,15 @@ class Controller:
 
         return status
 
-    def comments(self, issue_number):
+    def comments(self, issue_number, offline=False):
         """
         Prints the comment thread of the given issue.
         It's not necessary to check if the "issue_number" is given because in
         this case will be done by Cement, because when the exact number of
         arguments is specified, it does the check itself.
         :param issue_number: the issue to print the comment thread of.
+        :param offline: If read the comments from the local mirror instead of
+            the remote, or not.
         """
         usernames_and_repo = self.deps.git_wrapper.get_username_and_repo()
         error = ''
@@ -127,20 +174,28 @@ class Controller:
         if len(usernames_and_repo) == 1:
             username, repo = usernames_and_repo[0]
 
+            mirror = None
+
             try:
-                comment_thread = self.deps.remote.get_issue_comments(
-                    username,
-                    repo,
-                    issue_number,
-                )
+                if offline:
+                    mirror = self.deps.instantiate_mirror(username, repo)
+                    comment_thread = mirror.get_issue_comments(issue_number)
+                else:
+                    comment_thread = self.deps.remote.get_issue_comments(
+                        username,
+                        repo,
+                        issue_number,
+                    )
 
                 status = 0 if comment_thread else 1
+            except MirrorNotSyncedException as not_synced:
+                error = str(not_synced)
             except UnsuccessfulHttpRequestException as \
                     unsuccessful_http_request:
                 error = self.deps.remote.parse_request_exception(
                     unsuccessful_http_request,
                 )
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
@@ -148,6 +203,11 @@ class Controller:
                 self.deps.printer.print_issue_comment_thread(
                     comment_thread
                 )
+
+                if mirror is not None:
+                    self.deps.printer.print_last_synced(
+                        mirror.get_last_synced()
+                    )
             else:
                 self.deps.printer.print_error(error)
 
@@ -156,6 +216,100 @@ class Controller:
 
         return status
 
+    def sync(self, full=False):
+        """
+        Syncs the local mirror of the issues, requesting only the issues
+        updated since the last sync (and the comments of these), unless a full
+        sync is requested.
+
+        :param full: If request every issue, removing also the issues of the
+            mirror that don't exist anymore, or not.
+        """
+        usernames_and_repo = self.deps.git_wrapper.get_username_and_repo()
+        error = ''
+        status = 1
+
+        if len(usernames_and_repo) == 1:
+            username, repo = usernames_and_repo[0]
+            mirror = self.deps.instantiate_mirror(username, repo)
+            synced_at = int(time.time())
+
+            try:
+                since = None if full else mirror.get_sync_cursor()
+                issues = list(self.deps.remote.get_updated_issues(
+                    username, repo, since
+                ))
+
+                # The comments are only requested for the issues that have
+                # them (or for all, if the remote doesn't tell it).
+                commented_issues = [
+                    issue.number for issue in issues if issue.comments != 0
+                ]
+                comments = self.deps.remote.get_issues_comments(
+                    username, repo, commented_issues
+                )
+
+                mirror.update(issues, dict(zip(commented_issues, comments)),
+                              synced_at, full)
+                self.deps.printer.print_synced_issues(len(issues), synced_at)
+
+                status = 0
+            except UnsuccessfulHttpRequestException as \
+                    unsuccessful_http_request:
+                error = self.deps.remote.parse_request_exception(
+                    unsuccessful_http_request,
+                )
+            except get_request_exception() as request_exception:
+                error = 'A connection error occurred:\n'
+                error += str(request_exception)
+            finally:
+                mirror.close()
+
+            if error:
+                self.deps.printer.print_error(error)
+        else:
+            self.deps.printer.print_error(self._MANY_ORIGINS_ERROR)
+
+        return status
+
+    def search(self, query, state='all', labels=(), limit=20):
+        """
+        Searches the issues of the local mirror, printing the most relevant
+        ones.
+
+        :param query: the search terms.
+        :param state: the state of the issues: "open", "closed" or "all".
+        :param labels: the labels the issues must have.
+        :param limit: the maximum number of issues to print.
+        """
+        usernames_and_repo = self.deps.git_wrapper.get_username_and_repo()
+        error = ''
+        status = 1
+
+        if len(usernames_and_repo) == 1:
+            username, repo = usernames_and_repo[0]
+            mirror = self.deps.instantiate_mirror(username, repo)
+
+            try:
+                issues = mirror.search(query, state, labels, limit)
+
+                self.deps.printer.print_search_results(issues)
+                self.deps.printer.print_last_synced(mirror.get_last_synced())
+
+                status = 0 if issues else 1
+            except (MirrorNotSyncedException,
+                    SearchNotAvailableException) as mirror_error:
+                error = str(mirror_error)
+            finally:
+                mirror.close()
+
+            if error:
+                self.deps.printer.print_error(error)
+        else:
+            self.deps.printer.print_error(self._MANY_ORIGINS_ERROR)
+
+        return status
+
     def close(self, issue_numbers):
         """
         Closes the specified issues.
@@ -177,20 +331,28 @@ class Controller:
                 )
 
                 status = 0 if closed_issues else 1
+            except PartiallyClosedIssuesException as partially_closed:
+                closed_issues = partially_closed.closed_issues
+                not_found_issues = partially_closed.not_found_issues
+                error = self._parse_exception(partially_closed.cause)
+                error += "\nThe following issues couldn't be closed: {0}".\
+                    format(', '.join(
+                        str(i) for i in partially_closed.failed_issues
+                    ))
             except UnsuccessfulHttpRequestException as \
                     unsuccessful_http_request:
                 error = self.deps.remote.parse_request_exception(
                     unsuccessful_http_request,
                 )
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
             if not_found_issues:
-                error = "The following issues couldn't be found: {0}".\
-                    format(', '.join(
-                        str(i) for i in not_found_issues
-                    ))
+                not_found_error = "The following issues couldn't be found: " \
+                    '{0}'.format(', '.join(str(i) for i in not_found_issues))
+                error = error + '\n' + not_found_error if error \
+                    else not_found_error
 
             self.deps.printer.print_closed_issues(closed_issues)
 
@@ -201,6 +363,19 @@ class Controller:
 
         return status
 
+    def _parse_exception(self, exception):
+        """
+        Gets the error message of an exception raised during a request.
+
+        :param exception: the UnsuccessfulHttpRequestException or
+            RequestException.
+        :return: the error message.
+        """
+        if isinstance(exception, UnsuccessfulHttpRequestException):
+            return self.deps.remote.parse_request_exception(exception)
+
+        return 'A connection error occurred:\n' + str(exception)
+
     def comment(self, issue, comment):
         """
         Adds a comment to the specified issue.
@@ -223,7 +398,7 @@ class Controller:
                 status = 0
             except UnsuccessfulHttpRequestException as http_error:
                 error = self.deps.remote.parse_request_exception(http_error)
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
@@ -261,7 +436,7 @@ class Controller:
                 error = self.deps.remote.parse_request_exception(
                     http_error, milestone=milestone
                 )
-            except RequestException as request_exception:
+            except get_request_exception() as request_exception:
                 error = 'A connection error occurred:\n'
                 error += str(request_exception)
 
@@ -291,7 +466,7 @@ class Controller:
                 reset,
                 unlimited
             )
-        except RequestException as request_exception:
+        except get_request_exception() as request_exception:
             error = 'A connection error occurred:\n'
             error += str(request_exception)
             self.deps.printer.print_error(error)
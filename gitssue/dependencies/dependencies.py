@@ -1,42 +1,159 @@
 """ Dependency injection. """
+import os
 from gitssue.request.requests import Requests
+from gitssue.request.rate_limit_budget import RateLimitBudget
+from gitssue.request.retry_policy import RetryPolicy
 
 from gitssue.git.shell_wrapper import ShellWrapper
 from gitssue.git.git_wrapper import GitWrapper
-from gitssue.printer.colorconsole_color_printer import ColorConsoleColorPrinter
+from gitssue.git.git_config import GitConfig
 from gitssue.printer.printer import Printer
-from gitssue.remote.github import Github
-from gitssue.remote.gitlab import Gitlab
-from gitssue.remote.bitbucket import Bitbucket
+from gitssue.printer.record_printer import RecordPrinter
 from gitssue.config import config_reader
+from gitssue.timings.timings import Timings
 
 
 class Dependencies:
     """
     Dependency injection.
+
+    Only the remote class of the repository is imported, when the remote is
+    instantiated, and the color printer only for the text output.
     """
 
-    def __init__(self):
+    TEXT_FORMAT = 'text'
+
+    def __init__(self, timings=None, output_format=TEXT_FORMAT):
+        """
+        Constructor.
+        :param timings: the Timings to record the steps of the command in
+            (git, config, requests, and printing); None for not recording
+            them.
+        :param output_format: the format of the output: TEXT_FORMAT for the
+            colored text, or one of the RecordPrinter.FORMATS for machine
+            readable records.
+        """
+        self.timings = timings or Timings()
         self.shell = ShellWrapper()
-        self.git_wrapper = GitWrapper(self.shell)
-        self.requester = Requests()
-        self.color_printer = ColorConsoleColorPrinter()
-        self.printer = Printer(self.color_printer)
+        self.git_wrapper = GitWrapper(self.shell, GitConfig(), self.timings)
+        self.requester = Requests(timings=self.timings)
+
+        if output_format == self.TEXT_FORMAT:
+            from gitssue.printer.colorconsole_color_printer \
+                import ColorConsoleColorPrinter
+
+            self.color_printer = ColorConsoleColorPrinter()
+            printer = Printer(self.color_printer)
+        else:
+            self.color_printer = None
+            printer = RecordPrinter(output_format)
+
+        self.printer = self.timings.wrap(printer, 'render')
 
     def instantiate_remote_instance(self):
         remote_domain = self.git_wrapper.get_remote_domain()
-        config = config_reader.get_config()
+        self.remote_domain = remote_domain
+        with self.timings.measure('config', 'read config'):
+            config = config_reader.get_config()
+        remote_config = config.get(remote_domain, {})
+        self.configure_requester(remote_config)
 
         if remote_domain == 'github.com':
+            from gitssue.remote.github import Github
+
             credentials = config.get('github.com', {})
-            remote = Github(self.requester, credentials=credentials)
+            max_workers = self._get_max_workers(remote_config, Github)
+            remote = Github(self.requester, credentials=credentials,
+                            max_workers=max_workers)
 
         elif remote_domain == 'bitbucket.org':
+            from gitssue.remote.bitbucket import Bitbucket
+
             credentials = config.get('bitbucket.org', {})
-            remote = Bitbucket(self.requester, credentials=credentials)
+            max_workers = self._get_max_workers(remote_config, Bitbucket)
+            remote = Bitbucket(self.requester, credentials=credentials,
+                               max_workers=max_workers)
 
         else:
+            from gitssue.remote.gitlab import Gitlab
+
             auth_token = config.get(remote_domain, {}).get('token')
-            remote = Gitlab(self.requester, auth_token, remote_domain)
+            max_workers = self._get_max_workers(remote_config, Gitlab)
+            remote = Gitlab(self.requester, auth_token, remote_domain,
+                            max_workers=max_workers)
 
         self.remote = remote
+
+    @staticmethod
+    def _get_max_workers(remote_config, remote_class):
+        """
+        Gets the "max_workers" option of the remote config section, with the
+        default of the remote class (read from the already imported remote,
+        so the remote interface is not imported otherwise).
+        :param remote_config: the config dictionary of the remote.
+        :param remote_class: the class of the remote.
+        :return: the maximum number of concurrent requests.
+        """
+        return config_reader.get_int_option(
+            remote_config, 'max_workers', remote_class.DEFAULT_MAX_WORKERS
+        )
+
+    def configure_requester(self, remote_config):
+        """
+        Applies the connection settings of the remote config section to the
+        requester, shared by every remote.
+        :param remote_config: the config dictionary of the remote.
+        """
+        cache_directory = None
+
+        if config_reader.get_boolean_option(remote_config, 'http_cache', True):
+            cache_directory = config_reader.get_cache_directory('http')
+
+        self.requester.configure(
+            pool_size=config_reader.get_int_option(
+                remote_config, 'pool_size', Requests.DEFAULT_POOL_SIZE
+            ),
+            keep_alive=config_reader.get_boolean_option(
+                remote_config, 'keep_alive', Requests.DEFAULT_KEEP_ALIVE
+            ),
+            cache_directory=cache_directory,
+            rate_limit_budget=RateLimitBudget(
+                os.path.join(config_reader.get_cache_directory('rate_limit'),
+                             'budget.json'),
+                max_wait=config_reader.get_int_option(
+                    remote_config, 'rate_limit_max_wait',
+                    RateLimitBudget.DEFAULT_MAX_WAIT
+                ),
+                reserve=config_reader.get_int_option(
+                    remote_config, 'rate_limit_reserve',
+                    RateLimitBudget.DEFAULT_RESERVE
+                ),
+            ),
+            retry_policy=RetryPolicy(
+                max_retries=config_reader.get_int_option(
+                    remote_config, 'max_retries',
+                    RetryPolicy.DEFAULT_MAX_RETRIES
+                ),
+                max_time=config_reader.get_int_option(
+                    remote_config, 'retry_max_time',
+                    RetryPolicy.DEFAULT_MAX_TIME
+                ),
+            ),
+        )
+
+    def instantiate_mirror(self, username, repository):
+        """
+        Creates the local mirror of the issues of the repository, stored in
+        the "mirror" cache directory, in a database for each repository.
+        :param username: the user owning the repository.
+        :param repository: the repository.
+        :return: the IssueMirror object.
+        """
+        from gitssue.mirror.issue_mirror import IssueMirror
+
+        path = os.path.join(
+            config_reader.get_cache_directory('mirror'), self.remote_domain,
+            username, repository + '.sqlite'
+        )
+
+        return IssueMirror(path)
@@ -0,0 +1,521 @@
+"""
+Reader of the git config of the current repository, without executing git.
+"""
+import fnmatch
+import os
+import re
+
+_SECTION_PATTERN = re.compile(
+    r'^\[\s*([\w.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]'
+)
+_KEY_PATTERN = re.compile(r'^([A-Za-z][\w-]*)\s*(?:=\s*(.*))?$')
+_ESCAPES = {'n': '\n', 't': '\t', 'b': '\b', '"': '"', '\\': '\\'}
+
+# Parsed configs of each repository, with the modification times of the read
+# files, so they are parsed again just if some file changes.
+_parsed_configs = {}
+
+
+class GitConfig:
+    """
+    Reader of the git config of the current repository, parsing the config
+    file directly instead of executing git commands. It finds the git
+    directory the same way git does (the GIT_DIR environment variable, or the
+    ".git" directory or file, for worktrees, of the current directory or any
+    of its parents), and follows the "include" and "includeIf" (with the
+    "gitdir", "gitdir/i" and "onbranch" conditions) sections.
+
+    Only the config of the repository is read (not the global or the system
+    one), so when a value is not found, the caller should fall back to git.
+    The exception are the URL rewrites ("url.<base>.insteadOf" and
+    "url.<base>.pushInsteadOf"), usually set in the global config, which are
+    read from every config and applied to the URLs of the remotes, as git
+    does.
+    """
+
+    _MAX_INCLUDE_DEPTH = 10
+
+    def __init__(self, start_path=None):
+        """
+        Constructor.
+        :param start_path: the directory to look for the repository from (the
+            current directory by default).
+        """
+        self.start_path = start_path
+
+    def find_git_dir(self):
+        """
+        Finds the git directory of the repository.
+        :return: the absolute path of the git directory; None if it's not in a
+            repository.
+        """
+        git_dir = os.environ.get('GIT_DIR')
+
+        if git_dir:
+            return os.path.abspath(git_dir) if os.path.isdir(git_dir) else None
+
+        path = os.path.abspath(self.start_path or os.getcwd())
+
+        while True:
+            dot_git = os.path.join(path, '.git')
+
+            if os.path.isdir(dot_git):
+                return dot_git
+            if os.path.isfile(dot_git):
+                return self._read_git_file(dot_git)
+
+            parent = os.path.dirname(path)
+
+            if parent == path:
+                return None
+
+            path = parent
+
+    def get(self, key):
+        """
+        Gets the value of a key (the last one, if it's set many times).
+        :param key: the key, in "section.subsection.name" format.
+        :return: the value; None if it's not set, or if not in a repository.
+        """
+        values = self.get_all(key)
+
+        return values[-1] if values else None
+
+    def get_all(self, key):
+        """
+        Gets all the values of a key. The URLs of the remotes
+        ("remote.<name>.url" and "remote.<name>.pushurl") are rewritten with
+        the "insteadOf" rules.
+        :param key: the key, in "section.subsection.name" format.
+        :return: the list of the values.
+        """
+        key = _normalize_key(key)
+        values = self.read().get(key, [])
+        is_url = key.endswith('.url') or key.endswith('.pushurl')
+
+        if values and key.startswith('remote.') and is_url:
+            rewrites = self._get_url_rewrites('insteadof')
+            values = [_rewrite_url(url, rewrites) for url in values]
+
+        return values
+
+    def get_remotes(self):
+        """
+        Gets the remotes with their URLs, like "git remote --verbose" does,
+        without the duplicates: the fetch URLs rewritten with the "insteadOf"
+        rules, and the push URLs (the fetch ones if no push URL is set)
+        rewritten with the "pushInsteadOf" rules too.
+        :return: list of remote name with its URL.
+        """
+        urls = {}
+        prefix = 'remote.'
+
+        for key, values in self.read().items():
+            url_type = key[key.rfind('.') + 1:]
+            is_url = url_type in ('url', 'pushurl')
+
+            if not key.startswith(prefix) or not is_url:
+                continue
+
+            remote_name = key[len(prefix):key.rindex('.')]
+            urls.setdefault(remote_name, {}).setdefault(url_type, values)
+
+        if not urls:
+            return []
+
+        rewrites = self._get_url_rewrites('insteadof')
+        push_rewrites = self._get_url_rewrites('pushinsteadof')
+        remotes = []
+
+        for remote_name, remote_urls in urls.items():
+            remote_url_list = [
+                _rewrite_url(url, rewrites)
+                for url in remote_urls.get('url', [])
+            ]
+
+            if 'pushurl' in remote_urls:
+                remote_url_list += [
+                    _rewrite_url(url, rewrites)
+                    for url in remote_urls['pushurl']
+                ]
+            else:
+                remote_url_list += [
+                    _rewrite_url(url, push_rewrites, rewrites)
+                    for url in remote_urls.get('url', [])
+                ]
+
+            for url in remote_url_list:
+                remote = [remote_name, url]
+
+                if remote not in remotes:
+                    remotes.append(remote)
+
+        return remotes
+
+    def read(self):
+        """
+        Reads the config of the repository, using the previously parsed one if
+        no config file has changed since then.
+        :return: dictionary with the list of the values of each key; empty if
+            not in a repository.
+        """
+        git_dir = self.find_git_dir()
+
+        if git_dir is None:
+            return {}
+
+        common_dir = self._get_common_dir(git_dir)
+        config_files = [os.path.join(common_dir, 'config')]
+        worktree_config = os.path.join(git_dir, 'config.worktree')
+
+        if git_dir != common_dir and os.path.isfile(worktree_config):
+            config_files.append(worktree_config)
+
+        return self._read_files(git_dir, git_dir, config_files)
+
+    def _read_files(self, cache_key, git_dir, config_files):
+        """
+        Reads the config files, using the previously parsed config of the
+        cache key if no read file has changed since then.
+        """
+        cached = _parsed_configs.get(cache_key)
+
+        if cached is not None and cached[0] == _get_mtimes(cached[1]):
+            return cached[2]
+
+        config = {}
+        read_files = []
+
+        for config_file in config_files:
+            self._parse_file(config_file, git_dir, config, read_files, 0)
+
+        _parsed_configs[cache_key] = (_get_mtimes(read_files), read_files,
+                                      config)
+
+        return config
+
+    def _get_url_rewrites(self, name):
+        """
+        Gets the URL rewrite rules of the system, global and repository
+        configs.
+        :param name: the name of the keys of the rules ("insteadof" or
+            "pushinsteadof").
+        :return: list of the prefix to replace with its replacement.
+        """
+        git_dir = self.find_git_dir()
+        global_config = self._read_files(('global', git_dir), git_dir,
+                                         _get_global_config_files())
+        rewrites = []
+
+        for config in (global_config, self.read()):
+            for key, values in config.items():
+                if key.startswith('url.') and key.endswith('.' + name):
+                    base = key[len('url.'):-len('.' + name)]
+                    rewrites += [(prefix, base) for prefix in values]
+
+        return rewrites
+
+    @staticmethod
+    def _read_git_file(path):
+        """
+        Reads a ".git" file (of a worktree or a submodule), that has the path
+        of the actual git directory.
+        """
+        try:
+            with open(path, encoding='utf-8') as file:
+                content = file.read().strip()
+        except OSError:
+            return None
+
+        if not content.startswith('gitdir:'):
+            return None
+
+        git_dir = content[len('gitdir:'):].strip()
+
+        return os.path.normpath(
+            os.path.join(os.path.dirname(path), git_dir)
+        )
+
+    @staticmethod
+    def _get_common_dir(git_dir):
+        """
+        Gets the directory shared by all the worktrees, where the config is.
+        """
+        try:
+            with open(os.path.join(git_dir, 'commondir'),
+                      encoding='utf-8') as file:
+                common_dir = file.read().strip()
+        except OSError:
+            return git_dir
+
+        return os.path.normpath(os.path.join(git_dir, common_dir))
+
+    def _parse_file(self, path, git_dir, config, read_files, depth):
+        """
+        Parses a config file, adding its values to the config dictionary, and
+        parsing also the included files.
+        """
+        read_files.append(path)
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return
+
+        section = ''
+        line_index = 0
+
+        while line_index < len(lines):
+            line = lines[line_index].strip()
+            line_index += 1
+
+            # Values can continue in the next line, ending it with "\".
+            while line.endswith('\\') and not line.endswith('\\\\') \
+                    and line_index < len(lines):
+                line = line[:-1] + lines[line_index].strip()
+                line_index += 1
+
+            if not line or line[0] in '#;':
+                continue
+
+            if line.startswith('['):
+                section_match = _SECTION_PATTERN.match(line)
+
+                if not section_match:
+                    continue
+
+                section = _normalize_section(*section_match.groups())
+                line = line[section_match.end():].strip()
+
+                if not line or line[0] in '#;':
+                    continue
+
+            key_match = _KEY_PATTERN.match(line)
+
+            if not key_match or not section:
+                continue
+
+            name, raw_value = key_match.groups()
+            value = 'true' if raw_value is None else _parse_value(raw_value)
+            key = section + '.' + name.lower()
+
+            if name.lower() == 'path' \
+                    and self._is_included(section, path, git_dir):
+                if depth < self._MAX_INCLUDE_DEPTH:
+                    self._parse_file(_resolve_path(value, path), git_dir,
+                                     config, read_files, depth + 1)
+                continue
+
+            config.setdefault(key, []).append(value)
+
+    def _is_included(self, section, path, git_dir):
+        """
+        Checks if the section is an "include" one, or an "includeIf" one whose
+        condition is met.
+        """
+        if section == 'include':
+            return True
+
+        if not section.startswith('includeif.'):
+            return False
+
+        condition = section[len('includeif.'):]
+
+        ignore_case = condition.startswith('gitdir/i:')
+
+        if condition.startswith('gitdir:') or ignore_case:
+            pattern = condition.split(':', 1)[1]
+
+            return _match_gitdir(pattern, path, git_dir, ignore_case)
+
+        if condition.startswith('onbranch:'):
+            branch = _get_branch(git_dir)
+            pattern = condition[len('onbranch:'):]
+
+            if pattern.endswith('/'):
+                pattern += '**'
+
+            return branch is not None and fnmatch.fnmatchcase(branch, pattern)
+
+        return False
+
+
+def _normalize_section(section, subsection=None):
+    """
+    The section names are case insensitive, but the subsection ones aren't.
+    The legacy "[section.subsection]" syntax is case insensitive.
+    """
+    if subsection is not None:
+        subsection = re.sub(r'\\(.)', r'\1', subsection)
+
+        return section.lower() + '.' + subsection
+
+    return section.lower()
+
+
+def _normalize_key(key):
+    """
+    Normalizes a "section.subsection.name" key, lowercasing the section and
+    the name, but not the subsection.
+    """
+    parts = key.split('.')
+
+    if len(parts) < 3:
+        return key.lower()
+
+    return '.'.join([parts[0].lower()] + parts[1:-1] + [parts[-1].lower()])
+
+
+def _parse_value(raw_value):
+    """
+    Parses a value, removing the quotes, the escape sequences and the
+    comments.
+    """
+    value = ''
+    quoted = False
+    index = 0
+
+    while index < len(raw_value):
+        character = raw_value[index]
+
+        if character == '\\' and index + 1 < len(raw_value):
+            index += 1
+            value += _ESCAPES.get(raw_value[index], raw_value[index])
+        elif character == '"':
+            quoted = not quoted
+        elif character in '#;' and not quoted:
+            break
+        else:
+            value += character
+
+        index += 1
+
+    return value.strip() if not quoted else value
+
+
+def _get_global_config_files():
+    """
+    Gets the paths of the system and the global config files, in the order
+    git reads them, with the same environment variables.
+    """
+    config_files = []
+
+    if not os.environ.get('GIT_CONFIG_NOSYSTEM'):
+        config_files.append('/etc/gitconfig')
+
+    if os.environ.get('GIT_CONFIG_GLOBAL'):
+        config_files.append(os.environ['GIT_CONFIG_GLOBAL'])
+    else:
+        config_home = os.environ.get('XDG_CONFIG_HOME') \
+            or os.path.expanduser('~/.config')
+        config_files.append(os.path.join(config_home, 'git', 'config'))
+        config_files.append(os.path.expanduser('~/.gitconfig'))
+
+    return config_files
+
+
+def _match_rewrite(url, rewrites):
+    """
+    Finds the rewrite rule with the longest prefix of the URL.
+    :return: the prefix and its replacement; None if no rule matches.
+    """
+    longest = None
+
+    for prefix, base in rewrites:
+        if url.startswith(prefix) \
+                and (longest is None or len(prefix) > len(longest[0])):
+            longest = (prefix, base)
+
+    return longest
+
+
+def _rewrite_url(url, *rewrite_lists):
+    """
+    Rewrites the URL with the rule with the longest matching prefix, of the
+    first list of rules with a matching one.
+    """
+    for rewrites in rewrite_lists:
+        rewrite = _match_rewrite(url, rewrites)
+
+        if rewrite is not None:
+            return rewrite[1] + url[len(rewrite[0]):]
+
+    return url
+
+
+def _resolve_path(value, config_path):
+    """
+    Resolves the path of an included file, relative to the including file.
+    """
+    path = os.path.expanduser(value)
+
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(config_path), path)
+
+    return os.path.normpath(path)
+
+
+def _match_gitdir(pattern, config_path, git_dir, ignore_case):
+    """
+    Checks if the git directory matches the "gitdir" condition pattern, with
+    the same rules of git.
+    """
+    if pattern.startswith('./'):
+        pattern = os.path.join(os.path.dirname(config_path), pattern[2:])
+    elif pattern.startswith('~/'):
+        pattern = os.path.expanduser(pattern)
+    elif not os.path.isabs(pattern):
+        pattern = '**/' + pattern
+
+    if pattern.endswith('/'):
+        pattern += '**'
+
+    git_dir = git_dir.rstrip('/')
+    candidates = (git_dir, git_dir + '/')
+
+    if ignore_case:
+        pattern = pattern.lower()
+        candidates = tuple(candidate.lower() for candidate in candidates)
+
+    # fnmatch's "*" also matches "/", so "**/" is matched as "*" too; a
+    # leading "**/" must also match an empty prefix.
+    patterns = [pattern.replace('**/', '*')]
+
+    if pattern.startswith('**/'):
+        patterns.append('*/' + pattern[3:].replace('**/', '*'))
+
+    return any(
+        fnmatch.fnmatchcase(candidate, candidate_pattern)
+        for candidate in candidates for candidate_pattern in patterns
+    )
+
+
+def _get_branch(git_dir):
+    """
+    Gets the current branch name, reading the HEAD file.
+    """
+    try:
+        with open(os.path.join(git_dir, 'HEAD'), encoding='utf-8') as file:
+            head = file.read().strip()
+    except OSError:
+        return None
+
+    prefix = 'ref: refs/heads/'
+
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+
+def _get_mtimes(paths):
+    """
+    Gets the modification time of each file (None for the missing ones).
+    """
+    mtimes = []
+
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+
+    return tuple(mtimes)
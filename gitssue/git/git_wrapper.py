@@ -1,12 +1,28 @@
 """ Wrapper for executing Git commands. """
 import re
 from gitssue.git.repo_not_found_exception import RepoNotFoundException
+from gitssue.timings.timings import Timings
 
 
 class GitWrapper:
+    """
+    Gets the information of the current repository. If a git config reader is
+    given, the remotes are read from the config files of the repository, and
+    the git commands are only executed if they are not found there.
+    """
 
-    def __init__(self, shell_wrapper):
+    def __init__(self, shell_wrapper, git_config=None, timings=None):
+        """
+        Constructor.
+        :param shell_wrapper: the shell wrapper for executing git commands.
+        :param git_config: the git config reader; None for always executing
+            git commands.
+        :param timings: the Timings to record the git lookups in; None for not
+            recording them.
+        """
         self.shell_wrapper = shell_wrapper
+        self.git_config = git_config
+        self.timings = timings or Timings()
 
     def get_username_and_repo(self):
         """
@@ -43,19 +59,25 @@ class GitWrapper:
 
         :return: the domain of the repo hoster.
         """
-        command = 'git config --get remote.origin.url'
+        with self.timings.measure('git', 'get_remote_domain'):
+            command = 'git config --get remote.origin.url'
+            url = None
+
+            if self.git_config is not None:
+                url = self.git_config.get('remote.origin.url')
 
-        url = self.shell_wrapper.execute_command(command)
+            if not url:
+                url = self.shell_wrapper.execute_command(command)
 
-        if not url:
-            raise RepoNotFoundException
+            if not url:
+                raise RepoNotFoundException
 
-        if url.startswith('git@'):
-            domain = url.replace('git@', '').split(':')[0]
-        else:
-            domain = url.replace('https://', '').split('/')[0]
+            if url.startswith('git@'):
+                domain = url.replace('git@', '').split(':')[0]
+            else:
+                domain = url.replace('https://', '').split('/')[0]
 
-        return domain
+            return domain
 
     def get_remotes_urls(self):
         """
@@ -64,23 +86,30 @@ class GitWrapper:
         so after creating the list, we have to remove the duplicates.
         :return: list of remote name with its URL.
         """
-        command = 'git remote --verbose'
+        with self.timings.measure('git', 'get_remotes_urls'):
+            command = 'git remote --verbose'
+
+            if self.git_config is not None:
+                remotes_list = self.git_config.get_remotes()
+
+                if remotes_list:
+                    return remotes_list
 
-        remotes_info = self.shell_wrapper.execute_command(command)
+            remotes_info = self.shell_wrapper.execute_command(command)
 
-        if not remotes_info:
-            raise RepoNotFoundException
+            if not remotes_info:
+                raise RepoNotFoundException
 
-        duplicated_remotes_list = []
+            duplicated_remotes_list = []
 
-        for remote_info in remotes_info.splitlines():
-            remote_name, url = remote_info.split()[:2]
-            duplicated_remotes_list.append([remote_name, url])
+            for remote_info in remotes_info.splitlines():
+                remote_name, url = remote_info.split()[:2]
+                duplicated_remotes_list.append([remote_name, url])
 
-        remotes_list = []
+            remotes_list = []
 
-        for remote in duplicated_remotes_list:
-            if remote not in remotes_list:
-                remotes_list.append(remote)
+            for remote in duplicated_remotes_list:
+                if remote not in remotes_list:
+                    remotes_list.append(remote)
 
-        return remotes_list
+            return remotes_list
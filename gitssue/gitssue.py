@@ -7,9 +7,6 @@ import click
 
 sys.path.insert(0, os.getcwd())
 
-from gitssue import remote
-from gitssue.dependencies.dependencies import Dependencies
-from gitssue.controller.controller import Controller
 from gitssue.git.repo_not_found_exception import RepoNotFoundException
 
 GITSSUE_VERSION = '2.0.0'
@@ -18,11 +15,49 @@ CONTEXT_SETTINGS = {
     'help_option_names': ['-h', '--help'],
 }
 
-try:
-    controller = Controller(Dependencies())
-except RepoNotFoundException as repo_not_found_exception:
-    print(str(repo_not_found_exception))
-    sys.exit(1)
+_controller = None
+_timings = None
+
+offline_option = click.option(
+    '--offline', '--cached', 'offline', is_flag=True,
+    help='Read from the local mirror (see "sync") instead of the remote.'
+)
+
+# The choices are not taken from RecordPrinter.FORMATS, so the printer is not
+# imported just for showing the help.
+format_option = click.option(
+    '--format', 'output_format',
+    type=click.Choice(['text', 'jsonl', 'tsv', 'json']), default='text',
+    help='The output format: colored text (the default), or a record in each '
+         'line, as JSON Lines, TSV or a JSON array.'
+)
+
+
+def get_controller(output_format='text'):
+    """
+    Gets the controller, creating it the first time. It's not created at
+    import time because creating it means looking for the remote (executing
+    git commands) and reading the config, which is not needed for showing the
+    help or the version, and fails outside a repository.
+
+    :param output_format: the output format of the command (see the
+        "--format" option).
+    """
+    global _controller
+
+    if _controller is None:
+        # Imported here, so that showing the help or the version doesn't
+        # import the requests and colorconsole packages.
+        from gitssue.controller.controller import Controller
+        from gitssue.dependencies.dependencies import Dependencies
+
+        try:
+            _controller = Controller(Dependencies(_timings, output_format))
+        except RepoNotFoundException as repo_not_found_exception:
+            print(str(repo_not_found_exception))
+            sys.exit(1)
+
+    return _controller
 
 
 def print_version(context, param, value):
@@ -39,19 +74,25 @@ def validate_issue_labels_bitbucket(context, parameter, value):
     So this validator may raise an error just if the remote object is an
     instance of Bitbucket class.
     """
-    if isinstance(controller.deps.remote, remote.bitbucket.Bitbucket):
-        if value:
-            if len(value) > 1:
-                raise click.BadParameter('Bitbucket only accepts one label.')
+    # The remote is only looked for if some label is given, so the
+    # controller is not created just for the validation (e.g. for --help).
+    if not value:
+        return value
+
+    from gitssue.remote.bitbucket import Bitbucket
+
+    if isinstance(get_controller().deps.remote, Bitbucket):
+        if len(value) > 1:
+            raise click.BadParameter('Bitbucket only accepts one label.')
 
-            label = value[0]
-            allowed_values = remote.bitbucket.Bitbucket.ALLOWED_ISSUE_KINDS
+        label = value[0]
+        allowed_values = Bitbucket.ALLOWED_ISSUE_KINDS
 
-            if label not in allowed_values:
-                raise click.BadParameter(
-                    'Bitbucket only allows the following label names: '
-                    + ', '.join(allowed_values)
-                )
+        if label not in allowed_values:
+            raise click.BadParameter(
+                'Bitbucket only allows the following label names: '
+                + ', '.join(allowed_values)
+            )
 
     return value
 
@@ -60,38 +101,67 @@ def validate_issue_labels_bitbucket(context, parameter, value):
 @click.option('--version', '-v', is_flag=True, callback=print_version,
               expose_value=False, is_eager=True, help='Show version and exit.')
 @click.option('--debug', '-d', is_flag=True, help='Show debug messages.')
-def cli(debug):
+@click.option('--timings', '-t', is_flag=True,
+              help='Show how long each step of the command took, and the '
+                   'requests made, at the end.')
+@click.pass_context
+def cli(context, debug, timings):
     if debug:
-        controller.enable_debug()
+        from gitssue.controller.controller import Controller
+
+        Controller.enable_debug()
+
+    if timings:
+        from gitssue.timings.timings import Timings
+
+        global _timings
+        _timings = Timings(enabled=True)
+        context.call_on_close(print_timings)
+
+
+def print_timings():
+    """
+    Prints the timings of the command, if the controller was created (that
+    is, if the command did something).
+    """
+    if _controller is not None and _timings is not None:
+        _controller.deps.printer.print_timings(_timings.get_summary(),
+                                               _timings.get_total())
 
 
 @click.command(help='List open issues.')
 @click.option('--all', '-a', is_flag=True, help='Show also closed issues.')
 @click.option('--desc', '-d', is_flag=True,
               help='Get description of the issues.')
-def list(all, desc):
-    status = controller.list(all, desc)
+@offline_option
+@format_option
+def list(all, desc, offline, output_format):
+    status = get_controller(output_format).list(all, desc, offline)
 
     sys.exit(status)
 
 
 @click.command(help='Get description of specified issue(s).')
 @click.argument('issues', nargs=-1, type=click.INT)
+@offline_option
+@format_option
 @click.pass_context
-def desc(context, issues):
+def desc(context, issues, offline, output_format):
     if len(issues) == 0:
         print('Usage: gitssue desc [OPTIONS] [issue [issue ...]]\n')
         print('Error: Missing argument "issue".')
         context.exit(2)
-    status = controller.desc(issues)
+    status = get_controller(output_format).desc(issues, offline)
 
     sys.exit(status)
 
 
 @click.command(help='Get the comments of specified issue.')
 @click.argument('issue', nargs=1, type=click.INT)
-def comments(issue):
-    status = controller.comments(issue)
+@offline_option
+@format_option
+def comments(issue, offline, output_format):
+    status = get_controller(output_format).comments(issue, offline)
 
     sys.exit(status)
 
@@ -100,7 +170,7 @@ def comments(issue):
 @click.argument('issue', nargs=1, type=click.INT)
 @click.argument('comment', nargs=1, type=click.STRING)
 def comment(issue, comment):
-    status = controller.comment(issue, comment)
+    status = get_controller().comment(issue, comment)
 
     sys.exit(status)
 
@@ -116,7 +186,7 @@ def comment(issue, comment):
               help='The number the milestone to associate the issue with '
               '(ignored for Bitbucket issues).')
 def create(title, body, label, milestone):
-    status = controller.create(title, body, label, milestone)
+    status = get_controller().create(title, body, label, milestone)
 
     sys.exit(status)
 
@@ -124,7 +194,7 @@ def create(title, body, label, milestone):
 @click.command(help='Shows the API rate information (remaining requests, reset'
                     ' time, etc.).')
 def rate_info():
-    controller.rate_information()
+    get_controller().rate_information()
 
 
 @click.command(help='Close specified issue(s).')
@@ -135,7 +205,34 @@ def close(context, issues):
         print('Usage: gitssue close [OPTIONS] [issue [issue ...]]\n')
         print('Error: Missing argument "issue".')
         context.exit(2)
-    status = controller.close(issues)
+    status = get_controller().close(issues)
+
+    sys.exit(status)
+
+
+@click.command(help='Sync the local mirror of the issues, requesting only the '
+                    'ones updated since the last sync.')
+@click.option('--full', '-f', is_flag=True,
+              help='Request every issue, removing also the deleted ones.')
+def sync(full):
+    status = get_controller().sync(full)
+
+    sys.exit(status)
+
+
+@click.command(help='Search the issues of the local mirror (see "sync") by '
+                    'their title, description and comments. A term ending '
+                    'with "*" matches the words starting with it.')
+@click.argument('query', nargs=-1, required=True, type=click.STRING)
+@click.option('--state', '-s', type=click.Choice(['open', 'closed', 'all']),
+              default='all', help='The state of the issues (all by default).')
+@click.option('--label', '-l', multiple=True, type=click.STRING,
+              help='Label the issues must have (multiple labels options '
+                   'allowed).')
+@click.option('--limit', '-n', type=click.IntRange(min=1), default=20,
+              help='The maximum number of issues to show (20 by default).')
+def search(query, state, label, limit):
+    status = get_controller().search(' '.join(query), state, label, limit)
 
     sys.exit(status)
 
@@ -147,3 +244,5 @@ cli.add_command(comment)
 cli.add_command(create)
 cli.add_command(close)
 cli.add_command(rate_info)
+cli.add_command(sync)
+cli.add_command(search)
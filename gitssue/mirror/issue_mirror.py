@@ -0,0 +1,492 @@
+"""
+Local mirror of the issues of a repository, stored in a SQLite database.
+"""
+import os
+import sqlite3
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label_pool import LabelPool
+from gitssue.mirror.mirror_not_synced_exception \
+    import MirrorNotSyncedException
+from gitssue.mirror.search_not_available_exception \
+    import SearchNotAvailableException
+
+
+class IssueMirror:
+    """
+    Local mirror of the issues, labels and comments of a repository, stored in
+    a SQLite database, so they can be read without any request. It's filled by
+    "gitssue sync", which only requests the issues updated since the last
+    sync; the last updated time of the synced issues (as sent by the remote,
+    so the local clock doesn't matter) is saved as the cursor for the next
+    sync.
+
+    The titles, bodies and comments of the issues are also indexed in a FTS5
+    full text search table, whose row ids are the issue numbers, so the issues
+    can be searched without any request. If the SQLite library doesn't have
+    the FTS5 extension, everything else works, but the search.
+
+    The issues are returned as the same Issue, Label and Comment objects
+    the remotes return, with the labels shared by every issue with them.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS issues (
+            number INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            closed INTEGER NOT NULL,
+            updated_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS labels (
+            name TEXT PRIMARY KEY,
+            color TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS issue_labels (
+            issue_number INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (issue_number, position)
+        );
+        CREATE TABLE IF NOT EXISTS comments (
+            issue_number INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            author TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            body TEXT NOT NULL,
+            PRIMARY KEY (issue_number, position)
+        );
+    """
+    _SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS issues_search USING fts5 (
+            title, body, comments
+        );
+        INSERT INTO issues_search (rowid, title, body, comments)
+            SELECT number, title, body, (
+                SELECT group_concat(body, char(10)) FROM comments
+                WHERE issue_number = number
+            ) FROM issues;
+    """
+    # The schema scripts of each version, applied in order.
+    _MIGRATIONS = (_SCHEMA, _SEARCH_SCHEMA)
+    # The weight of the title, body and comments for ranking the results.
+    _SEARCH_WEIGHTS = (10.0, 4.0, 1.0)
+    _SNIPPET_MARKERS = ('**', '**')
+    _SNIPPET_TOKENS = 16
+    # Lower than the maximum number of variables of old SQLite versions.
+    _MAX_QUERY_VARIABLES = 500
+
+    def __init__(self, path):
+        """
+        Constructor. The database is not opened (nor created) until it's
+        used.
+        :param path: the path of the database file.
+        """
+        self.path = path
+        self.search_available = True
+        self._connection = None
+        self._label_pool = LabelPool()
+
+    @property
+    def connection(self):
+        """
+        The connection to the database, creating it (and its directory) the
+        first time.
+        :return: the sqlite3.Connection object.
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            self._migrate(connection)
+            self._connection = connection
+
+        return self._connection
+
+    def _migrate(self, connection):
+        """
+        Applies the schema scripts of the versions newer than the database's
+        one, each in a transaction.
+        """
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+
+        for new_version, script in enumerate(self._MIGRATIONS, 1):
+            if new_version <= version:
+                continue
+
+            try:
+                # executescript commits any pending transaction, so the
+                # transaction is handled by the script itself.
+                connection.executescript(
+                    'BEGIN; {0}\nPRAGMA user_version = {1}; COMMIT;'.format(
+                        script, new_version
+                    )
+                )
+            except sqlite3.OperationalError:
+                # The FTS5 extension is not available.
+                connection.rollback()
+                self.search_available = False
+                break
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get_last_synced(self):
+        """
+        Gets when the mirror was last synced.
+        :return: the Unix timestamp of the last sync; None if it has never
+            been synced.
+        """
+        value = self._get_state('synced_at')
+
+        return int(value) if value is not None else None
+
+    def get_sync_cursor(self):
+        """
+        Gets the last updated time of the synced issues, for requesting only
+        the issues updated since then.
+        :return: the last updated time, in the format of the remote; None if
+            it has never been synced.
+        """
+        return self._get_state('cursor')
+
+    def update(self, issues, comments, synced_at, full=False):
+        """
+        Saves the synced issues and comments, replacing the previous version
+        of each one, in a single transaction.
+        :param issues: the Issue objects, with the "number", "title", "body",
+            "closed", "updated_at" and "labels" fields.
+        :param comments: dictionary with the list of the Comment objects of
+            each issue number, for the issues whose comments were requested.
+        :param synced_at: the Unix timestamp of the sync.
+        :param full: if it's a full sync, removing the issues not synced
+            (e.g. deleted ones).
+        """
+        cursor = None if full else self.get_sync_cursor()
+
+        # The connection is opened (so the migrations are applied) before
+        # checking if the search is available.
+        with self.connection as connection:
+            tables = ['issues', 'labels', 'issue_labels', 'comments']
+
+            if self.search_available:
+                tables.append('issues_search')
+
+            if full:
+                for table in tables:
+                    connection.execute('DELETE FROM {0}'.format(table))
+
+            for issue in issues:
+                self._save_issue(connection, issue)
+
+                if issue.updated_at and \
+                        (cursor is None or issue.updated_at > cursor):
+                    cursor = issue.updated_at
+
+            for issue_number, issue_comments in comments.items():
+                connection.execute(
+                    'DELETE FROM comments WHERE issue_number = ?',
+                    (issue_number,)
+                )
+                connection.executemany(
+                    'INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (issue_number, position, comment.author,
+                         comment.created_at, comment.updated_at,
+                         comment.body or '')
+                        for position, comment in enumerate(issue_comments)
+                    ]
+                )
+
+            if self.search_available:
+                updated_issues = set(issue.number for issue in issues)
+                self._index_issues(connection,
+                                   updated_issues.union(comments))
+
+            self._set_state(connection, 'cursor', cursor)
+            self._set_state(connection, 'synced_at', str(synced_at))
+
+    @staticmethod
+    def _save_issue(connection, issue):
+        """
+        Saves an issue and its labels, replacing the previous ones.
+        """
+        connection.execute(
+            'INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)',
+            (issue.number, issue.title, issue.body or '',
+             int(bool(issue.closed)), issue.updated_at)
+        )
+        connection.execute(
+            'DELETE FROM issue_labels WHERE issue_number = ?',
+            (issue.number,)
+        )
+        connection.executemany(
+            'INSERT OR REPLACE INTO labels VALUES (?, ?)',
+            [(label.name, label.color) for label in issue.labels]
+        )
+        connection.executemany(
+            'INSERT INTO issue_labels VALUES (?, ?, ?)',
+            [
+                (issue.number, position, label.name)
+                for position, label in enumerate(issue.labels)
+            ]
+        )
+
+    @staticmethod
+    def _index_issues(connection, issue_numbers):
+        """
+        Indexes the given issues for the search, replacing the previous index
+        of each one.
+        """
+        rows = [(issue_number,) for issue_number in issue_numbers]
+
+        connection.executemany(
+            'DELETE FROM issues_search WHERE rowid = ?', rows
+        )
+        connection.executemany(
+            'INSERT INTO issues_search (rowid, title, body, comments) '
+            'SELECT number, title, body, ('
+            'SELECT group_concat(body, char(10)) FROM comments '
+            'WHERE issue_number = number'
+            ') FROM issues WHERE number = ?', rows
+        )
+
+    def search(self, query, state='all', labels=(), limit=20):
+        """
+        Searches the issues whose title, body or comments have every term of
+        the query, from the most relevant one (the matches in the title weigh
+        more than in the body, and these more than in the comments).
+
+        Each term is searched as it is, without any special meaning, but a
+        trailing "*" searches the words starting with the term.
+
+        :param query: the search terms, separated by spaces.
+        :param state: the state of the issues: "open", "closed" or "all".
+        :param labels: the labels the issues must have (all of them).
+        :param limit: the maximum number of issues to return.
+        :raises MirrorNotSyncedException: if it has never been synced.
+        :raises SearchNotAvailableException: if SQLite doesn't have FTS5.
+        :return: the list of the found Issue objects, with the "number",
+            "title", "closed", "labels" and "snippet" (the most relevant
+            fragment, with the found terms highlighted) fields.
+        """
+        self._check_synced()
+
+        if not self.search_available:
+            raise SearchNotAvailableException
+
+        match = self._build_match_query(query)
+
+        if not match:
+            return []
+
+        # The issues are ranked first, and the snippets (which are costly)
+        # are made just for the returned ones.
+        parameters = [match]
+        sql = 'SELECT issues.number, issues.title, issues.closed ' \
+            'FROM issues_search JOIN issues ' \
+            'ON issues.number = issues_search.rowid ' \
+            'WHERE issues_search MATCH ?'
+
+        if state == 'open':
+            sql += ' AND issues.closed = 0'
+        elif state == 'closed':
+            sql += ' AND issues.closed = 1'
+
+        for label in labels:
+            sql += ' AND issues.number IN (SELECT issue_number ' \
+                'FROM issue_labels WHERE name = ?)'
+            parameters.append(label)
+
+        sql += ' ORDER BY bm25(issues_search, {0}, {1}, {2}) LIMIT ?'.format(
+            *self._SEARCH_WEIGHTS
+        )
+        parameters.append(limit)
+
+        rows = self.connection.execute(sql, parameters).fetchall()
+        numbers = [row[0] for row in rows]
+        issue_labels = self._get_labels(numbers)
+        snippets = {}
+
+        for index in range(0, len(numbers), self._MAX_QUERY_VARIABLES):
+            chunk = numbers[index:index + self._MAX_QUERY_VARIABLES]
+            snippet_rows = self.connection.execute(
+                "SELECT rowid, snippet(issues_search, -1, ?, ?, '...', ?) "
+                'FROM issues_search WHERE issues_search MATCH ? '
+                'AND rowid IN ({0})'.format(', '.join('?' * len(chunk))),
+                list(self._SNIPPET_MARKERS) + [self._SNIPPET_TOKENS, match]
+                + chunk
+            )
+            snippets.update(snippet_rows)
+
+        return [
+            Issue(number, title, labels=issue_labels.get(number, ()),
+                  closed=bool(closed), snippet=snippets.get(number, ''))
+            for number, title, closed in rows
+        ]
+
+    @staticmethod
+    def _build_match_query(query):
+        """
+        Builds the FTS5 query of the search terms, quoting each term, so the
+        characters with a special meaning in the FTS5 syntax (e.g. "-" or ":")
+        are searched as they are. The terms ending with "*" are prefix
+        searches.
+        """
+        terms = []
+
+        for term in query.split():
+            prefix = term.endswith('*')
+            term = term.rstrip('*')
+
+            if term:
+                terms.append('"{0}"{1}'.format(term.replace('"', '""'),
+                                               '*' if prefix else ''))
+
+        return ' '.join(terms)
+
+    def get_issue_list(self, show_all=False, get_description=False):
+        """
+        Gets the issue list, from the newest one.
+        :param show_all: show also closed issues.
+        :param get_description: get also the description of the issues.
+        :raises MirrorNotSyncedException: if it has never been synced.
+        :return: the list of the Issue objects.
+        """
+        self._check_synced()
+
+        query = 'SELECT number, title, body FROM issues'
+
+        if not show_all:
+            query += ' WHERE closed = 0'
+
+        rows = self.connection.execute(query + ' ORDER BY number DESC')
+        issue_labels = self._get_labels()
+
+        return [
+            Issue(number, title, body if get_description else '',
+                  issue_labels.get(number, ()))
+            for number, title, body in rows
+        ]
+
+    def get_issues_description(self, issue_numbers):
+        """
+        Gets the specified issues, with the descriptions.
+        :param issue_numbers: the issue identifier(s).
+        :raises MirrorNotSyncedException: if it has never been synced.
+        :return: the issues descriptions, and the not found issues.
+        """
+        self._check_synced()
+
+        numbers = sorted(set(int(number) for number in issue_numbers))
+        found_issues = {}
+
+        for index in range(0, len(numbers), self._MAX_QUERY_VARIABLES):
+            chunk = numbers[index:index + self._MAX_QUERY_VARIABLES]
+            rows = self.connection.execute(
+                'SELECT number, title, body FROM issues '
+                'WHERE number IN ({0})'.format(', '.join('?' * len(chunk))),
+                chunk
+            )
+
+            for number, title, body in rows:
+                found_issues[number] = (title, body)
+
+        issue_labels = self._get_labels(list(found_issues))
+        issues_descriptions = []
+        not_found_issues = []
+
+        for issue_number in issue_numbers:
+            issue = found_issues.get(int(issue_number))
+
+            if issue is None:
+                not_found_issues.append(issue_number)
+                continue
+
+            issues_descriptions.append(Issue(
+                issue_number, issue[0], issue[1],
+                issue_labels.get(int(issue_number), ())
+            ))
+
+        return issues_descriptions, not_found_issues
+
+    def get_issue_comments(self, issue_number):
+        """
+        Gets the comments made in the issue ticket.
+        :param issue_number: the issue number to get the comments of.
+        :raises MirrorNotSyncedException: if it has never been synced.
+        :return: the Comment objects.
+        """
+        self._check_synced()
+
+        rows = self.connection.execute(
+            'SELECT author, created_at, updated_at, body FROM comments '
+            'WHERE issue_number = ? ORDER BY position',
+            (int(issue_number),)
+        )
+
+        return [
+            Comment(author, created_at, updated_at, body)
+            for author, created_at, updated_at, body in rows
+        ]
+
+    def _get_labels(self, issue_numbers=None):
+        """
+        Gets the labels of the issues, with a single query.
+        :param issue_numbers: the issues to get the labels of; None for every
+            issue.
+        :return: dictionary with the list of the Label objects of each issue
+            number.
+        """
+        query = 'SELECT issue_labels.issue_number, labels.name, ' \
+            'labels.color FROM issue_labels JOIN labels ' \
+            'ON labels.name = issue_labels.name'
+        parameters = []
+
+        if issue_numbers is not None:
+            if len(issue_numbers) > self._MAX_QUERY_VARIABLES:
+                issue_numbers = None
+            else:
+                query += ' WHERE issue_labels.issue_number IN ({0})'.format(
+                    ', '.join('?' * len(issue_numbers))
+                )
+                parameters = issue_numbers
+
+        issue_labels = {}
+        rows = self.connection.execute(
+            query + ' ORDER BY issue_labels.issue_number, '
+            'issue_labels.position', parameters
+        )
+
+        for issue_number, name, color in rows:
+            issue_labels.setdefault(issue_number, []).append(
+                self._label_pool.get(name, color)
+            )
+
+        return issue_labels
+
+    def _check_synced(self):
+        if self.get_last_synced() is None:
+            raise MirrorNotSyncedException
+
+    def _get_state(self, key):
+        row = self.connection.execute(
+            'SELECT value FROM sync_state WHERE key = ?', (key,)
+        ).fetchone()
+
+        return row[0] if row is not None else None
+
+    @staticmethod
+    def _set_state(connection, key, value):
+        connection.execute(
+            'INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (key, value)
+        )
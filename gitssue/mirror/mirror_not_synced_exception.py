@@ -0,0 +1,17 @@
+""" Exception for when the local mirror of the issues hasn't been synced. """
+
+
+class MirrorNotSyncedException(Exception):
+    """
+    Exception for when the local mirror of the issues is read before being
+    synced for the first time.
+    """
+
+    _ERROR_MESSAGE = 'The local mirror of the issues has not been synced ' \
+        'yet. Run "gitssue sync" first.'
+
+    def __init__(self):
+        """
+        Superclass constructor call.
+        """
+        super(MirrorNotSyncedException, self).__init__(self._ERROR_MESSAGE)
@@ -0,0 +1,17 @@
+""" Exception for when the local mirror can't be searched. """
+
+
+class SearchNotAvailableException(Exception):
+    """
+    Exception for when the local mirror can't be searched, because the SQLite
+    library doesn't have the FTS5 extension.
+    """
+
+    _ERROR_MESSAGE = 'The search is not available: the SQLite library does ' \
+        'not have the FTS5 extension.'
+
+    def __init__(self):
+        """
+        Superclass constructor call.
+        """
+        super(SearchNotAvailableException, self).__init__(self._ERROR_MESSAGE)
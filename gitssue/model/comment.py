@@ -0,0 +1,36 @@
+"""
+Comment of an issue.
+"""
+
+
+class Comment:
+    """
+    Comment of an issue.
+    """
+
+    __slots__ = ('author', 'created_at', 'updated_at', 'body')
+
+    def __init__(self, author, created_at, updated_at, body):
+        """
+        Constructor.
+        :param author: the username of the author.
+        :param created_at: the creation time, in the format of the remote.
+        :param updated_at: the last update time, in the format of the remote.
+        :param body: the text of the comment.
+        """
+        self.author = author
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.body = body
+
+    def __eq__(self, other):
+        if not isinstance(other, Comment):
+            return NotImplemented
+
+        return (self.author, self.created_at, self.updated_at, self.body) == \
+            (other.author, other.created_at, other.updated_at, other.body)
+
+    def __repr__(self):
+        return 'Comment({0!r}, {1!r}, {2!r}, {3!r})'.format(
+            self.author, self.created_at, self.updated_at, self.body
+        )
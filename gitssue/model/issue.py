@@ -0,0 +1,50 @@
+"""
+Issue of a repository.
+"""
+
+
+class Issue:
+    """
+    Issue of a repository, as returned by the remotes and the local mirror,
+    and shown by the printer. Only the fields known by the operation that
+    got the issue are set; the rest keep their defaults.
+    """
+
+    __slots__ = ('number', 'title', 'body', 'labels', 'closed', 'updated_at',
+                 'comments', 'snippet')
+
+    def __init__(self, number, title, body='', labels=(), closed=False,
+                 updated_at=None, comments=None, snippet=None):
+        """
+        Constructor.
+        :param number: the number of the issue.
+        :param title: the title.
+        :param body: the description; empty if it was not requested.
+        :param labels: the Label objects of the issue.
+        :param closed: if the issue is closed.
+        :param updated_at: the last update time, in the format of the remote.
+        :param comments: the number of comments; None if it's unknown.
+        :param snippet: the most relevant fragment of the issue, for the
+            search results.
+        """
+        self.number = number
+        self.title = title
+        self.body = body
+        self.labels = tuple(labels)
+        self.closed = closed
+        self.updated_at = updated_at
+        self.comments = comments
+        self.snippet = snippet
+
+    def __eq__(self, other):
+        if not isinstance(other, Issue):
+            return NotImplemented
+
+        return all(getattr(self, field) == getattr(other, field)
+                   for field in self.__slots__)
+
+    def __repr__(self):
+        return 'Issue({0})'.format(', '.join(
+            '{0}={1!r}'.format(field, getattr(self, field))
+            for field in self.__slots__
+        ))
@@ -0,0 +1,37 @@
+"""
+Label of an issue.
+"""
+
+
+class Label:
+    """
+    Label of an issue, with its name and its color (hexadecimal, without the
+    "#"). The labels are immutable, so a single object can be shared by every
+    issue with the label (see LabelPool).
+    """
+
+    __slots__ = ('name', 'color')
+
+    def __init__(self, name, color):
+        """
+        Constructor.
+        :param name: the name of the label.
+        :param color: the hexadecimal color of the label.
+        """
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'color', color)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Label objects are immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, Label):
+            return NotImplemented
+
+        return self.name == other.name and self.color == other.color
+
+    def __hash__(self):
+        return hash((self.name, self.color))
+
+    def __repr__(self):
+        return 'Label({0!r}, {1!r})'.format(self.name, self.color)
@@ -0,0 +1,35 @@
+"""
+Pool of the labels of a repository.
+"""
+from gitssue.model.label import Label
+
+
+class LabelPool:
+    """
+    Pool of the labels of a repository, so every issue with the same label
+    shares a single Label object, instead of a copy for each issue.
+    """
+
+    __slots__ = ('_labels',)
+
+    def __init__(self):
+        self._labels = {}
+
+    def get(self, name, color):
+        """
+        Gets the label with the given name and color, creating it the first
+        time.
+        :param name: the name of the label.
+        :param color: the hexadecimal color of the label.
+        :return: the Label object.
+        """
+        key = (name, color)
+        label = self._labels.get(key)
+
+        if label is None:
+            label = self._labels.setdefault(key, Label(name, color))
+
+        return label
+
+    def __len__(self):
+        return len(self._labels)
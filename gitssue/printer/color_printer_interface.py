@@ -7,23 +7,44 @@ from abc import ABCMeta, abstractmethod
 class ColorPrinterInterface(metaclass=ABCMeta):
     """
     The interface the concrete color printer will have to implement.
+
+    The colored text is formatted as strings, so the printer can buffer it
+    with the rest of the output.
     """
 
     @abstractmethod
-    def print_colored_line(self, line, hex_color='ffffff'):
+    def format_colored_line(self, line, hex_color='ffffff'):
         """
-        Prints the given line with the given color. After printing it, it must
+        Formats the given line with the given color. After the line, it must
         reset the color.
-        :param line: The line to print.
-        :param hex_color: The color of the line to print.
+        :param line: The line to format.
+        :param hex_color: The color of the line.
+        :return: the colored line, ending with a newline.
         """
         pass
 
     @abstractmethod
-    def print_labels(self, labels):
+    def format_labels(self, labels):
         """
-        Prints the label list. Even if they are printed in the same line, we
-        need another method because labels can have different colors.
-        :param labels: The label dictionary, with the name and the color code.
+        Formats the label list. Even if they are in the same line, we need
+        another method because labels can have different colors.
+        :param labels: The Label objects.
+        :return: the colored labels line, ending with a newline.
         """
         pass
+
+    def print_colored_line(self, line, hex_color='ffffff'):
+        """
+        Prints the given line with the given color, and, then, resetting the
+        color.
+        :param line: The line to print.
+        :param hex_color: The color of the line to print.
+        """
+        print(self.format_colored_line(line, hex_color), end='')
+
+    def print_labels(self, labels):
+        """
+        Prints the label list.
+        :param labels: The Label objects.
+        """
+        print(self.format_labels(labels), end='')
@@ -2,6 +2,8 @@
 The color printer module, implemented with the 'colorconsole' package.
 """
 from __future__ import print_function
+import contextlib
+from io import StringIO
 from gitssue.printer.color_printer_interface import ColorPrinterInterface
 from colorconsole import terminal
 
@@ -9,6 +11,9 @@ from colorconsole import terminal
 class ColorConsoleColorPrinter(ColorPrinterInterface):
     """
     The color printer module, implemented with the 'colorconsole' package.
+
+    The escape sequences of each color are taken from colorconsole once, and
+    reused for every line with that color.
     """
 
     def __init__(self):
@@ -16,31 +21,71 @@ class ColorConsoleColorPrinter(ColorPrinterInterface):
         Gets the screen from the colorconsole.terminal.
         """
         self.screen = terminal.get_terminal(conEmu=False)
+        self._color_escapes = {}
+        self._reset_escape = None
 
-    def print_colored_line(self, line, hex_color='ffffff'):
+    def format_colored_line(self, line, hex_color='ffffff'):
         """
-        Prints the given line with the given color, and, then, resetting the
+        Formats the given line with the given color, and, then, resetting the
         color.
-        :param line: The line to print.
-        :param hex_color: The color of the line to print.
+        :param line: The line to format.
+        :param hex_color: The color of the line.
+        :return: the colored line, ending with a newline.
+        """
+        return '{0}{1}\n{2}'.format(self._get_color_escape(hex_color), line,
+                                    self._get_reset_escape())
+
+    def format_labels(self, labels):
+        """
+        Formats the label list. We need another method because labels can
+        have different colors.
+        :param labels: The Label objects.
+        :return: the colored labels line, ending with a newline.
+        """
+        line = ''.join(
+            self._get_color_escape(label.color) + label.name + ' '
+            for label in labels
+        )
+
+        return line + '\n' + self._get_reset_escape()
+
+    def _get_color_escape(self, hex_color):
+        """
+        Gets the escape sequence for setting the given foreground color.
+        :param hex_color: The color.
+        :return: the escape sequence.
+        """
+        escape = self._color_escapes.get(hex_color)
+
+        if escape is None:
+            red, green, blue = list(bytes.fromhex(hex_color))
+            escape = self._capture(self.screen.xterm24bit_set_fg_color, red,
+                                   green, blue)
+            self._color_escapes[hex_color] = escape
+
+        return escape
+
+    def _get_reset_escape(self):
+        """
+        Gets the escape sequence for resetting the colors.
+        :return: the escape sequence.
         """
-        red, green, blue = list(bytes.fromhex(hex_color))
+        if self._reset_escape is None:
+            self._reset_escape = self._capture(self.screen.reset_colors)
 
-        self.screen.xterm24bit_set_fg_color(red, green, blue)
-        print(line)
-        self.screen.reset_colors()
+        return self._reset_escape
 
-    def print_labels(self, labels):
+    @staticmethod
+    def _capture(screen_method, *args):
         """
-        Prints the label list. We need another method because labels can have
-        different colors.
-        :param labels: The label dictionary, with the name and the color code.
+        Captures what a method of the colorconsole screen writes to the
+        standard output.
+        :param screen_method: the method of the screen.
+        :return: the written escape sequence.
         """
-        for label in labels:
-            red, green, blue = list(bytes.fromhex(label['color']))
-            self.screen.xterm24bit_set_fg_color(red, green, blue)
-            print(label['name'] + ' ', end='', flush=True)
+        output = StringIO()
 
-        print()
+        with contextlib.redirect_stdout(output):
+            screen_method(*args)
 
-        self.screen.reset_colors()
+        return output.getvalue()
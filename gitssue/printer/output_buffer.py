@@ -0,0 +1,64 @@
+"""
+Buffer for the output of the printer.
+"""
+import sys
+
+
+class OutputBuffer:
+    """
+    Buffer for the output of the printer, written to the stream in large
+    chunks instead of with a write (and, for the terminals and pipes, with a
+    system call) for every line, which dominates the rendering of long issue
+    lists.
+
+    The buffer is written when it fills, and when the "with" block of the
+    output finishes (also if it finishes with an exception, so the already
+    rendered output is not lost).
+    """
+
+    DEFAULT_SIZE = 64 * 1024
+
+    def __init__(self, stream=None, size=DEFAULT_SIZE):
+        """
+        Constructor.
+        :param stream: the stream to write the output to; None for the
+            standard output (the current one when the buffer is written).
+        :param size: the number of characters from which the buffer is
+            written.
+        """
+        self.stream = stream
+        self.size = size
+        self._chunks = []
+        self._length = 0
+
+    def write(self, text):
+        """
+        Adds the text to the buffer, writing the buffer if it fills.
+        :param text: the text to write.
+        """
+        self._chunks.append(text)
+        self._length += len(text)
+
+        if self._length >= self.size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffer to the stream, with a single write.
+        """
+        if not self._chunks:
+            return
+
+        output = ''.join(self._chunks)
+        self._chunks = []
+        self._length = 0
+
+        stream = self.stream or sys.stdout
+        stream.write(output)
+        stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.flush()
@@ -1,11 +1,17 @@
 """ CLI printer module. """
+import sys
 from datetime import datetime
+from gitssue.printer.output_buffer import OutputBuffer
 from gitssue.printer.printer_interface import PrinterInterface
 
 
 class Printer(PrinterInterface):
     """
     CLI printer module for printing the output.
+
+    The output of each method is written to an OutputBuffer, and written to
+    the standard output in large chunks, when the buffer fills and when the
+    method finishes.
     """
 
     _ISSUE_TITLE_COLOR = 'c3a000'
@@ -13,98 +19,137 @@ class Printer(PrinterInterface):
     _COMMENT_DATE_COLOR = 'c3a000'
     _ERROR_COLOR = 'ff0000'
 
-    def __init__(self, color_printer):
+    def __init__(self, color_printer, output=None):
         """
         Gets the specific implementation of ColorPrinterInterface.
         :param color_printer: implementation of ColorPrinterInterface.
+        :param output: the OutputBuffer to write the output to; None for
+            buffering the standard output.
         """
         self.color_printer = color_printer
+        self.output = output or OutputBuffer()
 
     def print_issue_list(self, issues, show_description=False):
         """
         Prints the issue list with labels, if any, these ones with colors.
         The issue title is printed with colors only if the descriptions for
         these are going to be displayed.
-        :param issues: the issue list.
+        The issues are printed as they are iterated, so it can also be a
+        generator.
+        :param issues: the Issue objects.
         :param show_description: if show also the descriptions or not.
         """
-        if issues:
-            for issue in issues:
-                issue_title = '#{0}: {1}'.format(
-                    issue['number'], issue['title'])
+        printed_issues = 0
+
+        with self.output:
+            for issue in issues or ():
+                issue_title = '#{0}: {1}'.format(issue.number, issue.title)
 
                 if show_description:
-                    self.color_printer.print_colored_line(
-                        issue_title, self._ISSUE_TITLE_COLOR)
+                    self.output.write(self.color_printer.format_colored_line(
+                        issue_title, self._ISSUE_TITLE_COLOR))
                 else:
-                    print(issue_title)
+                    self.output.write(issue_title + '\n')
 
-                self.color_printer.print_labels(issue.get('labels', list()))
+                self.output.write(
+                    self.color_printer.format_labels(issue.labels))
 
-                if show_description and issue.get('description'):
-                    print(issue['description'])
+                if show_description and issue.body:
+                    self.output.write(issue.body + '\n')
 
-                print()
-        else:
-            print('No issue could be found.')
+                self.output.write('\n')
+                printed_issues += 1
+
+            if not printed_issues:
+                self.output.write('No issue could be found.\n')
 
     def print_issue_list_with_desc(self, issues):
         """
         Prints the issue list like in "print_issue_list", but also with the
         description.
-        :param issues: the issues dictionary.
+        :param issues: the Issue objects.
         """
-        if issues:
-            for issue in issues:
-                issue_title = '#{0}: {1}'.format(
-                    issue['number'],
-                    issue['description']['title']
-                )
-                self.color_printer.print_colored_line(
-                    issue_title, self._ISSUE_TITLE_COLOR)
+        with self.output:
+            if issues:
+                for issue in issues:
+                    issue_title = '#{0}: {1}'.format(issue.number,
+                                                     issue.title)
+                    self.output.write(self.color_printer.format_colored_line(
+                        issue_title, self._ISSUE_TITLE_COLOR))
 
-                if issue.get('labels'):
-                    self.color_printer.print_labels(issue['labels'])
+                    if issue.labels:
+                        self.output.write(
+                            self.color_printer.format_labels(issue.labels))
 
-                print(issue['description']['body'])
-                print('\n')
-        else:
-            print('No issue could be found.')
+                    self.output.write((issue.body or '') + '\n')
+                    self.output.write('\n\n')
+            else:
+                self.output.write('No issue could be found.\n')
 
     def print_issue_comment_thread(self, comment_thread):
         """
         Prints the given comment thread belonging to the issue.
-        :param comment_thread: the thread of comments.
+        :param comment_thread: the Comment objects of the thread.
         """
-        if comment_thread:
-            for comment in comment_thread:
-                author = 'Author: {0}'.format(comment['author'])
-                self.color_printer.print_colored_line(
-                    author, self._COMMENT_AUTHOR_COLOR)
+        with self.output:
+            if comment_thread:
+                for comment in comment_thread:
+                    author = 'Author: {0}'.format(comment.author)
+                    self.output.write(self.color_printer.format_colored_line(
+                        author, self._COMMENT_AUTHOR_COLOR))
 
-                date = 'Date: {0}'.format(comment['created_at'])
-                self.color_printer.print_colored_line(
-                    date, self._COMMENT_DATE_COLOR)
+                    date = 'Date: {0}'.format(comment.created_at)
+                    self.output.write(self.color_printer.format_colored_line(
+                        date, self._COMMENT_DATE_COLOR))
 
-                print('\n{0}\n\n'.format(comment['body']))
+                    self.output.write('\n{0}\n\n\n'.format(comment.body))
+
+            else:
+                self.output.write('No comment could be found.\n')
+
+    def print_search_results(self, issues):
+        """
+        Prints the issues found in the search, from the most relevant one,
+        like in "print_issue_list", but with the most relevant fragment of
+        each issue instead of the description.
+        :param issues: the found Issue objects.
+        """
+        with self.output:
+            if issues:
+                for issue in issues:
+                    issue_title = '#{0}: {1}'.format(issue.number,
+                                                     issue.title)
 
-        else:
-            print('No comment could be found.')
+                    if issue.closed:
+                        issue_title += ' (closed)'
+
+                    self.output.write(self.color_printer.format_colored_line(
+                        issue_title, self._ISSUE_TITLE_COLOR))
+
+                    if issue.labels:
+                        self.output.write(
+                            self.color_printer.format_labels(issue.labels))
+
+                    self.output.write(' '.join(issue.snippet.split()))
+                    self.output.write('\n\n')
+            else:
+                self.output.write('No issue could be found.\n')
 
     def print_closed_issues(self, closed_issues):
         """
         Prints the closed issues.
 
-        :param closed_issues: the closed issues.
+        :param closed_issues: the closed Issue objects.
         """
-        if closed_issues:
-            print('The following issues have been closed:\n')
+        with self.output:
+            if closed_issues:
+                self.output.write('The following issues have been closed:\n\n')
 
-            for issue in closed_issues:
-                line = '#{0}: {1}\n'.format(issue['number'], issue['title'])
-                print(line)
-        else:
-            print('No issue could be found.')
+                for issue in closed_issues:
+                    self.output.write('#{0}: {1}\n\n'.format(issue.number,
+                                                             issue.title))
+            else:
+                self.output.write('No issue could be found.\n')
 
     def print_created_comment(self, issue):
         """
@@ -113,7 +158,12 @@ class Printer(PrinterInterface):
         :param issue: the issue the comment has been created for.
         :param comment: the comment that has been created.
         """
-        print('The comment has been created for the issue #{0}.'.format(issue))
+        with self.output:
+            self.output.write(
+                'The comment has been created for the issue #{0}.\n'.format(
+                    issue
+                )
+            )
 
     def print_created_issue(self, issue):
         """
@@ -121,7 +171,10 @@ class Printer(PrinterInterface):
 
         :param number: the issue number.
         """
-        print('The issue has been created as #{0}.'.format(issue))
+        with self.output:
+            self.output.write(
+                'The issue has been created as #{0}.\n'.format(issue)
+            )
 
     def print_not_found_issues(self, issues):
         """
@@ -129,19 +182,22 @@ class Printer(PrinterInterface):
 
         :param issues: the not found issue numbers.
         """
-        message = "The following issues couldn't be found: {0}".format(
+        message = "The following issues couldn't be found: {0}\n".format(
             ', '.join(str(issue) for issue in issues)
         )
 
-        print(message)
+        with self.output:
+            self.output.write(message)
 
     def print_error(self, error):
         """
         Prints an error.
         :param error: The error to print.
         """
-        self.color_printer.print_colored_line('Error', self._ERROR_COLOR)
-        print(error + '\n')
+        with self.output:
+            self.output.write(self.color_printer.format_colored_line(
+                'Error', self._ERROR_COLOR))
+            self.output.write(error + '\n\n')
 
     def print_rate_information(self, limit=0, remaining=0, reset=0,
                                unlimited=False):
@@ -152,11 +208,92 @@ class Printer(PrinterInterface):
         :param reset: reset time (Unix timestamp).
         :param unlimited: if the API doesn't have a limit.
         """
-        if unlimited:
-            print('There is no rate limit for this API.')
-        else:
-            reset_date = datetime.fromtimestamp(reset)
+        with self.output:
+            if unlimited:
+                self.output.write('There is no rate limit for this API.\n')
+            else:
+                reset_date = datetime.fromtimestamp(reset)
+
+                self.output.write('Limit: {0}\n'.format(limit))
+                self.output.write('Remaining: {0}\n'.format(remaining))
+                self.output.write('Reset datetime: {0}\n'.format(reset_date))
+
+    def print_synced_issues(self, synced_issues, synced_at):
+        """
+        Prints the result of syncing the local mirror.
+        :param synced_issues: the number of the synced (updated) issues.
+        :param synced_at: the sync time (Unix timestamp).
+        """
+        with self.output:
+            self.output.write('{0} updated issue(s) synced at {1}.\n'.format(
+                synced_issues, datetime.fromtimestamp(synced_at)
+            ))
+
+    def print_last_synced(self, synced_at):
+        """
+        Prints when the local mirror was last synced, for knowing how stale
+        the shown issues may be.
+        :param synced_at: the last sync time (Unix timestamp).
+        """
+        with self.output:
+            self.output.write(
+                'Read from the local mirror, last synced at {0}.\n'.format(
+                    datetime.fromtimestamp(synced_at)
+                )
+            )
+
+    def print_timings(self, steps, total):
+        """
+        Prints the summary of the timings of the steps of the command, as a
+        table, to the standard error (so it's not mixed with the output).
+        The "self" time of a step excludes the steps measured inside it, e.g.
+        the requests made while printing a streamed issue list.
+        :param steps: the summary of each step (see Timings.get_summary).
+        :param total: the total time of the command, in seconds.
+        """
+        names = ['{0} {1}'.format(step['category'], step['name'])
+                 for step in steps]
+        width = max([len(name) for name in names] + [4])
+        row = '{0:<{width}}  {1:>5}  {2:>9}  {3:>9}  {4:>9}  {5}'
+
+        lines = [
+            'Timings (total: {0:.1f} ms)'.format(total * 1000),
+            '',
+            row.format('step', 'calls', 'total ms', 'self ms', 'max ms',
+                       'details', width=width),
+        ]
+
+        for name, step in zip(names, steps):
+            lines.append(row.format(
+                name, step['calls'], '{0:.1f}'.format(step['total'] * 1000),
+                '{0:.1f}'.format(step['self'] * 1000),
+                '{0:.1f}'.format(step['max'] * 1000),
+                self._format_timing_details(step), width=width
+            ).rstrip())
+
+        print('\n'.join(lines), file=sys.stderr)
+
+    @staticmethod
+    def _format_timing_details(step):
+        """
+        Formats the details of a step (the statuses, size and cache of the
+        HTTP requests).
+        :param step: the summary of the step.
+        :return: the details.
+        """
+        details = []
+
+        if step['statuses']:
+            details.append(' '.join(
+                '{0} x{1}'.format(status, count)
+                for status, count in sorted(step['statuses'].items())
+            ))
+        if step['size']:
+            details.append('{0:.1f} KiB'.format(step['size'] / 1024))
+        if step['cache']:
+            details.append('cache: ' + ', '.join(
+                '{0} {1}'.format(count, result)
+                for result, count in sorted(step['cache'].items())
+            ))
 
-            print('Limit: {0}'.format(limit))
-            print('Remaining: {0}'.format(remaining))
-            print('Reset datetime: {0}'.format(reset_date))
+        return ', '.join(details)
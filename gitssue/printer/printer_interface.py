@@ -14,7 +14,7 @@ class PrinterInterface(metaclass=ABCMeta):
         """
         Prints the issue list, also with labels, if any.
 
-        :param issues: the issue list.
+        :param issues: the Issue objects.
         :param show_description: if show also the descriptions or not.
         """
         pass
@@ -24,7 +24,7 @@ class PrinterInterface(metaclass=ABCMeta):
         """
         Prints the issue list with descriptions
 
-        :param issues: the issue list.
+        :param issues: the Issue objects.
         """
         pass
 
@@ -33,7 +33,7 @@ class PrinterInterface(metaclass=ABCMeta):
         """
         Prints the given comment thread belonging to the issue.
 
-        :param comment_thread: the thread of comments.
+        :param comment_thread: the Comment objects of the thread.
         """
         pass
 
@@ -42,7 +42,7 @@ class PrinterInterface(metaclass=ABCMeta):
         """
         Prints the closed issues.
 
-        :param closed_issues: the closed issues.
+        :param closed_issues: the closed Issue objects.
         """
         pass
 
@@ -94,3 +94,41 @@ class PrinterInterface(metaclass=ABCMeta):
         :param reset: reset time (Unix timestamp).
         """
         pass
+
+    @abstractmethod
+    def print_synced_issues(self, synced_issues, synced_at):
+        """
+        Prints the result of syncing the local mirror.
+
+        :param synced_issues: the number of the synced (updated) issues.
+        :param synced_at: the sync time (Unix timestamp).
+        """
+        pass
+
+    @abstractmethod
+    def print_last_synced(self, synced_at):
+        """
+        Prints when the local mirror was last synced.
+
+        :param synced_at: the last sync time (Unix timestamp).
+        """
+        pass
+
+    @abstractmethod
+    def print_search_results(self, issues):
+        """
+        Prints the issues found in the search, with the found fragment.
+
+        :param issues: the found Issue objects.
+        """
+        pass
+
+    @abstractmethod
+    def print_timings(self, steps, total):
+        """
+        Prints the summary of the timings of the steps of the command.
+
+        :param steps: the summary of each step (see Timings.get_summary).
+        :param total: the total time of the command, in seconds.
+        """
+        pass
@@ -0,0 +1,193 @@
+""" Machine readable printer module. """
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from gitssue.printer.printer import Printer
+
+
+class RecordPrinter(Printer):
+    """
+    Printer of the issues and the comments as machine readable records, for
+    piping the output to other programs, in one of these formats:
+
+    * "jsonl": a JSON object in each line (JSON Lines).
+    * "tsv": tab separated values, with a header line, the labels separated
+      by commas, and the backslashes, tabs and newlines of the values escaped
+      as "\\\\", "\\t" and "\\n" (and carriage returns as "\\r").
+    * "json": a JSON array of the objects, an object in each line.
+
+    The records are written as they are iterated (so it can also be a
+    generator requesting the next pages), and the output is flushed after
+    each one, so the reading program gets each record as soon as it's
+    available, and the whole list is never held in memory. No color printer
+    is needed.
+
+    The errors and the rest of the messages (e.g. the not found issues) are
+    written to the standard error, so the output is only the records.
+    """
+
+    FORMATS = ('jsonl', 'tsv', 'json')
+
+    _ISSUE_FIELDS = ('number', 'title', 'labels', 'body')
+    _COMMENT_FIELDS = ('author', 'created_at', 'updated_at', 'body')
+    _SEARCH_RESULT_FIELDS = ('number', 'title', 'labels', 'closed', 'snippet')
+    _TSV_ESCAPES = str.maketrans({
+        '\\': '\\\\',
+        '\t': '\\t',
+        '\n': '\\n',
+        '\r': '\\r',
+    })
+
+    def __init__(self, output_format, output=None):
+        """
+        Constructor.
+        :param output_format: the format of the records (see FORMATS).
+        :param output: the OutputBuffer to write the records to; None for
+            buffering the standard output.
+        :raises ValueError: if the format is not valid.
+        """
+        if output_format not in self.FORMATS:
+            raise ValueError('Invalid output format: {0}'.format(
+                output_format
+            ))
+
+        super(RecordPrinter, self).__init__(None, output)
+        self.output_format = output_format
+
+    def print_issue_list(self, issues, show_description=False):
+        """
+        Prints the issues, with the labels, as records, and with the
+        description only if it has to be shown.
+        :param issues: the Issue objects.
+        :param show_description: if show also the descriptions or not.
+        """
+        fields = self._ISSUE_FIELDS
+
+        if not show_description:
+            fields = fields[:-1]
+
+        self._print_records(issues, fields)
+
+    def print_issue_list_with_desc(self, issues):
+        """
+        Prints the issues, with the labels and the description, as records.
+        :param issues: the Issue objects.
+        """
+        self._print_records(issues, self._ISSUE_FIELDS)
+
+    def print_issue_comment_thread(self, comment_thread):
+        """
+        Prints the comments of the thread as records.
+        :param comment_thread: the Comment objects of the thread.
+        """
+        self._print_records(comment_thread, self._COMMENT_FIELDS)
+
+    def print_search_results(self, issues):
+        """
+        Prints the issues found in the search, from the most relevant one, as
+        records, with the most relevant fragment of each issue.
+        :param issues: the found Issue objects.
+        """
+        self._print_records(issues, self._SEARCH_RESULT_FIELDS)
+
+    def print_not_found_issues(self, issues):
+        """
+        Prints the not found issues, to the standard error.
+
+        :param issues: the not found issue numbers.
+        """
+        print("The following issues couldn't be found: {0}".format(
+            ', '.join(str(issue) for issue in issues)
+        ), file=sys.stderr)
+
+    def print_error(self, error):
+        """
+        Prints an error, to the standard error.
+        :param error: The error to print.
+        """
+        print('Error: {0}'.format(error), file=sys.stderr)
+
+    def print_last_synced(self, synced_at):
+        """
+        Prints when the local mirror was last synced, to the standard error.
+        :param synced_at: the last sync time (Unix timestamp).
+        """
+        print('Read from the local mirror, last synced at {0}.'.format(
+            datetime.fromtimestamp(synced_at)
+        ), file=sys.stderr)
+
+    def _print_records(self, items, fields):
+        """
+        Prints the items as records with the given fields, flushing the output
+        after each one.
+        :param items: the Issue or Comment objects.
+        :param fields: the fields of the records.
+        """
+        printed_records = 0
+
+        with self.output:
+            if self.output_format == 'tsv':
+                self.output.write('\t'.join(fields) + '\n')
+            elif self.output_format == 'json':
+                self.output.write('[')
+
+            for item in items or ():
+                record = self._get_record(item, fields)
+
+                if self.output_format == 'tsv':
+                    self.output.write(self._format_tsv_record(record) + '\n')
+                elif self.output_format == 'json':
+                    self.output.write(',\n' if printed_records else '\n')
+                    self.output.write(json.dumps(record))
+                else:
+                    self.output.write(json.dumps(record) + '\n')
+
+                self.output.flush()
+                printed_records += 1
+
+            if self.output_format == 'json':
+                self.output.write('\n]\n' if printed_records else ']\n')
+
+    @staticmethod
+    def _get_record(item, fields):
+        """
+        Gets the record of the issue or the comment, with the given fields.
+        The labels are objects with the name and the color.
+        :return: the ordered dictionary of the record.
+        """
+        record = OrderedDict()
+
+        for field in fields:
+            value = getattr(item, field)
+
+            if field == 'labels':
+                value = [
+                    OrderedDict((('name', label.name),
+                                 ('color', label.color)))
+                    for label in value
+                ]
+
+            record[field] = value
+
+        return record
+
+    def _format_tsv_record(self, record):
+        """
+        Formats the record as a TSV line, without the newline.
+        :param record: the record (see _get_record).
+        :return: the line.
+        """
+        values = []
+
+        for field, value in record.items():
+            if field == 'labels':
+                value = ','.join(label['name'] for label in value)
+            elif value is None:
+                value = ''
+            elif isinstance(value, bool):
+                value = 'true' if value else 'false'
+
+            values.append(str(value).translate(self._TSV_ESCAPES))
+
+        return '\t'.join(values)
@@ -0,0 +1,140 @@
+"""
+asyncio version of the remote operations, wrapping a remote.
+"""
+import asyncio
+import functools
+
+
+class AsyncRemote:
+    """
+    asyncio version of the RemoteRepoInterface operations (of any remote:
+    Github, Gitlab or Bitbucket), so independent operations (e.g. the issue
+    list and the comments of some issues) can be awaited together from a
+    coroutine, e.g. in an asyncio service embedding gitssue.
+
+    Each operation is executed by the wrapped remote in the executor of the
+    event loop (the default one, if no executor is given). The operations
+    that already send their requests concurrently (e.g. getting the
+    description of many issues) keep doing so. The remotes make their
+    requests with their blocking requester, so AsyncRequests is not used
+    here.
+
+    Requires Python 3.5 or newer (unlike the rest of gitssue, so this module
+    is not imported by it).
+    """
+
+    def __init__(self, remote, executor=None):
+        """
+        Constructor.
+        :param remote: the RemoteRepoInterface implementation.
+        :param executor: the concurrent.futures.Executor to execute the
+            operations in; None for the default executor of the event loop.
+        """
+        self.remote = remote
+        self.executor = executor
+
+    def _run(self, function, *args):
+        """
+        Executes the function in the executor.
+        :return: the asyncio.Future of the result.
+        """
+        loop = asyncio.get_event_loop()
+
+        return loop.run_in_executor(self.executor,
+                                    functools.partial(function, *args))
+
+    async def get_issue_list(self, username, repository, show_all=False,
+                             get_description=False):
+        """
+        Gets the issue list (see RemoteRepoInterface.get_issue_list).
+        :return: the list of the issues.
+        """
+        return await self._run(
+            lambda: list(self.remote.get_issue_list(
+                username, repository, show_all, get_description
+            ))
+        )
+
+    async def get_updated_issues(self, username, repository, since=None):
+        """
+        Gets the issues updated since the given time (see
+        RemoteRepoInterface.get_updated_issues).
+        :return: the list of the issues.
+        """
+        return await self._run(
+            lambda: list(self.remote.get_updated_issues(
+                username, repository, since
+            ))
+        )
+
+    async def get_issues_description(self, username, repository,
+                                     issue_numbers):
+        """
+        Gets the specified issues, with the descriptions (see
+        RemoteRepoInterface.get_issues_description).
+        :return: the issues descriptions, and the not found issues.
+        """
+        return await self._run(self.remote.get_issues_description, username,
+                               repository, issue_numbers)
+
+    async def get_issue_comments(self, username, repository, issue_number):
+        """
+        Gets the comments of the issue (see
+        RemoteRepoInterface.get_issue_comments).
+        :return: the comments.
+        """
+        return await self._run(self.remote.get_issue_comments, username,
+                               repository, issue_number)
+
+    async def get_issues_comments(self, username, repository, issue_numbers):
+        """
+        Gets the comments of each of the given issues, awaiting them
+        together.
+        :return: the list of the comments of each issue, in the same order of
+            the issue numbers.
+        """
+        return await asyncio.gather(*[
+            self.get_issue_comments(username, repository, issue_number)
+            for issue_number in issue_numbers
+        ])
+
+    async def close_issues(self, username, repository, issue_numbers):
+        """
+        Closes the specified issues (see RemoteRepoInterface.close_issues).
+        :return: the closed issues, and the not found issue numbers.
+        """
+        return await self._run(self.remote.close_issues, username, repository,
+                               issue_numbers)
+
+    async def create_comment(self, username, repository, issue, comment):
+        """
+        Creates a comment in the specified issue (see
+        RemoteRepoInterface.create_comment).
+        """
+        return await self._run(self.remote.create_comment, username,
+                               repository, issue, comment)
+
+    async def create_issue(self, username, repository, title, body='',
+                           labels=None, milestone=0):
+        """
+        Creates an issue (see RemoteRepoInterface.create_issue).
+        :return: the number of the created issue.
+        """
+        return await self._run(self.remote.create_issue, username, repository,
+                               title, body, labels, milestone)
+
+    async def get_rate_information(self):
+        """
+        Gets the API rate information (see
+        RemoteRepoInterface.get_rate_information).
+        :return: the limit, the remaining requests and the reset time.
+        """
+        return await self._run(self.remote.get_rate_information)
+
+    def parse_request_exception(self, exception, milestone=0):
+        """
+        Parses the error occurred during a request (see
+        RemoteRepoInterface.parse_request_exception).
+        :return: the error message.
+        """
+        return self.remote.parse_request_exception(exception, milestone)
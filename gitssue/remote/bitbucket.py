@@ -1,7 +1,8 @@
 """ Bitbucket module. """
+from urllib.parse import quote
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
 from gitssue.remote.remote_repo_interface import RemoteRepoInterface
-from gitssue.request.unsuccessful_http_request_exception \
-    import UnsuccessfulHttpRequestException
 
 
 class Bitbucket(RemoteRepoInterface):
@@ -12,15 +13,32 @@ class Bitbucket(RemoteRepoInterface):
     API_VERSION = '2.0'
     API_URL = 'https://api.bitbucket.org/{0}'.format(API_VERSION)
     ALLOWED_ISSUE_KINDS = ('bug', 'enhancement', 'proposal', 'task')
-
-    def __init__(self, requester, credentials):
-        super(Bitbucket, self).__init__(requester, credentials=credentials)
+    PAGE_SIZE = 50
+    _CLOSED_STATE = 'resolved'
+    _OPEN_ISSUES_QUERY = 'state != "{0}"'.format(_CLOSED_STATE)
+    _KIND_LABEL_COLOR = 'ffffff'
+
+    # The fields of the payloads that are read, so the rest (e.g. the
+    # "reporter", "links" or "content.html" objects) are not kept in memory.
+    _ISSUE_PAGE_FIELDS = ('values.id', 'values.title', 'values.content.raw',
+                          'values.kind', 'values.state', 'values.updated_on')
+    _COMMENT_PAGE_FIELDS = ('values.user.username', 'values.created_on',
+                            'values.updated_on', 'values.content.raw')
+
+    def __init__(self, requester, credentials,
+                 max_workers=RemoteRepoInterface.DEFAULT_MAX_WORKERS):
+        super(Bitbucket, self).__init__(requester, credentials=credentials,
+                                        max_workers=max_workers)
 
     def get_issue_list(self, username, repository, show_all=False,
                        get_description=False):
         """
         Gets the open issue list of the given repository of the given user.
 
+        The state filter is sent to the API as a BBQL query, so only the
+        issues to show are downloaded, and the issues are yielded as the pages
+        are received, following the "next" URL of each page.
+
         :param username: the user owning the repository.
         :param repository: the repository to look the issues at.
         :param show_all: show also closed issues.
@@ -28,31 +46,83 @@ class Bitbucket(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary id:label format.
+        :return: a generator of the issues.
         """
-        request = '{0}/repositories/{1}/{2}/issues'.format(
-            self.API_URL, username, repository
+        request = '{0}/repositories/{1}/{2}/issues?pagelen={3}'.format(
+            self.API_URL, username, repository, self.PAGE_SIZE
         )
 
-        issue_list = []
-        response_issues = self.requester.request('GET', request, self.credentials)
+        if not show_all:
+            request += '&q=' + quote(self._OPEN_ISSUES_QUERY)
+
+        response_pages = self.requester.request_pages(
+            'GET', request, self.credentials, fields=self._ISSUE_PAGE_FIELDS
+        )
+
+        for response_issues in response_pages:
+            if not response_issues:
+                continue
 
-        if response_issues:
             for issue in response_issues['values']:
-                is_closed = issue['state'] == 'resolved'
+                is_closed = issue['state'] == self._CLOSED_STATE
 
                 if not is_closed or (is_closed and show_all):
-                    issue_list.append({
-                        'number': issue['id'],
-                        'title': issue['title'],
-                        'description': issue['content']['raw'],
-                        'labels': [{
-                            'name': issue['kind'],
-                            'color': 'ffffff'
-                        }]
-                    })
-
-        return issue_list
+                    yield Issue(
+                        issue['id'], issue['title'], issue['content']['raw'],
+                        self._create_label_list(username, repository, issue)
+                    )
+
+    def get_updated_issues(self, username, repository, since=None):
+        """
+        Gets the issues (in any state) updated since the given time, with a
+        BBQL query on the "updated_on" field, from the least recently updated
+        one. The issues in the "resolved" state are the closed ones.
+
+        :param username: the user owning the repository.
+        :param repository: the repository to look the issues at.
+        :param since: the updated time to get the issues updated since; None
+            for every issue.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200.
+        :return: a generator of the issues.
+        """
+        request = '{0}/repositories/{1}/{2}/issues?pagelen={3}' \
+            '&sort=updated_on'.format(self.API_URL, username, repository,
+                                      self.PAGE_SIZE)
+
+        if since:
+            request += '&q=' + quote('updated_on >= {0}'.format(since))
+
+        response_pages = self.requester.request_pages(
+            'GET', request, self.credentials, fields=self._ISSUE_PAGE_FIELDS
+        )
+
+        for response_issues in response_pages:
+            if not response_issues:
+                continue
+
+            for issue in response_issues['values']:
+                yield Issue(
+                    issue['id'], issue['title'], issue['content']['raw'] or '',
+                    self._create_label_list(username, repository, issue),
+                    closed=issue['state'] == self._CLOSED_STATE,
+                    updated_at=issue['updated_on'],
+                )
+
+    def _create_label_list(self, username, repository, issue):
+        """
+        Creates the label list of the issue: Bitbucket doesn't have labels,
+        so the kind of the issue is shown as its label.
+
+        :param username: the user owning the repository.
+        :param repository: the repository of the issue.
+        :param issue: the issue of the response.
+        :return: the list of the Label objects.
+        """
+        return [self._get_label(username, repository, issue['kind'],
+                                self._KIND_LABEL_COLOR)]
 
     def get_issues_description(self, username, repository, issue_numbers):
         """
@@ -70,8 +140,8 @@ class Bitbucket(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary with the title and the body message of each issue
-            id.
+        :return: the Issue objects, with the title and the body, and the
+            not found issue numbers.
         """
         request = '{0}/repositories/{1}/{2}/issues'.format(
             self.API_URL, username, repository
@@ -81,7 +151,7 @@ class Bitbucket(RemoteRepoInterface):
         not_found_issues = []
 
         response_issues = self.requester.request(
-            'GET', request, self.credentials
+            'GET', request, self.credentials, fields=self._ISSUE_PAGE_FIELDS
         )
 
         if response_issues:
@@ -91,17 +161,10 @@ class Bitbucket(RemoteRepoInterface):
             ))
 
             for issue in filtered_issues:
-                issue_list.append({
-                    'number': issue['id'],
-                    'description': {
-                        'title': issue['title'],
-                        'body': issue['content']['raw'],
-                    },
-                    'labels': [{
-                        'name': issue['kind'],
-                        'color': 'ffffff'
-                    }]
-                })
+                issue_list.append(Issue(
+                    issue['id'], issue['title'], issue['content']['raw'],
+                    self._create_label_list(username, repository, issue)
+                ))
 
             not_found_issues = [iid for iid in issue_numbers if int(iid) not in
                                 [issue['id'] for issue in response_issues['values']]
@@ -126,17 +189,16 @@ class Bitbucket(RemoteRepoInterface):
 
         issue_comments = []
         response_comments = self.requester.request(
-            'GET', request, self.credentials
+            'GET', request, self.credentials,
+            fields=self._COMMENT_PAGE_FIELDS
         )
 
         if response_comments:
             for comment in response_comments['values']:
-                issue_comments.append({
-                    'author': comment['user']['username'],
-                    'created_at': comment['created_on'],
-                    'updated_at': comment['updated_on'],
-                    'body': comment['content']['raw'],
-                })
+                issue_comments.append(Comment(
+                    comment['user']['username'], comment['created_on'],
+                    comment['updated_on'], comment['content']['raw']
+                ))
 
         return issue_comments
 
@@ -151,32 +213,21 @@ class Bitbucket(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
+        :raises PartiallyClosedIssuesException: if only some of the issues
+        failed.
         """
         base_request = '{0}/repositories/{1}/{2}/issues/'.format(
             self.API_URL, username, repository
         )
         payload = {'state': 'closed'}
-        closed_issues = []
-        not_found_issues = []
 
-        for issue in issue_numbers:
-            request = base_request + str(issue)
+        def close_issue(issue):
+            return self.requester.request(
+                'PUT', base_request + str(issue), self.credentials,
+                json_payload=payload
+            )
 
-            try:
-                response_issue = self.requester.request(
-                    'PUT', request, self.credentials, json_payload=payload
-                )
-                closed_issues.append({
-                    'number': issue,
-                    'title': response_issue['title'],
-                })
-            except UnsuccessfulHttpRequestException as http_exception:
-                if http_exception.code == 404:
-                    not_found_issues.append(issue)
-                else:
-                    raise
-
-        return closed_issues, not_found_issues
+        return self._close_issues_concurrently(close_issue, issue_numbers)
 
     def create_comment(self, username, repository, issue, comment):
         """
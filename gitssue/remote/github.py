@@ -1,4 +1,7 @@
 """ Github module. """
+from urllib.parse import quote
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
 from gitssue.remote.remote_repo_interface import RemoteRepoInterface
 from gitssue.request.unsuccessful_http_request_exception \
     import UnsuccessfulHttpRequestException
@@ -10,15 +13,71 @@ class Github(RemoteRepoInterface):
     """
 
     API_URL = 'https://api.github.com'
-
-    def __init__(self, requester, credentials):
-        super(Github, self).__init__(requester, credentials=credentials)
+    GRAPHQL_URL = '{0}/graphql'.format(API_URL)
+    PAGE_SIZE = 100
+    GRAPHQL_BATCH_SIZE = 50
+
+    _GRAPHQL_LABELS = 'labels(first: 100) { nodes { name color } }'
+    _GRAPHQL_ISSUE_LIST_QUERY = """
+        query($owner: String!, $name: String!, $states: [IssueState!],
+              $cursor: String) {
+          repository(owner: $owner, name: $name) {
+            issues(first: %d, after: $cursor, states: $states,
+                   orderBy: {field: CREATED_AT, direction: DESC}) {
+              pageInfo { hasNextPage endCursor }
+              nodes { number title %s }
+            }
+          }
+        }
+    """ % (PAGE_SIZE, _GRAPHQL_LABELS)
+    _GRAPHQL_ISSUES_QUERY = """
+        query($owner: String!, $name: String!) {
+          repository(owner: $owner, name: $name) {
+            %s
+          }
+        }
+    """
+    _GRAPHQL_ISSUE_FIELD = \
+        'issue%d: issue(number: %d) { number title body %s }'
+    # The HTTP codes of the errors of the GraphQL responses (sent with a 200
+    # code), for parsing them as the REST errors. Any other error type is a
+    # bad request.
+    _GRAPHQL_ERROR_CODES = {
+        'NOT_FOUND': 404,
+        'FORBIDDEN': 403,
+        'RATE_LIMITED': 403,
+    }
+
+    # The fields of the REST payloads that are read, so the rest (e.g. the
+    # "user", "reactions" or "pull_request" objects) are not kept in memory.
+    _ISSUE_FIELDS = ('number', 'title', 'body', 'labels.name', 'labels.color',
+                     'state', 'updated_at', 'comments')
+    _COMMENT_FIELDS = ('user.login', 'created_at', 'updated_at', 'body')
+
+    def __init__(self, requester, credentials,
+                 max_workers=RemoteRepoInterface.DEFAULT_MAX_WORKERS):
+        """
+        If an auth token is set in the credentials, the issues are read with
+        the GraphQL API (which requires authentication), fetching many issues
+        in a single request. Otherwise, the REST API is used.
+        """
+        auth_token = credentials.get('token', '') if credentials else ''
+        super(Github, self).__init__(requester, credentials=credentials,
+                                     auth_token=auth_token,
+                                     max_workers=max_workers)
+        self.auth_token_header = {
+            'Authorization': 'bearer {0}'.format(auth_token)
+        }
 
     def get_issue_list(self, username, repository, show_all=False,
                        get_description=False):
         """
         Gets the open issue list of the given repository of the given user.
 
+        The issues are yielded as the pages are received, following the
+        pagination of the API, so the issues of the first page can be used
+        while the next page is being requested.
+
         :param username: the user owning the repository.
         :param repository: the repository to look the issues at.
         :param show_all: show also closed issues.
@@ -26,39 +85,78 @@ class Github(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary id:label format.
+        :return: a generator of the issues.
         """
-        request = '{0}/repos/{1}/{2}/issues'.format(
-            self.API_URL, username, repository)
+        if self.auth_token and not get_description:
+            yield from self._get_issue_list_graphql(username, repository,
+                                                    show_all)
+            return
+
+        request = '{0}/repos/{1}/{2}/issues?per_page={3}'.format(
+            self.API_URL, username, repository, self.PAGE_SIZE)
 
         if show_all:
-            request += '?state=all'
+            request += '&state=all'
 
-        response_issues = self.requester.request('GET', request,
-                                                 self.credentials)
+        response_pages = self.requester.request_pages(
+            'GET', request, self.credentials, fields=self._ISSUE_FIELDS
+        )
 
-        issue_list = []
         description = ''
 
-        if response_issues:
+        for response_issues in response_pages:
+            if not response_issues:
+                continue
+
             for issue in response_issues:
+                # The list payload already has the body of each issue, so
+                # there's no need to request each issue separately.
                 if get_description:
-                    full_description = self.get_issues_description(
-                        username,
-                        repository,
-                        [issue['number']]
-                    )
+                    description = issue.get('body') or ''
 
-                    description = full_description[0][0]['description']['body']
+                yield Issue(
+                    issue['number'], issue['title'], description,
+                    self._create_label_list(username, repository,
+                                            issue['labels'])
+                )
 
-                issue_list.append({
-                    'number': issue['number'],
-                    'title': issue['title'],
-                    'labels': issue['labels'],
-                    'description': description
-                })
+    def get_updated_issues(self, username, repository, since=None):
+        """
+        Gets the issues (both open and closed) updated since the given time,
+        with the "since" parameter of the API, from the least recently
+        updated one.
 
-        return issue_list
+        :param username: the user owning the repository.
+        :param repository: the repository to look the issues at.
+        :param since: the updated time to get the issues updated since; None
+            for every issue.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200.
+        :return: a generator of the issues.
+        """
+        request = '{0}/repos/{1}/{2}/issues?per_page={3}&state=all' \
+            '&sort=updated&direction=asc'.format(self.API_URL, username,
+                                                 repository, self.PAGE_SIZE)
+
+        if since:
+            request += '&since=' + quote(since)
+
+        response_pages = self.requester.request_pages(
+            'GET', request, self.credentials, fields=self._ISSUE_FIELDS
+        )
+
+        for response_issues in response_pages:
+            for issue in response_issues or []:
+                yield Issue(
+                    issue['number'], issue['title'], issue.get('body') or '',
+                    self._create_label_list(username, repository,
+                                            issue['labels']),
+                    closed=issue['state'] == 'closed',
+                    updated_at=issue['updated_at'],
+                    comments=issue.get('comments'),
+                )
 
     def get_issues_description(self, username, repository, issue_numbers):
         """
@@ -71,38 +169,179 @@ class Github(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary with the title and the body message of each issue
-            id.
+        :return: the Issue objects, with the title and the body, and the
+            not found issue numbers.
         """
         issues_descriptions = []
         not_found_issues = []
 
+        if issue_numbers and self.auth_token:
+            return self._get_issues_description_graphql(
+                username, repository, issue_numbers
+            )
+
         if issue_numbers:
-            for issue_number in issue_numbers:
-                request = '{0}/repos/{1}/{2}/issues/{3}'.format(
-                    self.API_URL,
-                    username,
-                    repository,
-                    issue_number
+            # The issues are requested concurrently, but the results are kept
+            # in the order of the given issue numbers.
+            results = self._map_concurrently(
+                lambda issue_number: self._get_issue_description(
+                    username, repository, issue_number
+                ),
+                issue_numbers
+            )
+
+            for issue_number, (issue_description, not_found) in \
+                    zip(issue_numbers, results):
+                if issue_description is not None:
+                    issues_descriptions.append(issue_description)
+                elif not_found:
+                    not_found_issues.append(issue_number)
+
+        return issues_descriptions, not_found_issues
+
+    def _get_issue_description(self, username, repository, issue_number):
+        """
+        Gets the description of a single issue.
+
+        :return: the issue description (None if it couldn't be retrieved), and
+            if the issue was not found.
+        """
+        request = '{0}/repos/{1}/{2}/issues/{3}'.format(
+            self.API_URL,
+            username,
+            repository,
+            issue_number
+        )
+
+        try:
+            full_issue = self.requester.request('GET', request,
+                                                fields=self._ISSUE_FIELDS)
+        except UnsuccessfulHttpRequestException as unsuccessful_request:
+            return None, unsuccessful_request.code == 404
+
+        issue_description = Issue(
+            issue_number, full_issue['title'], full_issue['body'],
+            self._create_label_list(username, repository,
+                                    full_issue.get('labels') or [])
+        )
+
+        return issue_description, False
+
+    def _request_graphql(self, query, variables):
+        """
+        Executes a GraphQL query.
+
+        :param query: the GraphQL query.
+        :param variables: the variables of the query.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200, or if the response has any error other than a not
+        found aliased issue (e.g. the repository was not found, or the API
+        limit was reached).
+        :return: the "data" object of the response.
+        """
+        response = self.requester.request(
+            'POST', self.GRAPHQL_URL, extra_headers=self.auth_token_header,
+            json_payload={'query': query, 'variables': variables}
+        )
+
+        for error in response.get('errors') or []:
+            error_type = error.get('type')
+            path = error.get('path') or []
+            issue_not_found = error_type == 'NOT_FOUND' and len(path) == 2 \
+                and str(path[-1]).startswith('issue')
+
+            if not issue_not_found:
+                headers = {}
+
+                if error_type == 'RATE_LIMITED':
+                    headers['X-RateLimit-Remaining'] = '0'
+
+                raise UnsuccessfulHttpRequestException(
+                    self._GRAPHQL_ERROR_CODES.get(error_type, 400), headers
                 )
 
-                try:
-                    full_issue = self.requester.request('GET', request)
+        return response.get('data') or {}
 
-                    issue_description = {
-                        'number': issue_number,
-                        'labels': full_issue.get('labels'),
-                        'description': {
-                            'title': full_issue['title'],
-                            'body': full_issue['body'],
-                        }
-                    }
+    def _get_issue_list_graphql(self, username, repository, show_all=False):
+        """
+        Gets the issue list with the GraphQL API, requesting just the number,
+        the title and the labels of each issue.
 
-                    issues_descriptions.append(issue_description)
-                except UnsuccessfulHttpRequestException as \
-                        unsuccessful_request:
-                    if unsuccessful_request.code == 404:
-                        not_found_issues.append(issue_number)
+        :return: a generator of the issues.
+        """
+        variables = {
+            'owner': username,
+            'name': repository,
+            'states': None if show_all else ['OPEN'],
+            'cursor': None,
+        }
+        has_next_page = True
+
+        while has_next_page:
+            data = self._request_graphql(self._GRAPHQL_ISSUE_LIST_QUERY,
+                                         variables)
+            issues = (data.get('repository') or {}).get('issues') or {}
+            page_info = issues.get('pageInfo') or {}
+
+            for issue in issues.get('nodes') or []:
+                yield Issue(
+                    issue['number'], issue['title'],
+                    labels=self._create_label_list(username, repository,
+                                                   issue['labels']['nodes'])
+                )
+
+            has_next_page = page_info.get('hasNextPage', False)
+            variables = dict(variables, cursor=page_info.get('endCursor'))
+
+    def _get_issues_description_graphql(self, username, repository,
+                                        issue_numbers):
+        """
+        Gets the specified issues with the GraphQL API, requesting up to
+        GRAPHQL_BATCH_SIZE issues in each query, with an aliased "issue" field
+        for each one. The issues missing in the response are the not found
+        ones.
+
+        :return: the issues descriptions, and the not found issues.
+        """
+        issues_descriptions = []
+        not_found_issues = []
+        variables = {'owner': username, 'name': repository}
+        found_issues = {}
+
+        unique_numbers = sorted(set(int(number) for number in issue_numbers))
+
+        for index in range(0, len(unique_numbers), self.GRAPHQL_BATCH_SIZE):
+            batch = unique_numbers[index:index + self.GRAPHQL_BATCH_SIZE]
+            fields = '\n'.join(
+                self._GRAPHQL_ISSUE_FIELD % (number, number,
+                                             self._GRAPHQL_LABELS)
+                for number in batch
+            )
+
+            data = self._request_graphql(self._GRAPHQL_ISSUES_QUERY % fields,
+                                         variables)
+            repository_data = data.get('repository') or {}
+
+            for number in batch:
+                issue = repository_data.get('issue{0}'.format(number))
+
+                if issue:
+                    found_issues[number] = issue
+
+        for issue_number in issue_numbers:
+            issue = found_issues.get(int(issue_number))
+
+            if issue is None:
+                not_found_issues.append(issue_number)
+                continue
+
+            issues_descriptions.append(Issue(
+                issue_number, issue['title'], issue['body'],
+                self._create_label_list(username, repository,
+                                        issue['labels']['nodes'])
+            ))
 
         return issues_descriptions, not_found_issues
 
@@ -125,18 +364,34 @@ class Github(RemoteRepoInterface):
 
         issues_comments = []
 
-        response_comments = self.requester.request('GET', request)
+        response_comments = self.requester.request(
+            'GET', request, fields=self._COMMENT_FIELDS
+        )
         if response_comments:
             for comment in response_comments:
-                issues_comments.append({
-                    'author': comment['user']['login'],
-                    'created_at': comment['created_at'],
-                    'updated_at': comment['updated_at'],
-                    'body': comment['body'],
-                })
+                issues_comments.append(Comment(
+                    comment['user']['login'], comment['created_at'],
+                    comment['updated_at'], comment['body']
+                ))
 
         return issues_comments
 
+    def _create_label_list(self, username, repository, labels):
+        """
+        Creates the label list of an issue, with just the name and the color
+        of each label of the payload.
+
+        :param username: the user owning the repository.
+        :param repository: the repository of the issue.
+        :param labels: the labels of the payload.
+        :return: the list of the Label objects.
+        """
+        return [
+            self._get_label(username, repository, label['name'],
+                            label['color'])
+            for label in labels
+        ]
+
     def close_issues(self, username, repository, issue_numbers):
         """
         Closes the specified issue.
@@ -151,32 +406,21 @@ class Github(RemoteRepoInterface):
         to know if the 404 is because what it's not found is the repo or the
         issue. So it may happen that some issues aren't found but others that
         are.
+        :raises PartiallyClosedIssuesException: if only some of the issues
+        failed.
         """
         base_request = '{0}/repos/{1}/{2}/issues/'.format(
             self.API_URL, username, repository
         )
         payload = {'state': 'closed'}
-        closed_issues = []
-        not_found_issues = []
 
-        for issue in issue_numbers:
-            request = base_request + str(issue)
+        def close_issue(issue):
+            return self.requester.request(
+                'PATCH', base_request + str(issue), self.credentials,
+                json_payload=payload
+            )
 
-            try:
-                response_issue = self.requester.request(
-                    'PATCH', request, self.credentials, json_payload=payload
-                )
-                closed_issues.append({
-                    'number': issue,
-                    'title': response_issue['title'],
-                })
-            except UnsuccessfulHttpRequestException as http_exception:
-                if http_exception.code == 404:
-                    not_found_issues.append(issue)
-                else:
-                    raise
-
-        return closed_issues, not_found_issues
+        return self._close_issues_concurrently(close_issue, issue_numbers)
 
     def create_comment(self, username, repository, issue, comment):
         """
@@ -242,8 +486,17 @@ class Github(RemoteRepoInterface):
         etc.) requests, the limit is 60 requests/hour. For authenticated ones,
         5000/hour.
 
+        The rate limit observed in the last response is returned, if it's
+        known and it hasn't been reset yet, without any request.
+
         :return: remaining request number.
         """
+        observed_rate_limit = self.requester.get_rate_limit(self.API_URL,
+                                                            self.credentials)
+
+        if observed_rate_limit is not None:
+            return observed_rate_limit
+
         request = '{0}/rate_limit'.format(self.API_URL)
 
         rate_information = self.requester.request('GET', request,
@@ -266,14 +519,14 @@ class Github(RemoteRepoInterface):
         message = 'An error occurred in the request.'
 
         rate_limit_hit = exception.code == 403\
-            and exception.headers['X-RateLimit-Remaining'] == '0'
+            and exception.headers.get('X-RateLimit-Remaining') == '0'
 
         if rate_limit_hit:
             message = 'GitHub API limit was reached. Read more about this at '\
                       + 'https://developer.github.com/v3/#rate-limiting'
         elif exception.code == 422 and milestone:
             message = 'The milestone number {0} is invalid.'.format(milestone)
-        else:
+        elif exception.code in self.HTTP_ERROR_MESSAGES:
             message = super().parse_request_exception(exception, milestone)
 
         return message
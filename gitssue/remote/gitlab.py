@@ -1,7 +1,9 @@
 """ Gitlab module. """
+from collections import OrderedDict
+from urllib.parse import quote
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
 from gitssue.remote.remote_repo_interface import RemoteRepoInterface
-from gitssue.request.unsuccessful_http_request_exception \
-    import UnsuccessfulHttpRequestException
 
 
 class Gitlab(RemoteRepoInterface):
@@ -10,9 +12,21 @@ class Gitlab(RemoteRepoInterface):
     """
 
     _API_VERSION = 'v4'
-
-    def __init__(self, requester, credentials, domain):
-        super(Gitlab, self).__init__(requester, auth_token=credentials)
+    _DEFAULT_LABEL_COLOR = '#ffffff'
+    PAGE_SIZE = 100
+
+    # The fields of the payloads that are read, so the rest (e.g. the
+    # "author", "assignees" or "time_stats" objects) are not kept in memory.
+    _ISSUE_FIELDS = ('iid', 'title', 'description', 'labels.name',
+                     'labels.color', 'state', 'updated_at',
+                     'user_notes_count')
+    _LABEL_FIELDS = ('name', 'color')
+    _COMMENT_FIELDS = ('author.username', 'created_at', 'updated_at', 'body')
+
+    def __init__(self, requester, credentials, domain,
+                 max_workers=RemoteRepoInterface.DEFAULT_MAX_WORKERS):
+        super(Gitlab, self).__init__(requester, auth_token=credentials,
+                                     max_workers=max_workers)
         self.auth_token_header = {'PRIVATE-TOKEN': credentials}
         self.api_url = 'https://{0}/api/{1}'.format(domain, self._API_VERSION)
 
@@ -28,77 +42,162 @@ class Gitlab(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary id:label format.
+        :return: the list of the Issue objects.
         """
         issue_list = []
         description = ''
         project_id = self._get_project_id(username, repository)
 
-        if project_id:
-            request = '{0}/projects/{1}/issues'.format(self.api_url,
-                                                       project_id)
-            state = '?state=all' if show_all else '?state=opened'
+        request = '{0}/projects/{1}/issues'.format(self.api_url, project_id)
+        state = '?state=all' if show_all else '?state=opened'
 
-            request += state
+        request += state + '&with_labels_details=true'
 
-            response_issues = self.requester.request(
-                'GET', request, extra_headers=self.auth_token_header
-            )
-            labels_info = self._get_labels(project_id)
+        response_issues = self.requester.request(
+            'GET', request, extra_headers=self.auth_token_header,
+            fields=self._ISSUE_FIELDS
+        )
+        label_colors = self._get_label_colors(project_id, response_issues)
 
-            for issue in response_issues:
-                if get_description:
-                    description = issue['description']
+        for issue in response_issues:
+            if get_description:
+                description = issue['description']
 
-                issue_labels = self._create_label_list(issue, labels_info)
+            issue_labels = self._create_label_list(username, repository, issue,
+                                                   label_colors)
 
-                issue_list.append({
-                    'number': issue['iid'],
-                    'title': issue['title'],
-                    'labels': issue_labels,
-                    'description': description,
-                })
+            issue_list.append(Issue(issue['iid'], issue['title'],
+                                    description, issue_labels))
 
         return issue_list
 
-    def _get_labels(self, project_id):
-        labels_request = '{0}/projects/{1}/labels'.format(
-            self.api_url, project_id
+    def get_updated_issues(self, username, repository, since=None):
+        """
+        Gets the issues (both open and closed) updated since the given time,
+        with the "updated_after" parameter of the API, from the least recently
+        updated one.
+
+        :param username: the user owning the repository.
+        :param repository: the repository to look the issues at.
+        :param since: the updated time to get the issues updated since; None
+            for every issue.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200.
+        :return: a generator of the issues.
+        """
+        project_id = self._get_project_id(username, repository)
+        request = '{0}/projects/{1}/issues?per_page={2}&state=all' \
+            '&scope=all&order_by=updated_at&sort=asc' \
+            '&with_labels_details=true'.format(self.api_url, project_id,
+                                               self.PAGE_SIZE)
+
+        if since:
+            request += '&updated_after=' + quote(since)
+
+        response_pages = self.requester.request_pages(
+            'GET', request, extra_headers=self.auth_token_header,
+            fields=self._ISSUE_FIELDS
         )
 
-        labels_info = self.requester.request(
-            'GET', labels_request, extra_headers=self.auth_token_header
+        for response_issues in response_pages:
+            response_issues = response_issues or []
+            label_colors = self._get_label_colors(project_id, response_issues)
+
+            for issue in response_issues:
+                yield Issue(
+                    issue['iid'], issue['title'],
+                    issue.get('description') or '',
+                    self._create_label_list(username, repository, issue,
+                                            label_colors),
+                    closed=issue['state'] == 'closed',
+                    updated_at=issue['updated_at'],
+                    comments=issue.get('user_notes_count'),
+                )
+
+    def _get_labels(self, project_id):
+        """
+        Gets every label of the project, following the pagination.
+
+        :param project_id: the project id (see _get_project_id).
+        :return: the list of the labels.
+        """
+        labels_request = '{0}/projects/{1}/labels?per_page={2}'.format(
+            self.api_url, project_id, self.PAGE_SIZE
         )
+        labels_info = []
+
+        for labels_page in self.requester.request_pages(
+                'GET', labels_request, extra_headers=self.auth_token_header,
+                fields=self._LABEL_FIELDS):
+            labels_info.extend(labels_page or [])
 
         return labels_info
 
-    def _create_label_list(self, issue, labels_info):
+    def _get_label_colors(self, project_id, issues):
+        """
+        Gets the color of each label (name) of the project. The issues are
+        requested with "with_labels_details", so the labels of the issues
+        already come with their color, and the labels of the project are only
+        requested if the server didn't include the details (an old GitLab
+        version).
+
+        :param project_id: the project id (see _get_project_id).
+        :param issues: the issues of the response.
+        :return: the dictionary of the label colors, by the label name.
+        """
+        details_missing = any(
+            not isinstance(label, dict)
+            for issue in issues for label in issue['labels']
+        )
+
+        if not details_missing:
+            return {}
+
+        return {
+            label_info['name']: label_info['color']
+            for label_info in self._get_labels(project_id)
+        }
+
+    def _create_label_list(self, username, repository, issue, label_colors):
+        """
+        Creates the label list of the issue.
+
+        :param username: the user owning the repository.
+        :param repository: the repository of the issue.
+        :param issue: the issue of the response.
+        :param label_colors: the dictionary of the label colors, by the label
+            name, for the labels without details.
+        :return: the list of the Label objects.
+        """
         issue_labels = []
 
         for label in issue['labels']:
-            color = '#ffffff'
+            if isinstance(label, dict):
+                name = label['name']
+                color = label.get('color') or self._DEFAULT_LABEL_COLOR
+            else:
+                name = label
+                color = label_colors.get(label, self._DEFAULT_LABEL_COLOR)
 
-            for label_info in labels_info:
-                if label_info['name'] == label:
-                    color = label_info['color']
-
-            issue_labels.append({
-                'name': label,
-                'color': color.replace('#', '')
-            })
+            issue_labels.append(self._get_label(username, repository, name,
+                                                color.replace('#', '')))
 
         return issue_labels
 
     def _get_project_id(self, username, repository):
-        project_request = '{0}/projects/{1}%2F{2}'.format(
-            self.api_url, username, repository
-        )
-
-        project = self.requester.request(
-            'GET', project_request, extra_headers=self.auth_token_header
-        )
-
-        return project.get('id')
+        """
+        Gets the identifier of the project for the API requests. The GitLab API
+        accepts the URL-encoded "namespace/project" path wherever a project id
+        is expected, so there's no need to request the numeric id (and this
+        way there's nothing to invalidate if the project is renamed).
+
+        :param username: the user (namespace) owning the repository.
+        :param repository: the repository.
+        :return: the URL-encoded path of the project.
+        """
+        return quote('{0}/{1}'.format(username, repository), safe='')
 
     def get_issues_description(self, username, repository, issue_numbers):
         """
@@ -116,41 +215,62 @@ class Gitlab(RemoteRepoInterface):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary with the title and the body message of each issue
-            id.
+        :return: the Issue objects, with the title and the body, and the
+            not found issue numbers.
         """
         issues_descriptions = []
         not_found_issues = []
 
         if issue_numbers:
             project_id = self._get_project_id(username, repository)
-            request = '{0}/projects/{1}/issues'.format(self.api_url,
-                                                       project_id)
-
-            response_issues = self.requester.request(
-                'GET', request, extra_headers=self.auth_token_header
-            )
-            labels_info = self._get_labels(project_id)
-
-            for issue in response_issues:
-                issue_id = issue['iid']
-
-                if issue_id in issue_numbers:
-                    issue_labels = self._create_label_list(issue, labels_info)
+            base_request = '{0}/projects/{1}/issues?per_page={2}' \
+                '&with_labels_details=true'.format(self.api_url, project_id,
+                                                   self.PAGE_SIZE)
+
+            # Only the requested issues are asked for, in chunks that fit in
+            # a single page.
+            unique_numbers = list(OrderedDict.fromkeys(
+                str(issue_number) for issue_number in issue_numbers
+            ))
+            chunks = [
+                unique_numbers[index:index + self.PAGE_SIZE]
+                for index in range(0, len(unique_numbers), self.PAGE_SIZE)
+            ]
+
+            def request_chunk(chunk):
+                request = base_request + ''.join(
+                    '&iids[]={0}'.format(issue_number)
+                    for issue_number in chunk
+                )
+
+                return self.requester.request(
+                    'GET', request, extra_headers=self.auth_token_header,
+                    fields=self._ISSUE_FIELDS
+                ) or []
+
+            response_issues = [
+                issue for chunk_issues in self._map_concurrently(
+                    request_chunk, chunks
+                ) for issue in chunk_issues
+            ]
+            label_colors = self._get_label_colors(project_id,
+                                                  response_issues)
+            found_issues = {
+                str(issue['iid']): issue for issue in response_issues
+            }
 
-                    issue_description = {
-                        'number': issue_id,
-                        'labels': issue_labels,
-                        'description': {
-                            'title': issue['title'],
-                            'body': issue['description']
-                        }
-                    }
+            for issue_number in issue_numbers:
+                issue = found_issues.get(str(issue_number))
 
-                    issues_descriptions.append(issue_description)
+                if issue is None:
+                    not_found_issues.append(issue_number)
+                    continue
 
-            not_found_issues = [issue_number for issue_number in issue_numbers if issue_number not in [
-                issue['iid'] for issue in response_issues]]
+                issues_descriptions.append(Issue(
+                    issue['iid'], issue['title'], issue['description'],
+                    self._create_label_list(username, repository, issue,
+                                            label_colors)
+                ))
 
         return issues_descriptions, not_found_issues
 
@@ -173,17 +293,16 @@ class Gitlab(RemoteRepoInterface):
             request = request.format(self.api_url, project_id, issue_number)
 
             response_comments = self.requester.request(
-                'GET', request, extra_headers=self.auth_token_header
+                'GET', request, extra_headers=self.auth_token_header,
+                fields=self._COMMENT_FIELDS
             )
 
             if response_comments:
                 for comment in response_comments:
-                    issue_comments.append({
-                        'author': comment['author']['username'],
-                        'created_at': comment['created_at'],
-                        'updated_at': comment['updated_at'],
-                        'body': comment['body'],
-                    })
+                    issue_comments.append(Comment(
+                        comment['author']['username'], comment['created_at'],
+                        comment['updated_at'], comment['body']
+                    ))
 
         return issue_comments
 
@@ -201,37 +320,23 @@ class Gitlab(RemoteRepoInterface):
         to know if the 404 is because what it's not found is the repo or the
         issue. So it may happen that some issues aren't found but others that
         are.
+        :raises PartiallyClosedIssuesException: if only some of the issues
+        failed.
         """
-        closed_issues = []
-        not_found_issues = []
         project_id = self._get_project_id(username, repository)
+        base_request = '{0}/projects/{1}/issues/'.format(self.api_url,
+                                                         project_id)
+        payload = {
+            'state_event': 'close',
+        }
 
-        if project_id:
-            base_request = '{0}/projects/{1}/issues/'.format(self.api_url,
-                                                             project_id)
-            payload = {
-                'state_event': 'close',
-            }
+        def close_issue(issue):
+            return self.requester.request(
+                'PUT', base_request + str(issue),
+                extra_headers=self.auth_token_header, json_payload=payload
+            )
 
-            for issue in issue_numbers:
-                request = base_request + str(issue)
-
-                try:
-                    response_issue = self.requester.request(
-                        'PUT', request, extra_headers=self.auth_token_header,
-                        json_payload=payload
-                    )
-                    closed_issues.append({
-                        'number': issue,
-                        'title': response_issue['title'],
-                    })
-                except UnsuccessfulHttpRequestException as http_exception:
-                    if http_exception.code == 404:
-                        not_found_issues.append(issue)
-                    else:
-                        raise
-
-        return closed_issues, not_found_issues
+        return self._close_issues_concurrently(close_issue, issue_numbers)
 
     def create_comment(self, username, repository, issue, comment):
         """
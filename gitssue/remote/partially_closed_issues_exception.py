@@ -0,0 +1,24 @@
+""" Exception for when some of the issues to close couldn't be closed. """
+
+
+class PartiallyClosedIssuesException(Exception):
+    """
+    Exception for when some of the issues to close couldn't be closed, for a
+    reason different to not being found. Since the issues are closed
+    independently, the ones that could be closed (or that weren't found) are
+    also saved, so they are not lost because of the failed ones.
+    """
+
+    def __init__(self, cause, closed_issues, not_found_issues, failed_issues):
+        """
+        Constructor.
+        :param cause: the exception of the first failed issue.
+        :param closed_issues: the closed issues, with their number and title.
+        :param not_found_issues: the numbers of the issues not found.
+        :param failed_issues: the numbers of the issues that failed.
+        """
+        super(PartiallyClosedIssuesException, self).__init__(str(cause))
+        self.cause = cause
+        self.closed_issues = closed_issues
+        self.not_found_issues = not_found_issues
+        self.failed_issues = failed_issues
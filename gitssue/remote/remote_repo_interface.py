@@ -3,6 +3,14 @@ The interface the concrete repo modules (Github, Gitlab, etc.) will have
 to implement.
 """
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from gitssue.model.issue import Issue
+from gitssue.model.label_pool import LabelPool
+from gitssue.remote.partially_closed_issues_exception \
+    import PartiallyClosedIssuesException
+from gitssue.request.request_exception import get_request_exception
+from gitssue.request.unsuccessful_http_request_exception \
+    import UnsuccessfulHttpRequestException
 
 
 class RemoteRepoInterface(metaclass=ABCMeta):
@@ -24,10 +32,103 @@ class RemoteRepoInterface(metaclass=ABCMeta):
              'the documentation.',
     }
 
-    def __init__(self, requester, credentials='', auth_token=''):
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, requester, credentials='', auth_token='',
+                 max_workers=DEFAULT_MAX_WORKERS):
         self.requester = requester
         self.credentials = credentials
         self.auth_token = auth_token
+        self.max_workers = max_workers
+        self._label_pools = {}
+
+    def _get_label(self, username, repository, name, color):
+        """
+        Gets the label of the repository with the given name and color,
+        shared by every issue of the repository with the label (see
+        LabelPool).
+        :param username: the user owning the repository.
+        :param repository: the repository.
+        :param name: the name of the label.
+        :param color: the hexadecimal color of the label, without the "#".
+        :return: the Label object.
+        """
+        label_pool = self._label_pools.get((username, repository))
+
+        if label_pool is None:
+            label_pool = self._label_pools.setdefault((username, repository),
+                                                      LabelPool())
+
+        return label_pool.get(name, color)
+
+    def _map_concurrently(self, function, items):
+        """
+        Calls the function for each item, running at most self.max_workers
+        calls at the same time.
+
+        :param function: the function to call, receiving a single item.
+        :param items: the items to call the function with.
+        :return: the list of the results, in the same order of the items.
+        """
+        items = list(items)
+        workers = min(self.max_workers, len(items))
+
+        if workers <= 1:
+            return [function(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    def _close_issues_concurrently(self, close_issue, issue_numbers):
+        """
+        Closes the given issues concurrently (see _map_concurrently), keeping
+        the order of the given issue numbers in the results.
+
+        :param close_issue: function closing the received issue number, and
+            returning the response issue.
+        :param issue_numbers: the issues to close.
+        :raises PartiallyClosedIssuesException: if some issues failed for a
+            reason different to not being found, while others didn't.
+        :raises requests.RequestException: if every issue failed because of a
+            connection error.
+        :raises UnsuccessfulHttpRequestException: if every issue failed with a
+            code different to 404.
+        :return: the closed Issue objects (number and title), and the not
+            found issue numbers.
+        """
+        def close(issue):
+            try:
+                return close_issue(issue), None
+            except (UnsuccessfulHttpRequestException,
+                    get_request_exception()) as exception:
+                return None, exception
+
+        closed_issues = []
+        not_found_issues = []
+        failed_issues = []
+        first_exception = None
+
+        results = self._map_concurrently(close, issue_numbers)
+
+        for issue, (response_issue, exception) in zip(issue_numbers, results):
+            if exception is None:
+                closed_issues.append(Issue(issue, response_issue['title']))
+            elif getattr(exception, 'code', None) == 404:
+                not_found_issues.append(issue)
+            else:
+                failed_issues.append(issue)
+                first_exception = first_exception or exception
+
+        if failed_issues:
+            if not closed_issues and not not_found_issues:
+                raise first_exception
+
+            raise PartiallyClosedIssuesException(
+                first_exception, closed_issues, not_found_issues,
+                failed_issues
+            )
+
+        return closed_issues, not_found_issues
 
     @abstractmethod
     def get_issue_list(self, username, repository, show_all=False,
@@ -42,10 +143,55 @@ class RemoteRepoInterface(metaclass=ABCMeta):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary id:label format.
+        :return: the Issue objects (with the "body" only if the description
+            was requested).
         """
         pass
 
+    @abstractmethod
+    def get_updated_issues(self, username, repository, since=None):
+        """
+        Gets the issues (both open and closed) updated since the given time,
+        with everything the local mirror saves, from the least recently
+        updated one.
+
+        :param username: the user owning the repository.
+        :param repository: the repository to look the issues at.
+        :param since: the updated time (as returned in the "updated_at" field
+            of the issues) to get the issues updated since; None for every
+            issue.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200.
+        :return: a generator of the Issue objects, with the "number",
+            "title", "body", "closed", "updated_at", "labels" and "comments"
+            (the number of comments; None if it's unknown) fields.
+        """
+        pass
+
+    def get_issues_comments(self, username, repository, issue_numbers):
+        """
+        Gets the comments of each of the given issues, requesting them
+        concurrently (see _map_concurrently).
+
+        :param username: the user owning the repository.
+        :param repository: the repository to look the issues at.
+        :param issue_numbers: the issue numbers to get the comments of.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 200.
+        :return: the list of the comments of each issue, in the same order of
+            the issue numbers.
+        """
+        return self._map_concurrently(
+            lambda issue_number: self.get_issue_comments(
+                username, repository, issue_number
+            ),
+            issue_numbers
+        )
+
     @abstractmethod
     def get_issues_description(self, username, repository, issue_numbers):
         """
@@ -63,8 +209,8 @@ class RemoteRepoInterface(metaclass=ABCMeta):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: a dictionary with the title and the body message of each
-            issue id.
+        :return: the Issue objects, with the title and the body, and the
+            not found issue numbers.
         """
         pass
 
@@ -79,7 +225,7 @@ class RemoteRepoInterface(metaclass=ABCMeta):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
-        :return: the comments.
+        :return: the Comment objects.
         """
 
     @abstractmethod
@@ -94,6 +240,8 @@ class RemoteRepoInterface(metaclass=ABCMeta):
         request.
         :raises UnsuccessfulHttpRequestException: if the request code is
         different to 200.
+        :raises PartiallyClosedIssuesException: if only some of the issues
+        failed.
         """
         pass
 
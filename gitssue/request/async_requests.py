@@ -0,0 +1,101 @@
+"""
+asyncio version of the request interface, wrapping a blocking requester.
+"""
+import asyncio
+import functools
+
+
+class AsyncRequests:
+    """
+    asyncio version of the request interface: the same methods of
+    RequestInterface, but returning awaitables, so many requests can be
+    awaited together (e.g. with asyncio.gather) from a coroutine.
+
+    The requests are executed by the wrapped (blocking) requester in the
+    executor of the event loop (the default one, if no executor is given), so
+    they share the connection pool, the response cache, etc. of the requester.
+
+    It's only meant for applications embedding gitssue that make their own
+    requests to the APIs: neither the remotes nor AsyncRemote use it.
+
+    Requires Python 3.5 or newer (unlike the rest of gitssue, so this module
+    is not imported by it).
+    """
+
+    def __init__(self, requester, executor=None):
+        """
+        Constructor.
+        :param requester: the blocking RequestInterface implementation.
+        :param executor: the concurrent.futures.Executor to execute the
+            requests in; None for the default executor of the event loop.
+        """
+        self.requester = requester
+        self.executor = executor
+
+    def _run(self, function, *args):
+        """
+        Executes the function in the executor.
+        :return: the asyncio.Future of the result.
+        """
+        loop = asyncio.get_event_loop()
+
+        return loop.run_in_executor(self.executor,
+                                    functools.partial(function, *args))
+
+    async def request(self, method, request, credentials=None,
+                      extra_headers=None, json_payload=None, fields=None):
+        """
+        Executes a request.
+
+        :param request: the request to execute.
+        :param fields: the fields of the response to keep (see
+            JsonProjection); None for keeping every field.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 2XX.
+        :return: the response JSON object.
+        """
+        return await self._run(self.requester.request, method, request,
+                               credentials, extra_headers, json_payload,
+                               fields)
+
+    def request_pages(self, method, request, credentials=None,
+                      extra_headers=None, fields=None):
+        """
+        Executes a paginated request (see RequestInterface.request_pages).
+
+        :param request: the request of the first page.
+        :param fields: the fields of each page to keep (see JsonProjection);
+            None for keeping every field.
+        :return: asynchronous iterator of the response JSON object of each
+            page, to be used with "async for".
+        """
+        pages = self.requester.request_pages(method, request, credentials,
+                                             extra_headers, fields)
+
+        return _AsyncPages(self, pages)
+
+
+class _AsyncPages:
+    """
+    Asynchronous iterator of the pages of a paginated request, getting each
+    page from the blocking generator in the executor.
+    """
+
+    _END = object()
+
+    def __init__(self, async_requests, pages):
+        self.async_requests = async_requests
+        self.pages = pages
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        page = await self.async_requests._run(next, self.pages, self._END)
+
+        if page is self._END:
+            raise StopAsyncIteration
+
+        return page
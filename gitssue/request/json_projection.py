@@ -0,0 +1,64 @@
+"""
+Projection of the decoded JSON values to the fields a remote needs.
+"""
+
+
+class JsonProjection:
+    """
+    Projection of the decoded JSON values to the given fields, so the rest of
+    the payload (e.g. the "user", "reactions" or "pull_request" objects of
+    each issue of a GitHub list) is not kept in memory.
+
+    The fields are paths of keys separated by dots (e.g. "labels.name").
+    The projection of an object keeps only the keys of the fields (the
+    missing ones are not added), and the projection of an array is the
+    projection of each item of it. A field without nested fields keeps its
+    whole value, and any other value (a string, a number...) is kept as it
+    is.
+    """
+
+    def __init__(self, fields=None):
+        """
+        Constructor.
+        :param fields: the fields to keep; None for keeping every field.
+        """
+        self.tree = None
+
+        if fields is not None:
+            self.tree = {}
+
+            for field in fields:
+                node = self.tree
+
+                for key in field.split('.'):
+                    node = node.setdefault(key, {})
+
+    def apply(self, value):
+        """
+        Projects the value to the fields.
+        :param value: the decoded JSON value.
+        :return: the projected value.
+        """
+        if self.tree is None:
+            return value
+
+        return self._project(value, self.tree)
+
+    @classmethod
+    def _project(cls, value, tree):
+        """
+        Projects the value to the fields of the given level of the tree.
+        """
+        if not tree:
+            return value
+
+        if isinstance(value, dict):
+            return {
+                key: cls._project(value[key], subtree)
+                for key, subtree in tree.items() if key in value
+            }
+
+        if isinstance(value, list):
+            return [cls._project(item, tree) for item in value]
+
+        return value
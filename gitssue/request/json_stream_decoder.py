@@ -0,0 +1,202 @@
+"""
+Incremental decoder of the JSON response bodies.
+"""
+import codecs
+import json
+import re
+
+
+class JsonStreamDecoder:
+    """
+    Decoder of a JSON body received in chunks of bytes, decoding the items
+    of a top level array one at a time, as soon as they are received, so the
+    whole body (neither the bytes, nor the text, nor every decoded item) is
+    never held in memory at once.
+
+    The bytes are decoded as UTF-8, the encoding of the JSON exchanged
+    between systems, with an incremental decoder, so a character split
+    between two chunks is not broken.
+
+    The text of the read chunks is kept in a list, and only joined to the
+    unconsumed text of the buffer when it's needed, so the unconsumed text is
+    not copied again on every chunk. The items are decoded with
+    json.JSONDecoder.raw_decode as soon as the buffer holds them. When an
+    item is not complete yet, it's not tried again (nor the text joined)
+    until the available text has doubled, so a large item is decoded in
+    linear time no matter how small the chunks are.
+    """
+
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+    # The characters that can continue a number, until the end of the text.
+    _NUMBER_CONTINUATION = re.compile(r'[0-9.eE+-]*\Z')
+
+    def __init__(self, chunks):
+        """
+        Constructor.
+        :param chunks: the iterable of the chunks (bytes) of the body.
+        """
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._pending = []
+        self._pending_length = 0
+        self._finished = False
+
+    def is_array(self):
+        """
+        Checks if the value of the body is an array, reading the body until
+        its first character.
+        :return: True if it's an array; False otherwise.
+        """
+        return self._peek() == '['
+
+    def value(self):
+        """
+        Decodes the whole value of the body.
+        :raises ValueError: if the body is not valid JSON.
+        :return: the decoded value.
+        """
+        while self._read():
+            pass
+
+        self._join_pending()
+        text, self._buffer = self._buffer, ''
+
+        return self._json_decoder.decode(text)
+
+    def items(self):
+        """
+        Decodes the items of the array of the body, one at a time.
+        :raises ValueError: if the body is not a valid JSON array.
+        :return: generator of the decoded items.
+        """
+        if not self.is_array():
+            raise ValueError('The JSON value is not an array')
+
+        self._position += 1
+
+        if self._peek() != ']':
+            while True:
+                self._skip_whitespace()
+
+                yield self._decode_item()
+
+                character = self._peek()
+
+                if character == ']':
+                    break
+                if character != ',':
+                    raise ValueError('Expecting "," delimiter: char {0}'
+                                     .format(self._position))
+
+                self._position += 1
+
+        self._position += 1
+
+        if self._peek() is not None:
+            raise ValueError('Extra data: char {0}'.format(self._position))
+
+    def _decode_item(self):
+        """
+        Decodes the item starting at the current position, reading the body
+        until the item is complete, and followed by a character that can't
+        continue a number (so a number split between two chunks, even after
+        its "." or "e", is not decoded in half).
+        """
+        attempted = -1
+
+        while True:
+            available = len(self._buffer) - self._position \
+                + self._pending_length
+
+            if self._finished or available > attempted * 2:
+                self._join_pending()
+
+                try:
+                    item, end = self._json_decoder.raw_decode(self._buffer,
+                                                              self._position)
+                except ValueError:
+                    if self._finished:
+                        raise
+                else:
+                    may_continue = self._NUMBER_CONTINUATION.match(
+                        self._buffer, end
+                    )
+
+                    if self._finished or not may_continue:
+                        self._position = end
+
+                        return item
+
+                attempted = available
+
+            self._read()
+
+    def _peek(self):
+        """
+        Gets the next character that is not a whitespace, reading the body
+        until it.
+        :return: the character; None if the body has finished.
+        """
+        self._skip_whitespace()
+
+        if self._position < len(self._buffer):
+            return self._buffer[self._position]
+
+        return None
+
+    def _skip_whitespace(self):
+        """
+        Moves the position after the whitespaces, reading the body until a
+        character that is not a whitespace, or until the end.
+        """
+        while True:
+            self._position = self._WHITESPACE.match(self._buffer,
+                                                    self._position).end()
+
+            if self._position < len(self._buffer):
+                return
+
+            if not self._pending and not self._read():
+                return
+
+            self._join_pending()
+
+    def _read(self):
+        """
+        Reads the next chunk of the body to the pending text, without joining
+        it to the buffer yet.
+        :return: False if the body had already finished; True otherwise.
+        """
+        if self._finished:
+            return False
+
+        chunk = next(self._chunks, None)
+
+        if chunk is None:
+            text = self._text_decoder.decode(b'', final=True)
+            self._finished = True
+        else:
+            text = self._text_decoder.decode(chunk)
+
+        if text:
+            self._pending.append(text)
+            self._pending_length += len(text)
+
+        return True
+
+    def _join_pending(self):
+        """
+        Joins the pending text to the buffer, discarding the already decoded
+        text of it.
+        """
+        if not self._pending:
+            return
+
+        self._pending.insert(0, self._buffer[self._position:])
+        self._buffer = ''.join(self._pending)
+        self._position = 0
+        self._pending = []
+        self._pending_length = 0
@@ -0,0 +1,347 @@
+"""
+Rate limit budget of the APIs, tracked from the headers of the responses.
+"""
+import atexit
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class RateLimitBudget:
+    """
+    Rate limit budget of the APIs, tracked from the "X-RateLimit-Limit",
+    "X-RateLimit-Remaining", "X-RateLimit-Reset" (or "RateLimit-*") and
+    "Retry-After" headers of every response, for each host and identity (the
+    limits are per user), and for each resource of the API
+    ("X-RateLimit-Resource" header, e.g. the GitHub REST and GraphQL APIs have
+    separate limits).
+
+    Before each request, "wait" slows the requests down when few of them are
+    remaining, spreading the remaining ones until the reset time, instead of
+    using them up and failing; and, when the limit has been reached (or the
+    server asked to wait with "Retry-After"), it waits until the reset time.
+    No wait is longer than max_wait: if the limit resets later, the request is
+    sent anyway, so the error is reported instead of blocking.
+
+    The budget can be saved in a file, so it's known by the next executions
+    too (e.g. for showing the rate information without a request). It's saved
+    once, when the process exits, instead of after every response.
+    """
+
+    DEFAULT_MAX_WAIT = 60
+    DEFAULT_RESERVE = 10
+
+    def __init__(self, path=None, max_wait=DEFAULT_MAX_WAIT,
+                 reserve=DEFAULT_RESERVE):
+        """
+        Constructor. The file is not read until the budget is used.
+        :param path: the file to save the budget at; None for not saving it.
+        :param max_wait: the maximum seconds to wait before a request.
+        :param reserve: the percentage of the limit from which the requests
+            are slowed down.
+        """
+        self.logger = logging.getLogger('gitssue.request.rate_limit_budget')
+        self.path = path
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self._buckets = None
+        self._lock = threading.Lock()
+        self._changed = False
+        self._save_registered = False
+
+    @staticmethod
+    def identity(credentials=None, headers=None):
+        """
+        Gets the identity the requests are made as, for not mixing the limits
+        of different users (or anonymous requests).
+        :param credentials: the credentials of the request.
+        :param headers: the headers of the request, which may include an auth
+            token.
+        :return: the hashed identity.
+        """
+        credentials = credentials or {}
+        headers = headers or {}
+        identity_source = json.dumps([
+            credentials.get('username'),
+            headers.get('Authorization'),
+            headers.get('PRIVATE-TOKEN'),
+        ])
+
+        return hashlib.sha256(identity_source.encode('utf-8')).hexdigest()[:16]
+
+    def record(self, request, identity, status_code, headers):
+        """
+        Records the rate limit headers of a response, if any.
+        :param request: the URL of the request.
+        :param identity: the identity of the request (see identity).
+        :param status_code: the HTTP status code of the response.
+        :param headers: the headers of the response.
+        """
+        now = time.time()
+        limit = self.parse_int(self._get_header(headers, 'Limit'))
+        remaining = self.parse_int(self._get_header(headers, 'Remaining'))
+        reset = self.parse_int(self._get_header(headers, 'Reset'))
+        retry_after = self.parse_retry_after(headers.get('Retry-After'), now)
+
+        if remaining is None and retry_after is None:
+            return
+
+        resource = headers.get('X-RateLimit-Resource')
+        if not isinstance(resource, str):
+            resource = self.resource(request)
+
+        key = self._key(request, identity, resource)
+
+        with self._lock:
+            bucket = self._get_buckets().setdefault(key, {})
+
+            if remaining is not None:
+                # The responses of concurrent requests may arrive in any
+                # order, so, within the same window, the lowest is the latest.
+                if bucket.get('reset') == reset \
+                   and bucket.get('remaining') is not None:
+                    remaining = min(remaining, bucket['remaining'])
+
+                bucket.update({
+                    'limit': limit,
+                    'remaining': remaining,
+                    'reset': reset,
+                    'observed_at': now,
+                })
+
+            if retry_after is not None:
+                self.logger.debug(
+                    'HTTP {0}, retry after {1:.0f} s: {2}'.format(
+                        status_code, retry_after - now, request
+                    )
+                )
+                bucket['retry_after'] = retry_after
+
+            self._changed = True
+
+            if self.path is not None and not self._save_registered:
+                atexit.register(self.save)
+                self._save_registered = True
+
+    def get(self, request, identity, resource='core'):
+        """
+        Gets the last observed rate limit of the host of the request.
+        :param request: a URL of the API.
+        :param identity: the identity (see identity).
+        :param resource: the resource of the API.
+        :return: the limit, the remaining requests and the reset time (Unix
+            timestamp); None if it's unknown, or if it has already been
+            reset.
+        """
+        key = self._key(request, identity, resource)
+
+        with self._lock:
+            bucket = self._get_buckets().get(key)
+
+        if bucket is None or bucket.get('remaining') is None \
+           or bucket.get('limit') is None or bucket.get('reset') is None \
+           or bucket['reset'] <= time.time():
+            return None
+
+        return bucket['limit'], bucket['remaining'], bucket['reset']
+
+    def wait(self, request, identity):
+        """
+        Waits before sending a request, if the budget of its host is (almost)
+        exhausted, counting the request as made.
+        :param request: the URL of the request.
+        :param identity: the identity of the request (see identity).
+        :return: the waited seconds.
+        """
+        delay = self._reserve(request, identity)
+
+        if delay > 0:
+            self.logger.info('Rate limit: waiting {0:.1f} s before {1}'.format(
+                delay, request
+            ))
+            time.sleep(delay)
+
+        return delay
+
+    def _reserve(self, request, identity):
+        """
+        Calculates the delay before the request, from the bucket of the
+        resource the request uses, and counts it in the remaining requests of
+        that bucket, so the concurrent requests take it into account.
+        :return: the seconds to wait.
+        """
+        key = self._key(request, identity, self.resource(request))
+        now = time.time()
+        delay = 0
+
+        with self._lock:
+            bucket = self._get_buckets().get(key)
+
+            if bucket is not None:
+                retry_after = bucket.get('retry_after') or 0
+                if retry_after > now:
+                    delay = retry_after - now
+
+                delay = max(delay, self._pacing_delay(bucket, now))
+
+                if bucket.get('remaining') \
+                   and (bucket.get('reset') or 0) > now:
+                    bucket['remaining'] -= 1
+
+        if delay > self.max_wait:
+            self.logger.info('Rate limit: the limit resets in {0:.0f} s, not '
+                             'waiting for {1}'.format(delay, request))
+            return 0
+
+        return delay
+
+    def _pacing_delay(self, bucket, now):
+        """
+        Calculates the delay for spreading the remaining requests of the
+        bucket until its reset time.
+        :return: the seconds to wait.
+        """
+        remaining = bucket.get('remaining')
+        reset = bucket.get('reset')
+        limit = bucket.get('limit')
+
+        if remaining is None or reset is None or reset <= now:
+            return 0
+
+        if remaining <= 0:
+            return reset - now
+
+        if limit and remaining * 100 < limit * self.reserve:
+            return min((reset - now) / remaining, self.max_wait)
+
+        return 0
+
+    @staticmethod
+    def resource(request):
+        """
+        Gets the resource of the API a request uses, for the responses without
+        the "X-RateLimit-Resource" header, and for the requests not sent yet:
+        the GitHub GraphQL and search APIs have their own limits, and the rest
+        of the requests use the "core" one.
+        :param request: the URL of the request.
+        :return: the resource.
+        """
+        path = urlsplit(request).path.rstrip('/')
+
+        if path.endswith('/graphql'):
+            return 'graphql'
+        if path.startswith('/search/'):
+            return 'search'
+
+        return 'core'
+
+    @staticmethod
+    def _key(request, identity, resource):
+        """
+        Gets the key of the bucket of a request.
+        :return: the key.
+        """
+        return '{0} {1} {2}'.format(urlsplit(request).netloc, identity,
+                                    resource)
+
+    @staticmethod
+    def _get_header(headers, name):
+        """
+        Gets a rate limit header, with the "X-RateLimit-" prefix (GitHub,
+        Bitbucket), or with the "RateLimit-" one (Gitlab).
+        :param name: the name of the header, without the prefix.
+        :return: the value of the header; None if it's not set.
+        """
+        value = headers.get('X-RateLimit-' + name)
+
+        if value is None:
+            value = headers.get('RateLimit-' + name)
+
+        return value
+
+    @staticmethod
+    def parse_int(value):
+        """
+        Parses an integer header.
+        :return: the integer; None if the value is not an integer.
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def parse_retry_after(cls, value, now):
+        """
+        Parses the "Retry-After" header, with the seconds to wait, or an HTTP
+        date.
+        :return: the time until the request has to be retried (Unix
+            timestamp); None if the value is not valid.
+        """
+        seconds = cls.parse_int(value)
+
+        if seconds is not None:
+            return now + seconds
+
+        if not isinstance(value, str):
+            return None
+
+        try:
+            return email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def _get_buckets(self):
+        """
+        Gets the buckets, reading them from the file the first time.
+        :return: the dictionary of the buckets.
+        """
+        if self._buckets is None:
+            self._buckets = {}
+
+            if self.path is not None:
+                try:
+                    with open(self.path, encoding='utf-8') as file:
+                        buckets = json.load(file)
+                    if isinstance(buckets, dict):
+                        self._buckets = buckets
+                except (OSError, ValueError):
+                    pass
+
+        return self._buckets
+
+    def save(self):
+        """
+        Saves the buckets in the file, if any, and if they have changed since
+        they were read or last saved. The file is written to a temporary file
+        first, and then moved, so it's never read half written.
+        """
+        if self.path is None:
+            return
+
+        with self._lock:
+            if not self._changed:
+                return
+
+            content = json.dumps(self._buckets)
+            self._changed = False
+
+        directory = os.path.dirname(self.path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+
+            with open(file_descriptor, 'w', encoding='utf-8') as file:
+                file.write(content)
+
+            os.replace(temporary_path, self.path)
+        except OSError as os_error:
+            self.logger.debug('The rate limit budget could not be saved: '
+                              '{0}'.format(os_error))
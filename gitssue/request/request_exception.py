@@ -0,0 +1,28 @@
+"""
+Lazy access to the base exception of the requests package.
+"""
+import sys
+
+
+class _NeverRaisedException(Exception):
+    """
+    Exception that is never raised, caught instead of the RequestException
+    when the requests package has not been imported.
+    """
+
+
+def get_request_exception():
+    """
+    Gets requests.exceptions.RequestException, for catching it, without
+    importing the requests package (slow to import) if it has not been
+    imported yet. In that case no request has been sent, so no
+    RequestException can have been raised, and an exception that is never
+    raised is returned instead.
+    :return: the exception class to catch.
+    """
+    exceptions = sys.modules.get('requests.exceptions')
+
+    if exceptions is None:
+        return _NeverRaisedException
+
+    return exceptions.RequestException
@@ -11,11 +11,38 @@ class RequestInterface(metaclass=ABCMeta):
 
     @abstractmethod
     def request(self, method, request, credentials=None, extra_headers=None,
-                json_payload=None):
+                json_payload=None, fields=None):
         """
         Executes a request.
 
         :param request: the GET request to execute.
+        :param fields: the fields of the response to keep (see
+            JsonProjection); None for keeping every field.
         :return: response response.
         """
         pass
+
+    @abstractmethod
+    def request_pages(self, method, request, credentials=None,
+                      extra_headers=None, fields=None):
+        """
+        Executes a paginated request, following the next page of each
+        response.
+
+        :param request: the request of the first page.
+        :param fields: the fields of each page to keep (see JsonProjection);
+            None for keeping every field.
+        :return: generator of the response of each page.
+        """
+        pass
+
+    def get_rate_limit(self, request, credentials=None, extra_headers=None):
+        """
+        Gets the rate limit of the API of the request, as observed in the
+        previous responses.
+
+        :param request: a URL of the API.
+        :return: the limit, the remaining requests and the reset time; None if
+            it's unknown.
+        """
+        return None
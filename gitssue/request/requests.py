@@ -2,33 +2,340 @@
 Concrete implementation requests_interface, using "requests" module.
 """
 import logging
-import json
-import requests
-from requests.exceptions import RequestException
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gitssue.request.json_projection import JsonProjection
+from gitssue.request.json_stream_decoder import JsonStreamDecoder
+from gitssue.request.rate_limit_budget import RateLimitBudget
 from gitssue.request.request_interface import RequestInterface
+from gitssue.request.response_cache import ResponseCache
+from gitssue.request.retry_policy import RetryPolicy
 from gitssue.request.unsuccessful_http_request_exception \
     import UnsuccessfulHttpRequestException
+from gitssue.timings.timings import Timings
 
 
 class Requests(RequestInterface):
     """
     Concrete implementation requests_interface, using "requests" module.
+
+    Every request goes through the same requests.Session, so the connections
+    are kept alive and reused between the requests made to the same host (each
+    host having its own connection pool), instead of opening a new TCP
+    connection (and TLS handshake) for each API call.
+
+    The requests package is not imported until the session is created, since
+    importing it takes a noticeable part of the startup time.
+
+    The rate limit headers of every response are recorded in the rate limit
+    budget, which slows the requests down before the limit is reached.
+
+    The responses are streamed, and decoded from the received bytes as they
+    arrive (see JsonStreamDecoder), projecting each item of the arrays to the
+    fields the caller needs (see JsonProjection) as soon as it's decoded, so
+    the whole payload is never held in memory.
     """
 
     _TIMEOUT = 5.0
+    _CHUNK_SIZE = 64 * 1024
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_KEEP_ALIVE = True
 
-    def __init__(self):
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE,
+                 keep_alive=DEFAULT_KEEP_ALIVE, cache_directory=None,
+                 rate_limit_budget=None, retry_policy=None, timings=None):
+        """
+        Constructor. The session is not created until the first request.
+        :param pool_size: the maximum number of connections kept alive for
+            each host.
+        :param keep_alive: if the connections have to be kept alive between
+            requests or not.
+        :param cache_directory: the directory for caching the GET responses,
+            for making conditional requests; None for not caching them.
+        :param rate_limit_budget: the RateLimitBudget to record the rate
+            limits in; None for a new one, not saved.
+        :param retry_policy: the RetryPolicy of the failed requests; None for
+            the default one.
+        :param timings: the Timings to record each request in; None for not
+            recording them.
+        """
         self.logger = logging.getLogger('gitssue.request.requests')
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.response_cache = None
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.rate_limit_budget = rate_limit_budget or RateLimitBudget()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timings = timings or Timings()
+
+        if cache_directory is not None:
+            self.response_cache = ResponseCache(cache_directory)
+
+    def configure(self, pool_size=None, keep_alive=None, cache_directory=None,
+                  rate_limit_budget=None, retry_policy=None):
+        """
+        Changes the connection pool settings. If a session was already opened,
+        it's closed, so the next request will use the new settings.
+        :param pool_size: the maximum number of connections kept alive for
+            each host.
+        :param keep_alive: if the connections have to be kept alive between
+            requests or not.
+        :param cache_directory: the directory for caching the GET responses.
+        :param rate_limit_budget: the RateLimitBudget to record the rate
+            limits in.
+        :param retry_policy: the RetryPolicy of the failed requests.
+        """
+        if pool_size is not None:
+            self.pool_size = pool_size
+        if keep_alive is not None:
+            self.keep_alive = keep_alive
+        if cache_directory is not None:
+            self.response_cache = ResponseCache(cache_directory)
+        if rate_limit_budget is not None:
+            self.rate_limit_budget = rate_limit_budget
+        if retry_policy is not None:
+            self.retry_policy = retry_policy
+
+        self.close()
+
+    @property
+    def session(self):
+        """
+        The long-lived session shared by all the requests.
+        :return: the requests.Session object.
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+
+                if not self.keep_alive:
+                    session.headers['Connection'] = 'close'
+
+                self._session = session
+
+            return self._session
+
+    def close(self):
+        """
+        Closes the session, and all its pooled connections.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     def request(self, method, request, credentials=None, extra_headers=None,
-                json_payload=None):
+                json_payload=None, fields=None):
         """
         Executes a request.
 
         :param request: the GET request to execute.
+        :param fields: the fields of the response to keep (see
+            JsonProjection); None for keeping every field.
         :return: response JSON object; False if the HTTP status code distinct
             to 200.
         """
+        response_object, _ = self._fetch(method, request, credentials,
+                                         extra_headers, json_payload, fields)
+
+        return response_object
+
+    def get_rate_limit(self, request, credentials=None, extra_headers=None):
+        """
+        Gets the rate limit of the API of the request, as observed in the
+        last response of the same identity (see RateLimitBudget.get).
+
+        :param request: a URL of the API.
+        :return: the limit, the remaining requests and the reset time (Unix
+            timestamp); None if it's unknown.
+        """
+        identity = RateLimitBudget.identity(credentials, extra_headers)
+
+        return self.rate_limit_budget.get(request, identity)
+
+    def request_pages(self, method, request, credentials=None,
+                      extra_headers=None, fields=None):
+        """
+        Executes a paginated request, following the 'rel="next"' URL of the
+        "Link" header of each response (or the "next" field of the response
+        object, if there's no such header), yielding the JSON object of each
+        page.
+
+        The next page is requested in background while the current one is
+        being consumed, and only these two pages are kept in memory, no matter
+        how many pages there are.
+
+        :param request: the request of the first page.
+        :param fields: the fields of each page to keep (see JsonProjection);
+            None for keeping every field.
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code of any
+        page is different to 2XX.
+        :return: generator of the response JSON object of each page.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._fetch, method, request,
+                                     credentials, extra_headers, None, fields)
+
+            while future is not None:
+                with self.timings.measure('wait', 'next page'):
+                    page, next_request = future.result()
+                future = None
+
+                if next_request:
+                    future = executor.submit(self._fetch, method,
+                                             next_request, credentials,
+                                             extra_headers, None, fields)
+
+                yield page
+
+    def _fetch(self, method, request, credentials=None, extra_headers=None,
+               json_payload=None, fields=None):
+        """
+        Executes a request, returning the decoded response, projected to the
+        given fields.
+
+        If the response cache is enabled, the GET requests (without a time
+        cursor, see ResponseCache.is_cacheable) are sent with the
+        "If-None-Match" and "If-Modified-Since" headers of the previous
+        response of the same URL, credentials and fields, and, if the server
+        answers with a 304 (Not Modified), the cached response is returned.
+
+        The time of the request includes the time reading the body, which is
+        not counted in the time of decoding it.
+
+        :return: the response JSON object, and the URL of the next page (None
+            if it's the last one).
+        """
+        cache_key = None
+        cached_entry = None
+        headers = dict(extra_headers) if extra_headers is not None else {}
+
+        if self.response_cache is not None and method == 'GET' \
+                and self.response_cache.is_cacheable(request):
+            cache_key = self.response_cache.key(request, credentials, headers,
+                                                fields)
+            cached_entry = self.response_cache.get(cache_key)
+
+            if cached_entry is not None:
+                if cached_entry.get('etag'):
+                    headers['If-None-Match'] = cached_entry['etag']
+                if cached_entry.get('last_modified'):
+                    headers['If-Modified-Since'] = \
+                        cached_entry['last_modified']
+
+        started = time.perf_counter()
+
+        try:
+            response = self._send(method, request, credentials, headers,
+                                  json_payload)
+        except UnsuccessfulHttpRequestException as unsuccessful_request:
+            self.timings.record_request(method, request,
+                                        time.perf_counter() - started,
+                                        unsuccessful_request.code)
+            raise
+        except Exception:
+            self.timings.record_request(method, request,
+                                        time.perf_counter() - started)
+            raise
+
+        elapsed = time.perf_counter() - started
+        not_modified = response.status_code == 304 and cached_entry is not None
+        cache = None
+
+        if cache_key is not None:
+            cache = 'hit' if not_modified else 'miss'
+
+        if not_modified:
+            self.timings.record_request(method, request, elapsed,
+                                        response.status_code, 0, cache)
+            self.logger.debug('Not modified, using the cached response: '
+                              '{0}'.format(request))
+            response.close()
+
+            return cached_entry['body'], cached_entry.get('next')
+
+        # The bytes received and the seconds spent reading them.
+        received = [0, 0.0]
+
+        def read_body():
+            chunks = iter(response.iter_content(self._CHUNK_SIZE))
+
+            while True:
+                read_started = time.perf_counter()
+                chunk = next(chunks, None)
+                received[1] += time.perf_counter() - read_started
+
+                if chunk is None:
+                    return
+
+                received[0] += len(chunk)
+                yield chunk
+
+        decode_started = time.perf_counter()
+        projection = JsonProjection(fields)
+        decoder = JsonStreamDecoder(read_body())
+        next_request = response.links.get('next', {}).get('url')
+
+        try:
+            if decoder.is_array():
+                response_object = [projection.apply(item)
+                                   for item in decoder.items()]
+            else:
+                response_object = decoder.value()
+
+                # Some APIs (e.g. Bitbucket) send the next page URL in the
+                # body.
+                if not next_request and isinstance(response_object, dict):
+                    next_request = response_object.get('next')
+
+                response_object = projection.apply(response_object)
+        finally:
+            response.close()
+
+        self.timings.record_request(method, request, elapsed + received[1],
+                                    response.status_code, received[0], cache)
+        self.timings.record('json', 'decode', time.perf_counter()
+                            - decode_started - received[1])
+
+        if cache_key is not None:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+            if etag or last_modified:
+                self.response_cache.set(cache_key, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'body': response_object,
+                    'next': next_request,
+                })
+
+        return response_object, next_request
+
+    def _send(self, method, request, credentials=None, extra_headers=None,
+              json_payload=None):
+        """
+        Sends the request through the session, retrying it if it fails and
+        the retry policy allows it. Every retry is logged as a warning, with
+        the wait.
+
+        :raises requests.RequestException: if an error occurs during the
+        request.
+        :raises UnsuccessfulHttpRequestException: if the request code is
+        different to 2XX.
+        :return: the requests.Response object.
+        """
+        from requests.exceptions import RequestException
+
         authentication = ()
         headers = {}
         json_data = {}
@@ -44,28 +351,65 @@ class Requests(RequestInterface):
            and 'password' in credentials:
             authentication = (credentials['username'], credentials['password'])
 
-        try:
-            response = requests.request(
-                method,
-                request,
-                auth=authentication,
-                headers=headers,
-                json=json_data,
-                timeout=self._TIMEOUT,
-            )
-        except RequestException:
-            raise
+        identity = RateLimitBudget.identity(credentials, headers)
+        started = time.monotonic()
+        retries = 0
 
-        if not response.ok:
-            self.logger.debug('ERROR: HTTP {0}: {1}'.format(
-                response.status_code, response.text
-            ))
+        while True:
+            self.rate_limit_budget.wait(request, identity)
 
-            raise UnsuccessfulHttpRequestException(
-                response.status_code, response.headers
-            )
+            try:
+                response = self.session.request(
+                    method,
+                    request,
+                    auth=authentication,
+                    headers=headers,
+                    json=json_data,
+                    timeout=self._TIMEOUT,
+                    stream=True,
+                )
+            except RequestException as request_exception:
+                delay = self.retry_policy.get_delay(
+                    method, retries, time.monotonic() - started,
+                    exception=request_exception
+                )
 
-        response_object = json.loads(response.text)
-        response.close()
+                if delay is None:
+                    raise
 
-        return response_object
+                reason = type(request_exception).__name__
+            else:
+                self.rate_limit_budget.record(request, identity,
+                                              response.status_code,
+                                              response.headers)
+
+                if response.ok:
+                    break
+
+                self.logger.debug('ERROR: HTTP {0}: {1}'.format(
+                    response.status_code, response.text
+                ))
+
+                delay = self.retry_policy.get_delay(
+                    method, retries, time.monotonic() - started,
+                    response=response
+                )
+
+                if delay is None:
+                    raise UnsuccessfulHttpRequestException(
+                        response.status_code, response.headers
+                    )
+
+                reason = 'HTTP {0}'.format(response.status_code)
+                response.close()
+
+            retries += 1
+            self.logger.warning(
+                '{0} {1} failed ({2}), retry {3} of {4} in {5:.1f} s'.format(
+                    method, request, reason, retries,
+                    self.retry_policy.max_retries, delay
+                )
+            )
+            time.sleep(delay)
+
+        return response
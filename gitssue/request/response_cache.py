@@ -0,0 +1,152 @@
+"""
+On-disk cache of the responses, for making conditional requests.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+
+class ResponseCache:
+    """
+    On-disk cache of the responses, storing the validators ("ETag" and
+    "Last-Modified" headers) and the body of each response, in a file for each
+    URL and credentials. The credentials are part of the key (hashed, never
+    stored), so a response is never served to other user than the one that
+    requested it.
+
+    The requests with a time cursor (e.g. the "since" parameter of the
+    issues updated since the last sync) are not cached, since their URL is
+    never requested again. The entries not used for max_age seconds are
+    removed when the first entry of the process is stored, so the directory
+    doesn't grow forever.
+    """
+
+    DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+    # The query parameters of the time cursors (GitHub and GitLab), and the
+    # field of the BBQL queries (Bitbucket) filtering by the updated time.
+    _TIME_CURSOR_PARAMETERS = ('since', 'updated_after')
+    _TIME_CURSOR_QUERY_FIELD = 'updated_on'
+
+    def __init__(self, directory, max_age=DEFAULT_MAX_AGE):
+        """
+        Constructor. The directory is not created until the first response is
+        stored.
+        :param directory: the directory to store the responses at.
+        :param max_age: the seconds an entry is kept since it was last used.
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self._pruned = False
+
+    @classmethod
+    def is_cacheable(cls, request):
+        """
+        Checks if the response of a request has to be cached, that is, if the
+        request has no time cursor.
+        :param request: the URL of the request.
+        :return: True if it has to be cached; False otherwise.
+        """
+        query = parse_qs(urlsplit(request).query)
+
+        if any(parameter in query
+               for parameter in cls._TIME_CURSOR_PARAMETERS):
+            return False
+
+        return not any(cls._TIME_CURSOR_QUERY_FIELD in value
+                       for value in query.get('q', []))
+
+    @staticmethod
+    def key(request, credentials=None, headers=None, fields=None):
+        """
+        Gets the cache key of a request.
+        :param request: the URL of the request.
+        :param credentials: the credentials used for the request.
+        :param headers: the headers of the request (which may include auth
+            tokens).
+        :param fields: the fields the response is projected to (see
+            JsonProjection), since only these are stored.
+        :return: the key.
+        """
+        key_source = json.dumps([
+            request,
+            sorted((credentials or {}).items()),
+            sorted((headers or {}).items()),
+            sorted(fields) if fields is not None else None,
+        ], default=str)
+
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Gets the stored entry of the given key, marking it as used (by its
+        modification time), so it's not removed while it's being used.
+        :param key: the cache key.
+        :return: the entry dictionary (with the "etag", "last_modified", "body"
+            and "next" keys); None if there's no (valid) entry.
+        """
+        path = self._get_path(key)
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                entry = json.load(file)
+
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return entry
+
+    def set(self, key, entry):
+        """
+        Stores the entry for the given key. The entry is written to a
+        temporary file that is then renamed, so a concurrent gitssue process
+        never reads a half written entry. The errors are ignored, since the
+        cache is just an optimization.
+        :param key: the cache key.
+        :param entry: the entry dictionary.
+        """
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=self.directory
+            )
+
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                json.dump(entry, file)
+
+            os.replace(temporary_path, self._get_path(key))
+        except OSError:
+            pass
+
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+
+    def prune(self):
+        """
+        Removes the entries (and the temporary files left by interrupted
+        processes) not used for max_age seconds. The errors are ignored, e.g.
+        an entry removed meanwhile by another process.
+        """
+        oldest_time = time.time() - self.max_age
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            path = os.path.join(self.directory, name)
+
+            try:
+                if os.path.getmtime(path) < oldest_time:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + '.json')
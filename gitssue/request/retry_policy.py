@@ -0,0 +1,155 @@
+"""
+Policy for retrying the failed requests.
+"""
+import random
+import time
+from gitssue.request.rate_limit_budget import RateLimitBudget
+
+
+class RetryPolicy:
+    """
+    Policy for retrying the failed requests, with exponential backoff and
+    jitter: the n-th retry waits between the half and the whole of
+    backoff * 2^n seconds (at most max_backoff), so many clients failing at
+    the same time don't retry at the same time too.
+
+    The connection errors and the server errors (5XX) are retried only for
+    idempotent methods, since, for the others (e.g. the POST of creating an
+    issue), the server may have processed the request before failing, and
+    retrying it would duplicate it. The rate limit errors (429, and the GitHub
+    403 with "Retry-After", or with the limit reached) are retried for every
+    method, since the server refuses these requests without processing them,
+    waiting at least what the server says. Nothing is retried if it would
+    exceed max_time since the first attempt.
+    """
+
+    DEFAULT_MAX_RETRIES = 5
+    DEFAULT_BACKOFF = 0.5
+    DEFAULT_MAX_BACKOFF = 30
+    DEFAULT_MAX_TIME = 120
+
+    RETRYABLE_STATUS_CODES = frozenset((500, 502, 503, 504))
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT',
+                                    'DELETE'))
+
+    # GitHub doesn't always send "Retry-After" for its secondary rate limits,
+    # recommending to wait at least one minute.
+    _SECONDARY_RATE_LIMIT_WAIT = 60
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 max_time=DEFAULT_MAX_TIME, random_generator=None):
+        """
+        Constructor.
+        :param max_retries: the maximum number of retries of a request; 0 for
+            not retrying.
+        :param backoff: the base wait, in seconds.
+        :param max_backoff: the maximum wait of the backoff, in seconds.
+        :param max_time: the maximum seconds since the first attempt to retry
+            a request.
+        :param random_generator: the random.Random object for the jitter.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_time = max_time
+        self.random = random_generator or random.Random()
+
+    def get_delay(self, method, retries, elapsed, response=None,
+                  exception=None):
+        """
+        Gets how long to wait before retrying a failed request.
+
+        :param method: the HTTP method of the request.
+        :param retries: the number of retries already made.
+        :param elapsed: the seconds since the first attempt.
+        :param response: the unsuccessful requests.Response, if any.
+        :param exception: the requests.RequestException, if the request
+            failed without a response.
+        :return: the seconds to wait; None if the request must not be
+            retried.
+        """
+        if retries >= self.max_retries:
+            return None
+
+        if exception is not None:
+            minimum_delay = self._get_exception_delay(method, exception)
+        else:
+            minimum_delay = self._get_response_delay(method, response)
+
+        if minimum_delay is None:
+            return None
+
+        delay = max(self._get_backoff(retries), minimum_delay)
+
+        if elapsed + delay > self.max_time:
+            return None
+
+        return delay
+
+    def _get_backoff(self, retries):
+        """
+        Gets the exponential backoff, with jitter, of the retry.
+        :param retries: the number of retries already made.
+        :return: the seconds to wait.
+        """
+        backoff = min(self.max_backoff, self.backoff * 2 ** retries)
+
+        return backoff / 2 + self.random.uniform(0, backoff / 2)
+
+    def _get_exception_delay(self, method, exception):
+        """
+        Gets the minimum wait before retrying a request that failed without
+        a response.
+        :return: the seconds to wait; None if it must not be retried.
+        """
+        from requests.exceptions import ConnectionError, ConnectTimeout, \
+            Timeout
+
+        # The request was never sent if the connection couldn't be opened.
+        if isinstance(exception, ConnectTimeout):
+            return 0
+
+        if method.upper() in self.IDEMPOTENT_METHODS \
+           and isinstance(exception, (ConnectionError, Timeout)):
+            return 0
+
+        return None
+
+    def _get_response_delay(self, method, response):
+        """
+        Gets the minimum wait before retrying a request that failed with an
+        unsuccessful response.
+        :return: the seconds to wait; None if it must not be retried.
+        """
+        now = time.time()
+        status_code = response.status_code
+        headers = response.headers
+        retry_after = RateLimitBudget.parse_retry_after(
+            headers.get('Retry-After'), now
+        )
+
+        if retry_after is not None and status_code in (403, 429, 503):
+            return max(0, retry_after - now)
+
+        if status_code == 429:
+            return 0
+
+        if status_code == 403:
+            if headers.get('X-RateLimit-Remaining') == '0':
+                reset = RateLimitBudget.parse_int(
+                    headers.get('X-RateLimit-Reset')
+                )
+                return max(0, reset - now) if reset is not None else None
+
+            text = response.text if isinstance(response.text, str) else ''
+            if 'secondary rate limit' in text.lower():
+                return self._SECONDARY_RATE_LIMIT_WAIT
+
+            return None
+
+        if status_code in self.RETRYABLE_STATUS_CODES \
+           and method.upper() in self.IDEMPOTENT_METHODS:
+            return 0
+
+        return None
@@ -0,0 +1,216 @@
+"""
+Timings of the steps of a command, for the --timings option.
+"""
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class Timings:
+    """
+    Records how long each step of a command takes (resolving the repository
+    with git, reading the config, each HTTP request, decoding the JSON
+    responses, printing the output...), for showing a summary at the end.
+
+    The steps are recorded by the hooks of the components (Requests,
+    GitWrapper, and the printer of the Controller), so the remotes don't need
+    any code for it. When it's not enabled, nothing is recorded.
+
+    The time of the steps measured inside other step in the same thread (e.g.
+    a request made while printing a streamed issue list) is not counted in the
+    "self" time of the outer one.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Constructor.
+        :param enabled: if the steps have to be recorded or not.
+        """
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self._steps = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def measure(self, category, name, **details):
+        """
+        Measures the step executed inside the "with" block.
+        :param category: the category of the step (e.g. "git", "http").
+        :param name: the name of the step.
+        :param details: details of the step, as for record_request.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._get_stack()
+        frame = [0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+
+            if stack:
+                stack[-1][0] += elapsed
+
+            self._add(category, name, elapsed, elapsed - frame[0], **details)
+
+    def record_request(self, method, url, seconds, status=None, size=0,
+                       cache=None):
+        """
+        Records an HTTP request, grouping the requests by the template of
+        their URL (without the query, and with "{n}" instead of the numbers of
+        the path).
+        :param method: the HTTP method.
+        :param url: the URL of the request.
+        :param seconds: how long the request took.
+        :param status: the HTTP status of the response; None if there was no
+            response.
+        :param size: the size of the response body, in bytes.
+        :param cache: "hit" if the response was served from the cache,
+            "miss" if it wasn't, or None if the request was not cacheable.
+        """
+        self.record('http', '{0} {1}'.format(method, self.url_template(url)),
+                    seconds, status=status, size=size, cache=cache)
+
+    def record(self, category, name, seconds, **details):
+        """
+        Records a step measured by the caller (e.g. when it's not executed in
+        a single block), as if it was measured inside the step being measured
+        in the current thread, if any.
+        :param category: the category of the step.
+        :param name: the name of the step.
+        :param seconds: how long the step took.
+        :param details: details of the step, as for record_request.
+        """
+        if not self.enabled:
+            return
+
+        stack = self._get_stack()
+
+        if stack:
+            stack[-1][0] += seconds
+
+        self._add(category, name, seconds, seconds, **details)
+
+    @staticmethod
+    def url_template(url):
+        """
+        Gets the template of the URL: the host and the path, with "{n}"
+        instead of the numbers.
+        :param url: the URL.
+        :return: the template.
+        """
+        split_url = urlsplit(url)
+
+        return split_url.netloc + re.sub(r'/\d+(?=/|$)', '/{n}',
+                                         split_url.path)
+
+    def get_total(self):
+        """
+        Gets the time since the timings were created.
+        :return: the seconds.
+        """
+        return time.perf_counter() - self.started
+
+    def get_summary(self):
+        """
+        Gets the summary of the recorded steps, in the order they were first
+        recorded.
+        :return: the list of the steps, each one with the "category",
+            "name", "calls", "total", "self" and "max" (seconds) keys; and,
+            for the HTTP requests, "statuses" and "cache" (Counter objects) and
+            "size" (bytes).
+        """
+        with self._lock:
+            return [dict(step, statuses=Counter(step['statuses']),
+                         cache=Counter(step['cache']))
+                    for step in self._steps.values()]
+
+    def _get_stack(self):
+        """
+        Gets the stack of the steps being measured in the current thread.
+        """
+        stack = getattr(self._local, 'stack', None)
+
+        if stack is None:
+            stack = self._local.stack = []
+
+        return stack
+
+    def _add(self, category, name, elapsed, self_elapsed, status=None,
+             size=0, cache=None):
+        """
+        Adds the measurement of a step to its summary.
+        """
+        with self._lock:
+            step = self._steps.get((category, name))
+
+            if step is None:
+                step = self._steps[(category, name)] = {
+                    'category': category,
+                    'name': name,
+                    'calls': 0,
+                    'total': 0.0,
+                    'self': 0.0,
+                    'max': 0.0,
+                    'size': 0,
+                    'statuses': Counter(),
+                    'cache': Counter(),
+                }
+
+            step['calls'] += 1
+            step['total'] += elapsed
+            step['self'] += self_elapsed
+            step['max'] = max(step['max'], elapsed)
+            step['size'] += size or 0
+
+            if status is not None:
+                step['statuses'][status] += 1
+            if cache is not None:
+                step['cache'][cache] += 1
+
+    def wrap(self, target, category):
+        """
+        Wraps the object, measuring each call to its methods as a step of the
+        given category, named as the method.
+        :param target: the object to wrap.
+        :param category: the category of the steps.
+        :return: the wrapped object; the same object if the timings are not
+            enabled.
+        """
+        if not self.enabled:
+            return target
+
+        return _TimedProxy(self, target, category)
+
+
+class _TimedProxy:
+    """
+    Wrapper of an object measuring each call to its methods.
+    """
+
+    def __init__(self, timings, target, category):
+        self._timings = timings
+        self._target = target
+        self._category = category
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+
+        if not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            with self._timings.measure(self._category, name):
+                return attribute(*args, **kwargs)
+
+        return timed
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from gitssue.remote.async_remote import AsyncRemote
+from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
+
+
+class AsyncRemoteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_get_issue_list(self):
+        remote = mock.Mock()
+        remote.get_issue_list.return_value = (
+            issue for issue in [{'number': 1}, {'number': 2}]
+        )
+        async_remote = AsyncRemote(remote)
+
+        expected = [{'number': 1}, {'number': 2}]
+        actual = self.loop.run_until_complete(
+            async_remote.get_issue_list('user', 'repo', True)
+        )
+
+        self.assertEqual(expected, actual)
+        remote.get_issue_list.assert_called_once_with('user', 'repo', True,
+                                                      False)
+
+    def test_get_updated_issues(self):
+        remote = mock.Mock()
+        remote.get_updated_issues.return_value = iter([{'number': 1}])
+        async_remote = AsyncRemote(remote)
+
+        expected = [{'number': 1}]
+        actual = self.loop.run_until_complete(
+            async_remote.get_updated_issues('user', 'repo',
+                                            '2017-01-01T00:00:00Z')
+        )
+
+        self.assertEqual(expected, actual)
+        remote.get_updated_issues.assert_called_once_with(
+            'user', 'repo', '2017-01-01T00:00:00Z'
+        )
+
+    def test_get_issues_description(self):
+        remote = mock.Mock()
+        remote.get_issues_description.return_value = ([{'number': 1}], [2])
+        async_remote = AsyncRemote(remote)
+
+        expected = ([{'number': 1}], [2])
+        actual = self.loop.run_until_complete(
+            async_remote.get_issues_description('user', 'repo', [1, 2])
+        )
+
+        self.assertEqual(expected, actual)
+
+    def test_get_issues_comments(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_issue_comments(username, repository, issue_number):
+            barrier.wait()
+            return ['comment of {0}'.format(issue_number)]
+
+        remote = mock.Mock()
+        remote.get_issue_comments.side_effect = get_issue_comments
+        async_remote = AsyncRemote(remote)
+
+        expected = [['comment of 1'], ['comment of 2']]
+        actual = self.loop.run_until_complete(
+            async_remote.get_issues_comments('user', 'repo', [1, 2])
+        )
+
+        self.assertEqual(expected, actual)
+
+    def test_operations_awaited_together(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_issue_list(username, repository, show_all, get_description):
+            barrier.wait()
+            return iter([{'number': 1}])
+
+        def get_rate_information():
+            barrier.wait()
+            return 5000, 4999, 0
+
+        remote = mock.Mock()
+        remote.get_issue_list.side_effect = get_issue_list
+        remote.get_rate_information.side_effect = get_rate_information
+        async_remote = AsyncRemote(remote)
+
+        async def get_together():
+            return await asyncio.gather(
+                async_remote.get_issue_list('user', 'repo'),
+                async_remote.get_rate_information(),
+            )
+
+        expected = [[{'number': 1}], (5000, 4999, 0)]
+        actual = self.loop.run_until_complete(get_together())
+
+        self.assertEqual(expected, actual)
+
+    def test_create_issue(self):
+        remote = mock.Mock()
+        remote.create_issue.return_value = 3
+        async_remote = AsyncRemote(remote)
+
+        expected = 3
+        actual = self.loop.run_until_complete(
+            async_remote.create_issue('user', 'repo', 'title', 'body', ['bug'])
+        )
+
+        self.assertEqual(expected, actual)
+        remote.create_issue.assert_called_once_with(
+            'user', 'repo', 'title', 'body', ['bug'], 0
+        )
+
+    def test_close_issues_exception(self):
+        remote = mock.Mock()
+        remote.close_issues.side_effect = UnsuccessfulHttpRequestException(
+            403, {}
+        )
+        async_remote = AsyncRemote(remote)
+
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            self.loop.run_until_complete(
+                async_remote.close_issues('user', 'repo', [1])
+            )
+
+    def test_parse_request_exception(self):
+        remote = mock.Mock()
+        remote.parse_request_exception.return_value = 'error'
+        async_remote = AsyncRemote(remote)
+        exception = UnsuccessfulHttpRequestException(404, {})
+
+        self.assertEqual('error',
+                         async_remote.parse_request_exception(exception))
+        remote.parse_request_exception.assert_called_once_with(exception, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
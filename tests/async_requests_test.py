@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from gitssue.request.async_requests import AsyncRequests
+from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
+
+
+class AsyncRequestsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_request(self):
+        requester = mock.Mock()
+        requester.request.return_value = {'number': 1}
+        async_requests = AsyncRequests(requester)
+
+        expected = {'number': 1}
+        actual = self.loop.run_until_complete(
+            async_requests.request('GET', 'https://api.github.com/fake',
+                                   ('user', 'pass'))
+        )
+
+        self.assertEqual(expected, actual)
+        requester.request.assert_called_once_with(
+            'GET', 'https://api.github.com/fake', ('user', 'pass'), None, None,
+            None
+        )
+
+    def test_request_exception(self):
+        requester = mock.Mock()
+        requester.request.side_effect = UnsuccessfulHttpRequestException(
+            404, {}
+        )
+        async_requests = AsyncRequests(requester)
+
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            self.loop.run_until_complete(
+                async_requests.request('GET', 'https://api.github.com/fake')
+            )
+
+    def test_requests_awaited_together(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def request(method, request, credentials, extra_headers,
+                    json_payload, fields):
+            barrier.wait()
+            return request
+
+        requester = mock.Mock()
+        requester.request.side_effect = request
+        async_requests = AsyncRequests(requester)
+
+        async def request_together():
+            return await asyncio.gather(
+                async_requests.request('GET', 'first'),
+                async_requests.request('GET', 'second'),
+            )
+
+        expected = ['first', 'second']
+        actual = self.loop.run_until_complete(request_together())
+
+        self.assertEqual(expected, actual)
+
+    def test_request_pages(self):
+        requester = mock.Mock()
+        requester.request_pages.return_value = iter([[1, 2], [3]])
+        async_requests = AsyncRequests(requester)
+
+        async def read_pages():
+            return [page async for page in async_requests.request_pages(
+                'GET', 'https://api.github.com/fake'
+            )]
+
+        expected = [[1, 2], [3]]
+        actual = self.loop.run_until_complete(read_pages())
+
+        self.assertEqual(expected, actual)
+        requester.request_pages.assert_called_once_with(
+            'GET', 'https://api.github.com/fake', None, None, None
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
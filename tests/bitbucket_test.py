@@ -1,5 +1,8 @@
 import unittest
 from unittest import mock
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
 from gitssue.remote.bitbucket import Bitbucket
 from gitssue.request.unsuccessful_http_request_exception \
         import UnsuccessfulHttpRequestException
@@ -10,12 +13,21 @@ class BitbucketTest(unittest.TestCase):
     mocked_request_response = None
 
     def mock_request(self, method, request, credentials={}, extra_headers={},
-                     json_payload={}):
+                     json_payload={}, fields=None):
         return self.mocked_request_response
 
-    def mock_request_with_error(self, method, request, credentials={}):
+    def mock_request_with_error(self, method, request, credentials={},
+                                fields=None):
         return False
 
+    def mock_request_pages(self, method, request, credentials={},
+                           extra_headers={}, fields=None):
+        yield self.mocked_request_response
+
+    def mock_request_pages_with_error(self, method, request, credentials={},
+                                      fields=None):
+        yield False
+
     def test_get_issue_list(self):
         mocked_issue_list = {
             'values': [
@@ -50,42 +62,27 @@ class BitbucketTest(unittest.TestCase):
         }
         self.mocked_request_response = mocked_issue_list
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request
+        requester_mock.request_pages = self.mock_request_pages
         bitbucket = Bitbucket(requester_mock, {})
 
         expected = [
-            {
-                'number': 1,
-                'title': 'first issue',
-                'description': 'first issue body',
-                'labels': [{
-                    'name': 'task',
-                    'color': 'ffffff',
-                }],
-            },
-            {
-                'number': 2,
-                'title': 'second issue',
-                'description': 'second issue body',
-                'labels': [{
-                    'name': 'proposal',
-                    'color': 'ffffff',
-                }],
-
-            }
+            Issue(1, 'first issue', 'first issue body',
+                  [Label('task', 'ffffff')]),
+            Issue(2, 'second issue', 'second issue body',
+                  [Label('proposal', 'ffffff')]),
         ]
-        actual = bitbucket.get_issue_list('username', 'repo')
+        actual = list(bitbucket.get_issue_list('username', 'repo'))
 
         self.assertEqual(expected, actual)
 
     def test_get_issues_list_error_request(self):
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request_with_error
+        requester_mock.request_pages = self.mock_request_pages_with_error
 
         bitbucket = Bitbucket(requester_mock, credentials={})
 
         expected = []
-        actual = bitbucket.get_issue_list('username', 'repo')
+        actual = list(bitbucket.get_issue_list('username', 'repo'))
 
         self.assertEqual(expected, actual)
 
@@ -127,28 +124,10 @@ class BitbucketTest(unittest.TestCase):
         bitbucket = Bitbucket(requester_mock, {})
 
         expected = [
-            {
-                'number': 1,
-                'description': {
-                    'title': 'first issue',
-                    'body': 'first issue body',
-                },
-                'labels': [{
-                    'name': 'task',
-                    'color': 'ffffff',
-                }],
-            },
-            {
-                'number': 3,
-                'description': {
-                    'title': 'third issue',
-                    'body': 'third issue body',
-                },
-                'labels': [{
-                    'name': 'proposal',
-                    'color': 'ffffff',
-                }],
-            },
+            Issue(1, 'first issue', 'first issue body',
+                  [Label('task', 'ffffff')]),
+            Issue(3, 'third issue', 'third issue body',
+                  [Label('proposal', 'ffffff')]),
         ], [4, 15]
         actual = bitbucket.get_issues_description(
             'username', 'repo', [1, 3, 4, 15]
@@ -198,18 +177,10 @@ class BitbucketTest(unittest.TestCase):
         bitbucket = Bitbucket(requester_mock, {})
 
         expected = [
-            {
-                'author': 'julenpardo',
-                'created_at': '2018-06-06T13:01:58.224116+00:00',
-                'updated_at': 'null',
-                'body': 'issue first comment',
-            },
-            {
-                'author': 'julenpardo',
-                'created_at': '2018-06-06T14:01:58.224116+00:00',
-                'updated_at': 'null',
-                'body': 'issue second comment',
-            },
+            Comment('julenpardo', '2018-06-06T13:01:58.224116+00:00', 'null',
+                    'issue first comment'),
+            Comment('julenpardo', '2018-06-06T14:01:58.224116+00:00', 'null',
+                    'issue second comment'),
         ]
         actual = bitbucket.get_issue_comments('username', 'repo', 1)
 
@@ -266,14 +237,8 @@ class BitbucketTest(unittest.TestCase):
         bitbucket = Bitbucket(requester_mock, credentials={})
 
         expected = [
-            {
-                'number': 1,
-                'title': 'First closed issue'
-            },
-            {
-                'number': 2,
-                'title': 'Second closed issue'
-            },
+            Issue(1, 'First closed issue'),
+            Issue(2, 'Second closed issue'),
         ], [
             3
         ]
@@ -347,3 +312,85 @@ class BitbucketTest(unittest.TestCase):
         actual = bitbucket.parse_request_exception(input_exception)
 
         self.assertEqual(expected, actual)
+
+    def test_get_issue_list_pagination(self):
+        pages = [
+            {
+                'values': [{
+                    'id': 2,
+                    'kind': 'bug',
+                    'title': 'second issue',
+                    'content': {'raw': ''},
+                    'state': 'new',
+                }],
+                'next': 'next page',
+            },
+            {
+                'values': [{
+                    'id': 1,
+                    'kind': 'task',
+                    'title': 'first issue',
+                    'content': {'raw': ''},
+                    'state': 'open',
+                }],
+            },
+        ]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+
+        bitbucket = Bitbucket(requester_mock, credentials={})
+
+        actual = list(bitbucket.get_issue_list('username', 'repo'))
+
+        self.assertEqual([2, 1], [issue.number for issue in actual])
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://api.bitbucket.org/2.0/repositories/username/repo/issues'
+            '?pagelen=50&q=state%20%21%3D%20%22resolved%22',
+            {}, fields=Bitbucket._ISSUE_PAGE_FIELDS
+        )
+
+    def test_get_issue_list_show_all(self):
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter([{'values': []}])
+
+        bitbucket = Bitbucket(requester_mock, credentials={})
+
+        list(bitbucket.get_issue_list('username', 'repo', show_all=True))
+
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://api.bitbucket.org/2.0/repositories/username/repo/issues'
+            '?pagelen=50',
+            {}, fields=Bitbucket._ISSUE_PAGE_FIELDS
+        )
+
+    def test_get_updated_issues(self):
+        pages = [{'values': [{
+            'id': 5,
+            'kind': 'bug',
+            'title': 'fifth',
+            'content': {'raw': 'body'},
+            'state': 'resolved',
+            'updated_on': '2017-01-02T10:00:00.000000+00:00',
+        }]}]
+        expected = [Issue(5, 'fifth', 'body', [Label('bug', 'ffffff')],
+                          closed=True,
+                          updated_at='2017-01-02T10:00:00.000000+00:00')]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+
+        bitbucket = Bitbucket(requester_mock, credentials={})
+
+        actual = list(bitbucket.get_updated_issues(
+            'username', 'repo', '2017-01-01T00:00:00+00:00'
+        ))
+
+        self.assertEqual(expected, actual)
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://api.bitbucket.org/2.0/repositories/username/repo/issues'
+            '?pagelen=50&sort=updated_on'
+            '&q=updated_on%20%3E%3D%202017-01-01T00%3A00%3A00%2B00%3A00',
+            {}, fields=Bitbucket._ISSUE_PAGE_FIELDS
+        )
@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 import contextlib
 from io import StringIO
+from gitssue.model.label import Label
 from gitssue.printer.colorconsole_color_printer import ColorConsoleColorPrinter
 
 
@@ -30,16 +31,7 @@ class ColorConsoleColorPrinterTest(unittest.TestCase):
     def test_print_labels(self, get_terminal_mock):
         get_terminal_mock.return_value = mock.Mock()
 
-        input = [
-            {
-                'name': 'label_1',
-                'color': 'abcdef',
-            },
-            {
-                'name': 'label_2',
-                'color': 'f0f0f0',
-            }
-        ]
+        input = [Label('label_1', 'abcdef'), Label('label_2', 'f0f0f0')]
 
         expected = 'label_1 label_2'
 
@@ -52,3 +44,43 @@ class ColorConsoleColorPrinterTest(unittest.TestCase):
         actual = temp_stdout.getvalue().strip()
 
         self.assertEqual(expected, actual)
+
+    @mock.patch('colorconsole.terminal.get_terminal')
+    def test_format_labels_escapes_once_per_color(self, get_terminal_mock):
+        screen_mock = mock.Mock()
+        screen_mock.xterm24bit_set_fg_color.side_effect = \
+            lambda red, green, blue: print('<{0},{1},{2}>'.format(
+                red, green, blue), end='')
+        screen_mock.reset_colors.side_effect = \
+            lambda: print('<reset>', end='')
+        get_terminal_mock.return_value = screen_mock
+
+        labels = [Label('bug', 'ff0000'), Label('ui', '00ff00')]
+
+        expected = '<255,0,0>bug <0,255,0>ui \n<reset>'
+
+        color_printer = ColorConsoleColorPrinter()
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            actual = [color_printer.format_labels(labels) for _ in range(3)]
+
+        self.assertEqual([expected] * 3, actual)
+        self.assertEqual('', temp_stdout.getvalue())
+        self.assertEqual(2, screen_mock.xterm24bit_set_fg_color.call_count)
+        self.assertEqual(1, screen_mock.reset_colors.call_count)
+
+    @mock.patch('colorconsole.terminal.get_terminal')
+    def test_format_colored_line(self, get_terminal_mock):
+        screen_mock = mock.Mock()
+        screen_mock.xterm24bit_set_fg_color.side_effect = \
+            lambda red, green, blue: print('<color>', end='')
+        screen_mock.reset_colors.side_effect = \
+            lambda: print('<reset>', end='')
+        get_terminal_mock.return_value = screen_mock
+
+        color_printer = ColorConsoleColorPrinter()
+
+        actual = color_printer.format_colored_line('Error', 'ff0000')
+
+        self.assertEqual('<color>Error\n<reset>', actual)
@@ -62,3 +62,44 @@ class ConfigReaderTest(unittest.TestCase):
         actual = config_reader.get_config()
 
         self.assertEqual(expected, actual)
+
+    def test_get_config_extra_options(self):
+        config_file = '[github.com]\n' \
+                      + 'token = whatever\n' \
+                      + 'pool_size = 4\n' \
+                      + 'keep_alive = no'
+
+        create_file_overwriting(config_file)
+
+        expected = {
+            'github.com': {
+                'username': '',
+                'password': '',
+                'token': 'whatever',
+                'pool_size': '4',
+                'keep_alive': 'no',
+            }
+        }
+        actual = config_reader.get_config()
+
+        self.assertEqual(expected, actual)
+
+    def test_get_int_option(self):
+        remote_config = {'pool_size': '4', 'invalid': 'four'}
+
+        self.assertEqual(4, config_reader.get_int_option(
+            remote_config, 'pool_size', 10))
+        self.assertEqual(10, config_reader.get_int_option(
+            remote_config, 'invalid', 10))
+        self.assertEqual(10, config_reader.get_int_option(
+            remote_config, 'not_set', 10))
+
+    def test_get_boolean_option(self):
+        remote_config = {'keep_alive': 'off', 'invalid': 'maybe'}
+
+        self.assertFalse(config_reader.get_boolean_option(
+            remote_config, 'keep_alive', True))
+        self.assertTrue(config_reader.get_boolean_option(
+            remote_config, 'invalid', True))
+        self.assertTrue(config_reader.get_boolean_option(
+            remote_config, 'not_set', True))
@@ -2,6 +2,8 @@ import os
 import sys
 import unittest
 import contextlib
+import shutil
+import tempfile
 from io import StringIO
 from unittest import mock
 from requests.exceptions import RequestException
@@ -10,24 +12,30 @@ sys.path.append(os.path.abspath('.'))
 sys.path.append(os.path.abspath('./gitssue'))
 
 from gitssue.controller.controller import Controller
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
 from gitssue.git.git_wrapper import GitWrapper
 from gitssue.dependencies.dependencies import Dependencies
+from gitssue.remote.partially_closed_issues_exception import PartiallyClosedIssuesException
 from gitssue.printer.color_printer_interface import ColorPrinterInterface
 from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
 
 class DummyColorPrinter(ColorPrinterInterface):
-    def print_colored_line(self, line, hex_color='ffffff'):
-        print(line)
+    def format_colored_line(self, line, hex_color='ffffff'):
+        return line + '\n'
 
-    def print_labels(self, labels):
+    def format_labels(self, labels):
         if labels:
             labels_str = ''
 
             for label in labels:
-                labels_str += '{0} '.format(label['name'])
+                labels_str += '{0} '.format(label.name)
 
             labels_str = labels_str[:-1]
-            print(labels_str)
+            return labels_str + '\n'
+
+        return ''
 
 
 class ControllerTest(unittest.TestCase):
@@ -115,30 +123,11 @@ class ControllerTest(unittest.TestCase):
 
     def test_list(self):
         mocked_return = [
-            {
-                'number': '1',
-                'title': 'first issue',
-                'labels': [
-                    {
-                        'name': 'foo',
-                        'color': 'ffffff'
-                    }
-                ]
-            },
-            {
-                'number': '2',
-                'title': 'second and last issue',
-                'labels': [
-                    {
-                        'name': 'bar',
-                        'color': 'ffffff'
-                    },
-                    {
-                        'name': 'foo',
-                        'color': '000000'
-                    }
-                ]
-            },
+            Issue('1', 'first issue', labels=[Label('foo', 'ffffff')]),
+            Issue('2', 'second and last issue', labels=[
+                Label('bar', 'ffffff'),
+                Label('foo', '000000'),
+            ]),
         ]
         remote_mock = mock.Mock()
         self.mocked_remote_get_issue_list_return = mocked_return
@@ -148,11 +137,10 @@ class ControllerTest(unittest.TestCase):
         expected = ''
 
         for issue in mocked_return:
-            expected += '#{0}: {1}\n'.format(issue['number'], issue['title'])
-            labels = [] if not issue.get('labels') else issue['labels']
+            expected += '#{0}: {1}\n'.format(issue.number, issue.title)
 
-            for label in labels:
-                expected += '{0} '.format(label['name'])
+            for label in issue.labels:
+                expected += '{0} '.format(label.name)
             expected = expected[:-1]
             expected += '\n\n'
 
@@ -232,19 +220,10 @@ class ControllerTest(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     def test_desc(self):
-        mocked_return = [{
-            'number': '1',
-            'description': {
-                'title': 'first issue',
-                'body': 'body of first issue',
-            }},
-            {
-            'number': '2',
-            'description': {
-                'title': 'second issue',
-                'body': 'body of second issue',
-            }
-        }]
+        mocked_return = [
+            Issue('1', 'first issue', 'body of first issue'),
+            Issue('2', 'second issue', 'body of second issue'),
+        ]
 
         self.mocked_remote_get_issues_description_return = mocked_return, []
         remote_mock = mock.Mock()
@@ -253,8 +232,8 @@ class ControllerTest(unittest.TestCase):
 
         expected = ''
         for issue in mocked_return:
-            expected += '#{0}: {1}\n'.format(issue['number'], issue['description']['title'])
-            expected += '{0}\n'.format(issue['description']['body'])
+            expected += '#{0}: {1}\n'.format(issue.number, issue.title)
+            expected += '{0}\n'.format(issue.body)
             expected += '\n\n'
 
         expected = expected[:-3]
@@ -353,17 +332,10 @@ class ControllerTest(unittest.TestCase):
 
     def test_thread(self):
         mocked_return = [
-            {
-                'author': 'Julen Pardo',
-                'created_at': 'Right now',
-                'updated_at': 'never',
-                'body': 'this is the first comment'
-            }, {
-                'author': 'Pardo, Julen',
-                'created_at': 'A bit later',
-                'updated_at': 'never',
-                'body': 'this is the second and last comment'
-            },
+            Comment('Julen Pardo', 'Right now', 'never',
+                    'this is the first comment'),
+            Comment('Pardo, Julen', 'A bit later', 'never',
+                    'this is the second and last comment'),
         ]
 
         self.mocked_remote_get_issue_comments_return = mocked_return
@@ -454,14 +426,8 @@ class ControllerTest(unittest.TestCase):
 
     def test_close(self):
         remote_mocked_return = [
-            {
-                'number': 1,
-                'title': 'First clossed issue',
-            },
-            {
-                'number': 2,
-                'title': 'Second closed issue',
-            }
+            Issue(1, 'First clossed issue'),
+            Issue(2, 'Second closed issue'),
         ], []
 
         self.mocked_remote_close_issues_return = remote_mocked_return
@@ -484,14 +450,8 @@ class ControllerTest(unittest.TestCase):
 
     def test_close_with_not_found_issues(self):
         remote_mocked_return = [
-            {
-                'number': 1,
-                'title': 'First clossed issue',
-            },
-            {
-                'number': 2,
-                'title': 'Second closed issue',
-            }
+            Issue(1, 'First clossed issue'),
+            Issue(2, 'Second closed issue'),
         ], [
             3
         ]
@@ -552,6 +512,36 @@ class ControllerTest(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+    def test_close_partially_closed(self):
+        remote_mock = mock.Mock()
+
+        self.mocked_request_parse_request_exception_return = 'Mocked exception'
+        remote_mock.parse_request_exception = self.mock_remote_parse_request_exception
+        remote_mock.close_issues.side_effect = PartiallyClosedIssuesException(
+            UnsuccessfulHttpRequestException(500, {}),
+            [Issue(1, 'First closed issue')],
+            [3],
+            [2]
+        )
+
+        self.controller.deps.remote = remote_mock
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.close([1, 2, 3])
+
+        expected = 'The following issues have been closed:\n\n' \
+            + '#1: First closed issue\n\n' \
+            + 'Error\n' \
+            + 'Mocked exception\n' \
+            + 'The following issues couldn\'t be closed: 2\n' \
+            + 'The following issues couldn\'t be found: 3'
+
+        actual = temp_stdout.getvalue().strip()
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(1, status)
+
     def test_close_many_origins(self):
         mocked_shell_wrapper_return = 'origin1 git@github.com:julenpardo/first-remote\n' + \
                                       'origin2 git@github.com:julenpardo/second-remote'
@@ -753,3 +743,134 @@ class ControllerTest(unittest.TestCase):
         actual = temp_stdout.getvalue().strip()
 
         self.assertEqual(expected, actual)
+
+    def _create_mirror(self):
+        from gitssue.mirror.issue_mirror import IssueMirror
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        mirror = IssueMirror(os.path.join(directory, 'mirror.sqlite'))
+        self.addCleanup(mirror.close)
+        self.controller.deps.instantiate_mirror = mock.Mock(
+            return_value=mirror
+        )
+
+        return mirror
+
+    def test_sync(self):
+        mirror = self._create_mirror()
+        remote_mock = mock.Mock()
+        remote_mock.get_updated_issues.return_value = iter([
+            Issue(1, 'first issue', updated_at='2017-01-01T00:00:00Z',
+                  comments=0),
+            Issue(2, 'second issue', updated_at='2017-01-02T00:00:00Z',
+                  comments=1),
+        ])
+        remote_mock.get_issues_comments.return_value = [[
+            Comment('julenpardo', '2017-01-02T00:00:00Z',
+                    '2017-01-02T00:00:00Z', 'comment'),
+        ]]
+        self.controller.deps.remote = remote_mock
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.sync()
+
+        self.assertEqual(0, status)
+        self.assertIn('2 updated issue(s) synced at', temp_stdout.getvalue())
+        remote_mock.get_updated_issues.assert_called_once_with(
+            'julenpardo', 'Gitssue', None
+        )
+        remote_mock.get_issues_comments.assert_called_once_with(
+            'julenpardo', 'Gitssue', [2]
+        )
+        self.assertEqual('2017-01-02T00:00:00Z', mirror.get_sync_cursor())
+        self.assertEqual('comment', mirror.get_issue_comments(2)[0].body)
+
+        remote_mock.get_updated_issues.return_value = iter([])
+        remote_mock.get_issues_comments.return_value = []
+
+        with contextlib.redirect_stdout(StringIO()):
+            self.controller.sync()
+
+        remote_mock.get_updated_issues.assert_called_with(
+            'julenpardo', 'Gitssue', '2017-01-02T00:00:00Z'
+        )
+
+    def test_sync_connection_error(self):
+        self._create_mirror()
+        remote_mock = mock.Mock()
+        remote_mock.get_updated_issues.side_effect = RequestException
+        self.controller.deps.remote = remote_mock
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.sync()
+
+        self.assertEqual(1, status)
+        self.assertIn('A connection error occurred:', temp_stdout.getvalue())
+
+    def test_offline(self):
+        mirror = self._create_mirror()
+        mirror.update([
+            Issue(1, 'first issue', 'body', [Label('bug', 'ff0000')],
+                  updated_at='2017-01-01T00:00:00Z'),
+        ], {1: [
+            Comment('julenpardo', '2017-01-02T00:00:00Z',
+                    '2017-01-02T00:00:00Z', 'comment'),
+        ]}, 1000)
+        remote_mock = mock.Mock()
+        self.controller.deps.remote = remote_mock
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            list_status = self.controller.list(offline=True)
+            desc_status = self.controller.desc([1], offline=True)
+            comments_status = self.controller.comments(1, offline=True)
+
+        output = temp_stdout.getvalue()
+
+        self.assertEqual((0, 0, 0), (list_status, desc_status,
+                                     comments_status))
+        self.assertEqual(2, output.count('#1: first issue'))
+        self.assertIn('comment', output)
+        self.assertEqual(3, output.count('Read from the local mirror'))
+        self.assertEqual([], remote_mock.method_calls)
+
+    def test_offline_not_synced(self):
+        self._create_mirror()
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.list(offline=True)
+
+        self.assertEqual(1, status)
+        self.assertIn('gitssue sync', temp_stdout.getvalue())
+
+    def test_search(self):
+        mirror = self._create_mirror()
+        mirror.update([
+            Issue(1, 'first issue', 'a crash', [Label('bug', 'ff0000')],
+                  closed=True, updated_at='2017-01-01T00:00:00Z'),
+        ], {}, 1000)
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.search('crash', 'all', ['bug'])
+
+        lines = temp_stdout.getvalue().splitlines()
+
+        self.assertEqual(0, status)
+        self.assertEqual(['#1: first issue (closed)', 'bug', 'a **crash**'],
+                         lines[:3])
+        self.assertIn('Read from the local mirror', lines[-1])
+
+    def test_search_not_synced(self):
+        self._create_mirror()
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            status = self.controller.search('crash')
+
+        self.assertEqual(1, status)
+        self.assertIn('gitssue sync', temp_stdout.getvalue())
@@ -6,6 +6,8 @@ from gitssue.remote.github import Github
 from gitssue.remote.gitlab import Gitlab
 from gitssue.remote.bitbucket import Bitbucket
 from gitssue.config.config_reader import get_config
+from gitssue.printer.printer import Printer
+from gitssue.printer.record_printer import RecordPrinter
 
 
 class DependenciesTest(unittest.TestCase):
@@ -40,3 +42,33 @@ class DependenciesTest(unittest.TestCase):
             dependencies.instantiate_remote_instance()
 
         self.assertIsInstance(dependencies.remote, Bitbucket)
+
+    @mock.patch.object(GitWrapper, 'get_remote_domain')
+    def test_instantiate_mirror(self, get_remote_domain_mock):
+        get_remote_domain_mock.return_value = 'gitlab.com'
+
+        with mock.patch('gitssue.config.config_reader.get_config'), \
+                mock.patch.dict('os.environ', {'XDG_CACHE_HOME': '/cache'}):
+            dependencies = Dependencies()
+            dependencies.instantiate_remote_instance()
+            mirror = dependencies.instantiate_mirror('username', 'repo')
+
+        self.assertEqual('/cache/gitssue/mirror/gitlab.com/username/repo.sqlite',
+                         mirror.path)
+
+    def test_text_format(self):
+        dependencies = Dependencies()
+
+        self.assertIsInstance(dependencies.printer, Printer)
+        self.assertNotIsInstance(dependencies.printer, RecordPrinter)
+        self.assertIsNotNone(dependencies.color_printer)
+
+    @mock.patch('colorconsole.terminal.get_terminal')
+    def test_record_format(self, get_terminal_mock):
+        dependencies = Dependencies(output_format='jsonl')
+
+        self.assertIsInstance(dependencies.printer, RecordPrinter)
+        self.assertEqual('jsonl', dependencies.printer.output_format)
+        self.assertIsNone(dependencies.color_printer)
+        get_terminal_mock.assert_not_called()
+
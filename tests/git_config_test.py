@@ -0,0 +1,208 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from gitssue.git.git_config import GitConfig
+
+
+class GitConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.work_tree = os.path.join(self.directory, 'repo')
+        self.git_dir = os.path.join(self.work_tree, '.git')
+        os.makedirs(self.git_dir)
+        self.write(os.path.join(self.git_dir, 'HEAD'),
+                   'ref: refs/heads/master\n')
+
+        environment_patcher = mock.patch.dict(os.environ)
+        environment_patcher.start()
+        os.environ.pop('GIT_DIR', None)
+        os.environ.pop('GIT_CONFIG_GLOBAL', None)
+        os.environ.pop('XDG_CONFIG_HOME', None)
+        os.environ['GIT_CONFIG_NOSYSTEM'] = '1'
+        os.environ['HOME'] = self.directory
+        self.addCleanup(environment_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def write(path, content):
+        with open(path, 'w') as file:
+            file.write(content)
+
+    def write_config(self, content):
+        self.write(os.path.join(self.git_dir, 'config'), content)
+
+    def test_find_git_dir_from_subdirectory(self):
+        subdirectory = os.path.join(self.work_tree, 'a', 'b')
+        os.makedirs(subdirectory)
+
+        actual = GitConfig(subdirectory).find_git_dir()
+
+        self.assertEqual(self.git_dir, actual)
+
+    def test_find_git_dir_not_repo(self):
+        self.assertIsNone(GitConfig(self.directory).find_git_dir())
+        self.assertEqual({}, GitConfig(self.directory).read())
+
+    def test_find_git_dir_environment(self):
+        os.environ['GIT_DIR'] = self.git_dir
+
+        actual = GitConfig(self.directory).find_git_dir()
+
+        self.assertEqual(self.git_dir, actual)
+
+    def test_get(self):
+        self.write_config(
+            '[core]\n'
+            '\tbare = false\n'
+            '[remote "origin"]\n'
+            '\turl = git@github.com:julenpardo/Gitssue.git\n'
+            '\tfetch = +refs/heads/*:refs/remotes/origin/*\n'
+        )
+
+        git_config = GitConfig(self.work_tree)
+
+        self.assertEqual('git@github.com:julenpardo/Gitssue.git',
+                         git_config.get('remote.origin.url'))
+        self.assertEqual('false', git_config.get('CORE.Bare'))
+        self.assertIsNone(git_config.get('remote.upstream.url'))
+
+    def test_get_values_syntax(self):
+        self.write_config(
+            '# Comment\n'
+            '[Remote "Origin"] url = "https://a b" ; comment\n'
+            '\tpushurl = https://github.com/\\\n'
+            '\t\tjulenpardo/Gitssue # comment\n'
+            '[core]\n'
+            '\tfilemode\n'
+        )
+
+        git_config = GitConfig(self.work_tree)
+
+        self.assertEqual('https://a b', git_config.get('remote.Origin.url'))
+        self.assertIsNone(git_config.get('remote.origin.url'))
+        self.assertEqual('https://github.com/julenpardo/Gitssue',
+                         git_config.get('remote.Origin.pushurl'))
+        self.assertEqual('true', git_config.get('core.filemode'))
+
+    def test_get_remotes(self):
+        self.write_config(
+            '[remote "origin"]\n'
+            '\turl = git@github.com:julenpardo/Gitssue.git\n'
+            '[remote "upstream"]\n'
+            '\turl = https://gitlab.com/julenpardo/Gitssue.git\n'
+            '\tpushurl = https://gitlab.com/julenpardo/Gitssue.git\n'
+        )
+        expected = [
+            ['origin', 'git@github.com:julenpardo/Gitssue.git'],
+            ['upstream', 'https://gitlab.com/julenpardo/Gitssue.git'],
+        ]
+
+        actual = GitConfig(self.work_tree).get_remotes()
+
+        self.assertEqual(expected, actual)
+
+    def test_get_remotes_url_rewrites(self):
+        self.write(os.path.join(self.directory, '.gitconfig'),
+                   '[url "git@github.com:"]\n'
+                   '\tinsteadOf = gh:\n'
+                   '[url "https://gitlab.com/"]\n'
+                   '\tpushInsteadOf = gl:\n')
+        self.write_config(
+            '[url "git@gitlab.com:"]\n'
+            '\tinsteadOf = gl:\n'
+            '[url "git@gitlab.com:group/"]\n'
+            '\tinsteadOf = gl:julenpardo/\n'
+            '[remote "origin"]\n'
+            '\turl = gh:julenpardo/Gitssue.git\n'
+            '[remote "upstream"]\n'
+            '\turl = gl:other/Gitssue.git\n'
+            '[remote "fork"]\n'
+            '\turl = gl:julenpardo/Gitssue.git\n'
+            '\tpushurl = gh:julenpardo/Gitssue.git\n'
+        )
+        expected = [
+            ['fork', 'git@github.com:julenpardo/Gitssue.git'],
+            ['fork', 'git@gitlab.com:group/Gitssue.git'],
+            ['origin', 'git@github.com:julenpardo/Gitssue.git'],
+            ['upstream', 'git@gitlab.com:other/Gitssue.git'],
+            ['upstream', 'https://gitlab.com/other/Gitssue.git'],
+        ]
+
+        git_config = GitConfig(self.work_tree)
+        actual = git_config.get_remotes()
+
+        self.assertEqual(expected, sorted(actual))
+        self.assertEqual('git@github.com:julenpardo/Gitssue.git',
+                         git_config.get('remote.origin.url'))
+        self.assertEqual('gh:julenpardo/Gitssue.git',
+                         git_config.read()['remote.origin.url'][0])
+
+    def test_include(self):
+        self.write(os.path.join(self.directory, 'included'),
+                   '[remote "origin"]\n\turl = https://github.com/a/b\n')
+        self.write_config('[include]\n\tpath = ../../included\n')
+
+        actual = GitConfig(self.work_tree).get('remote.origin.url')
+
+        self.assertEqual('https://github.com/a/b', actual)
+
+    def test_include_if(self):
+        self.write(os.path.join(self.directory, 'matching'),
+                   '[remote "origin"]\n\turl = https://github.com/a/b\n')
+        self.write(os.path.join(self.directory, 'not_matching'),
+                   '[remote "origin"]\n\turl = https://github.com/c/d\n')
+        self.write_config(
+            '[includeIf "gitdir:repo/"]\n'
+            '\tpath = ../../matching\n'
+            '[includeIf "gitdir:other/"]\n'
+            '\tpath = ../../not_matching\n'
+            '[includeIf "onbranch:develop"]\n'
+            '\tpath = ../../not_matching\n'
+        )
+
+        actual = GitConfig(self.work_tree).get_all('remote.origin.url')
+
+        self.assertEqual(['https://github.com/a/b'], actual)
+
+    def test_worktree(self):
+        self.write_config('[remote "origin"]\n\turl = https://github.com/a/b\n')
+        worktree_git_dir = os.path.join(self.git_dir, 'worktrees', 'feature')
+        worktree = os.path.join(self.directory, 'feature')
+        os.makedirs(worktree_git_dir)
+        os.makedirs(worktree)
+        self.write(os.path.join(worktree_git_dir, 'commondir'), '../..\n')
+        self.write(os.path.join(worktree, '.git'),
+                   'gitdir: ' + worktree_git_dir + '\n')
+
+        git_config = GitConfig(worktree)
+
+        self.assertEqual(worktree_git_dir, git_config.find_git_dir())
+        self.assertEqual('https://github.com/a/b',
+                         git_config.get('remote.origin.url'))
+
+    def test_read_cached_until_modified(self):
+        self.write_config('[remote "origin"]\n\turl = https://github.com/a/b\n')
+        git_config = GitConfig(self.work_tree)
+
+        with mock.patch('gitssue.git.git_config.GitConfig._parse_file',
+                        wraps=git_config._parse_file) as parse_file_mock:
+            git_config.read()
+            git_config.read()
+
+            self.assertEqual(1, parse_file_mock.call_count)
+
+            config_path = os.path.join(self.git_dir, 'config')
+            self.write_config(
+                '[remote "origin"]\n\turl = https://github.com/c/d\n'
+            )
+            modified_time = os.stat(config_path).st_mtime + 10
+            os.utime(config_path, (modified_time, modified_time))
+
+            self.assertEqual(['https://github.com/c/d'],
+                             git_config.read()['remote.origin.url'])
+            self.assertEqual(2, parse_file_mock.call_count)
@@ -130,3 +130,37 @@ class GitWrapperTest(unittest.TestCase):
 
         with self.assertRaises(RepoNotFoundException):
             git_wrapper.get_remotes_urls()
+
+    def test_get_remote_domain_git_config(self):
+        shell_wrapper_mock = mock.Mock()
+        git_config_mock = mock.Mock()
+        git_config_mock.get.return_value = 'git@gitlab.com:julenpardo/Gitssue'
+
+        git_wrapper = GitWrapper(shell_wrapper_mock, git_config_mock)
+
+        self.assertEqual('gitlab.com', git_wrapper.get_remote_domain())
+        git_config_mock.get.assert_called_once_with('remote.origin.url')
+        shell_wrapper_mock.execute_command.assert_not_called()
+
+    def test_get_remote_domain_git_config_fallback(self):
+        shell_wrapper_mock = mock.Mock()
+        shell_wrapper_mock.execute_command = self.fake_execute_command
+        git_config_mock = mock.Mock()
+        git_config_mock.get.return_value = None
+
+        git_wrapper = GitWrapper(shell_wrapper_mock, git_config_mock)
+
+        self.assertEqual('github.com', git_wrapper.get_remote_domain())
+
+    def test_get_remotes_urls_git_config(self):
+        shell_wrapper_mock = mock.Mock()
+        git_config_mock = mock.Mock()
+        git_config_mock.get_remotes.return_value = [
+            ['origin', 'https://github.com/julenpardo/Gitssue.git']
+        ]
+        expected = [['julenpardo', 'Gitssue']]
+
+        git_wrapper = GitWrapper(shell_wrapper_mock, git_config_mock)
+
+        self.assertEqual(expected, git_wrapper.get_username_and_repo())
+        shell_wrapper_mock.execute_command.assert_not_called()
@@ -1,7 +1,10 @@
 import unittest
 import time
 from unittest import mock
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
 from gitssue.remote.github import Github
+from gitssue.remote.partially_closed_issues_exception import PartiallyClosedIssuesException
 from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
 
 
@@ -10,12 +13,21 @@ class GithubTest(unittest.TestCase):
     mocked_request_response = None
 
     def mock_request(self, method, request, credentials={}, extra_headers={},
-                     json_payload={}):
+                     json_payload={}, fields=None):
         return self.mocked_request_response
 
-    def mock_request_with_error(self, method, request, credentials={}):
+    def mock_request_with_error(self, method, request, credentials={},
+                                fields=None):
         return False
 
+    def mock_request_pages(self, method, request, credentials={},
+                           extra_headers={}, fields=None):
+        yield self.mocked_request_response
+
+    def mock_request_pages_with_error(self, method, request, credentials={},
+                                      fields=None):
+        yield False
+
     def test_get_issue_list(self):
         mocked_return = [
             {
@@ -34,27 +46,31 @@ class GithubTest(unittest.TestCase):
         ]
         self.mocked_request_response = mocked_return
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request
+        requester_mock.request_pages = self.mock_request_pages
         github = Github(requester_mock, credentials={})
 
         expected = self.mocked_request_response
-        actual = github.get_issue_list('a', 'b', True)
+        actual = list(github.get_issue_list('a', 'b', True))
 
         for index, element in enumerate(expected):
             expected_element = expected[index]
             actual_element = actual[index]
 
-            self.assertEqual(expected_element['number'], actual_element['number'])
-            self.assertEqual(expected_element['title'], actual_element['title'])
-            self.assertEqual(expected_element['labels'], actual_element['labels'])
+            self.assertEqual(expected_element['number'], actual_element.number)
+            self.assertEqual(expected_element['title'], actual_element.title)
+            self.assertEqual(
+                tuple(Label(label['name'], label['color'])
+                      for label in expected_element['labels']),
+                actual_element.labels
+            )
 
     def test_get_issue_list_error_request(self):
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request_with_error
+        requester_mock.request_pages = self.mock_request_pages_with_error
 
         github = Github(requester_mock, credentials={})
 
-        expected_false = github.get_issue_list('a', 'b')
+        expected_false = list(github.get_issue_list('a', 'b'))
 
         self.assertFalse(expected_false)
 
@@ -74,15 +90,15 @@ class GithubTest(unittest.TestCase):
 
         self.assertEqual(
             expected['number'],
-            actual[0]['number'],
+            actual[0].number,
         )
         self.assertEqual(
             expected['title'],
-            actual[0]['description']['title']
+            actual[0].title
         )
         self.assertEqual(
             expected['body'],
-            actual[0]['description']['body']
+            actual[0].body
         )
 
     def test_get_issues_description_error_request(self):
@@ -142,19 +158,19 @@ class GithubTest(unittest.TestCase):
 
         self.assertEqual(
             expected['user']['login'],
-            actual['author']
+            actual.author
         )
         self.assertEqual(
             expected['created_at'],
-            actual['created_at']
+            actual.created_at
         )
         self.assertEqual(
             expected['updated_at'],
-            actual['updated_at']
+            actual.updated_at
         )
         self.assertEqual(
             expected['body'],
-            actual['body']
+            actual.body
         )
 
     def test_get_issue_comments_no_comments(self):
@@ -222,6 +238,7 @@ class GithubTest(unittest.TestCase):
         self.mocked_request_response = mocked_return
         requester_mock = mock.Mock()
         requester_mock.request = self.mock_request
+        requester_mock.get_rate_limit.return_value = None
 
         github = Github(requester_mock, credentials={})
 
@@ -233,6 +250,22 @@ class GithubTest(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_get_rate_information_observed(self):
+        reset = int(time.time()) + 600
+        requester_mock = mock.Mock()
+        requester_mock.get_rate_limit.return_value = (5000, 4990, reset)
+
+        github = Github(requester_mock, credentials={'username': 'user'})
+
+        expected = 5000, 4990, reset
+        actual = github.get_rate_information()
+
+        self.assertEqual(expected, actual)
+        requester_mock.get_rate_limit.assert_called_once_with(
+            'https://api.github.com', {'username': 'user'}
+        )
+        requester_mock.request.assert_not_called()
+
     def test_close_comments(self):
         def side_effect(*args, **kwargs):
             existing_closed_issues = {
@@ -260,14 +293,8 @@ class GithubTest(unittest.TestCase):
         github = Github(requester_mock, credentials={})
 
         expected = [
-            {
-                'number': 1,
-                'title': 'First closed issue'
-            },
-            {
-                'number': 2,
-                'title': 'Second closed issue'
-            },
+            Issue(1, 'First closed issue'),
+            Issue(2, 'Second closed issue'),
         ], [
             3
         ]
@@ -331,3 +358,385 @@ class GithubTest(unittest.TestCase):
                                      ['label 1', 'label 2'], milestone=5)
 
         self.assertEqual(expected, actual)
+
+    def test_get_issue_list_with_description(self):
+        mocked_return = [
+            {
+                'number': 1,
+                'title': 'first fake issue',
+                'labels': [],
+                'body': 'fake body 1',
+            },
+            {
+                'number': 2,
+                'title': 'second fake issue',
+                'labels': [],
+                'body': None,
+            },
+        ]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter([mocked_return])
+        github = Github(requester_mock, credentials={})
+
+        actual = list(github.get_issue_list('a', 'b', get_description=True))
+
+        self.assertEqual('fake body 1', actual[0].body)
+        self.assertEqual('', actual[1].body)
+
+    def test_request_count_per_command(self):
+        issues = [
+            {
+                'number': number,
+                'title': 'issue {0}'.format(number),
+                'labels': [],
+                'body': 'body {0}'.format(number),
+            } for number in range(1, 11)
+        ]
+
+        def side_effect(*args, **kwargs):
+            if args[1].endswith('/issues') or '/issues?' in args[1]:
+                return issues if args[0] == 'GET' else issues[0]
+            elif args[1].endswith('/comments'):
+                return []
+            else:
+                return issues[0]
+
+        commands = [
+            (lambda github: list(github.get_issue_list('a', 'b')), 1),
+            (lambda github: list(github.get_issue_list('a', 'b', True, True)),
+             1),
+            (lambda github: github.get_issues_description('a', 'b', [1, 2, 3]),
+             3),
+            (lambda github: github.get_issue_comments('a', 'b', 1), 1),
+            (lambda github: github.close_issues('a', 'b', [1, 2]), 2),
+            (lambda github: github.create_comment('a', 'b', 1, 'comment'), 1),
+            (lambda github: github.create_issue('a', 'b', 'title'), 1),
+        ]
+
+        for command, expected in commands:
+            requester_mock = mock.Mock()
+            requester_mock.request.side_effect = side_effect
+            requester_mock.request_pages.side_effect = \
+                lambda *args, **kwargs: iter([side_effect(*args, **kwargs)])
+            github = Github(requester_mock, credentials={})
+
+            command(github)
+
+            actual = requester_mock.request.call_count \
+                + requester_mock.request_pages.call_count
+            self.assertEqual(expected, actual)
+
+    def test_get_issue_list_pagination(self):
+        pages = [
+            [{'number': 1, 'title': 'first', 'labels': [], 'body': ''}],
+            [{'number': 2, 'title': 'second', 'labels': [], 'body': ''}],
+        ]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+        github = Github(requester_mock, credentials={})
+
+        issues = github.get_issue_list('a', 'b', True)
+
+        self.assertEqual(1, next(issues).number)
+        self.assertEqual(2, next(issues).number)
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://api.github.com/repos/a/b/issues?per_page=100&state=all',
+            {}, fields=Github._ISSUE_FIELDS
+        )
+
+    def test_get_issues_description_concurrent_keeps_order(self):
+        def side_effect(*args, **kwargs):
+            issue_number = int(args[1].split('/')[-1])
+            # The first issues are answered the last.
+            time.sleep(0.01 * (5 - issue_number))
+
+            if issue_number == 3:
+                raise UnsuccessfulHttpRequestException(404, {})
+
+            return {
+                'title': 'issue {0}'.format(issue_number),
+                'body': 'body {0}'.format(issue_number),
+            }
+
+        requester_mock = mock.Mock()
+        requester_mock.request.side_effect = side_effect
+        github = Github(requester_mock, credentials={}, max_workers=4)
+
+        actual, not_found_issues = github.get_issues_description(
+            'a', 'b', [1, 2, 3, 4]
+        )
+
+        self.assertEqual([1, 2, 4], [issue.number for issue in actual])
+        self.assertEqual([3], not_found_issues)
+
+    def test_map_concurrently_bounded(self):
+        running = []
+        max_running = []
+
+        def function(item):
+            running.append(item)
+            max_running.append(len(running))
+            time.sleep(0.01)
+            running.remove(item)
+
+            return item * 2
+
+        github = Github(mock.Mock(), credentials={}, max_workers=2)
+
+        actual = github._map_concurrently(function, range(6))
+
+        self.assertEqual([0, 2, 4, 6, 8, 10], actual)
+        self.assertLessEqual(max(max_running), 2)
+
+    def test_close_issues_partial_failure(self):
+        def side_effect(*args, **kwargs):
+            issue_number = int(args[1].split('/')[-1])
+
+            if issue_number == 2:
+                raise UnsuccessfulHttpRequestException(500, {})
+            elif issue_number == 3:
+                raise UnsuccessfulHttpRequestException(404, {})
+
+            return {'title': 'issue {0}'.format(issue_number)}
+
+        requester_mock = mock.Mock()
+        requester_mock.request.side_effect = side_effect
+
+        github = Github(requester_mock, credentials={}, max_workers=4)
+
+        with self.assertRaises(PartiallyClosedIssuesException) as context:
+            github.close_issues('username', 'repo', [1, 2, 3, 4])
+
+        exception = context.exception
+        self.assertEqual(
+            [Issue(1, 'issue 1'), Issue(4, 'issue 4')],
+            exception.closed_issues
+        )
+        self.assertEqual([3], exception.not_found_issues)
+        self.assertEqual([2], exception.failed_issues)
+        self.assertEqual(500, exception.cause.code)
+
+    def test_get_issues_description_graphql(self):
+        mocked_return = {
+            'data': {
+                'repository': {
+                    'issue1': {
+                        'number': 1,
+                        'title': 'first issue',
+                        'body': 'first body',
+                        'labels': {'nodes': [{'name': 'bug', 'color': 'ff0000'}]},
+                    },
+                    'issue2': None,
+                    'issue3': {
+                        'number': 3,
+                        'title': 'third issue',
+                        'body': 'third body',
+                        'labels': {'nodes': []},
+                    },
+                }
+            }
+        }
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_return
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        expected = [
+            Issue(3, 'third issue', 'third body'),
+            Issue(1, 'first issue', 'first body', [Label('bug', 'ff0000')]),
+        ], [2]
+        actual = github.get_issues_description('a', 'b', [3, 2, 1])
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(1, requester_mock.request.call_count)
+
+        args, kwargs = requester_mock.request.call_args
+        self.assertEqual(('POST', Github.GRAPHQL_URL), args)
+        self.assertEqual({'Authorization': 'bearer TOKEN'},
+                         kwargs['extra_headers'])
+        self.assertIn('issue2: issue(number: 2)',
+                      kwargs['json_payload']['query'])
+
+    def test_get_issues_description_graphql_not_found_issues(self):
+        mocked_return = {
+            'data': {'repository': {'issue1': None, 'issue2': None}},
+            'errors': [
+                {'type': 'NOT_FOUND', 'path': ['repository', 'issue1']},
+                {'type': 'NOT_FOUND', 'path': ['repository', 'issue2']},
+            ],
+        }
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_return
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        actual = github.get_issues_description('a', 'b', [1, 2])
+
+        self.assertEqual(([], [1, 2]), actual)
+
+    def test_get_issues_description_graphql_not_found_repository(self):
+        mocked_return = {
+            'data': {'repository': None},
+            'errors': [{'type': 'NOT_FOUND', 'path': ['repository']}],
+        }
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_return
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        with self.assertRaises(UnsuccessfulHttpRequestException) as context:
+            github.get_issues_description('a', 'b', [1, 2])
+
+        self.assertEqual(404, context.exception.code)
+        self.assertEqual(Github.HTTP_ERROR_MESSAGES[404],
+                         github.parse_request_exception(context.exception))
+
+    def test_get_issue_list_graphql_rate_limited(self):
+        mocked_return = {
+            'data': None,
+            'errors': [{'type': 'RATE_LIMITED',
+                        'message': 'API rate limit exceeded'}],
+        }
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_return
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        with self.assertRaises(UnsuccessfulHttpRequestException) as context:
+            list(github.get_issue_list('a', 'b'))
+
+        self.assertEqual(403, context.exception.code)
+        self.assertEqual('GitHub API limit was reached. Read more about this '
+                         'at https://developer.github.com/v3/#rate-limiting',
+                         github.parse_request_exception(context.exception))
+
+    def test_get_issue_list_graphql_other_error(self):
+        mocked_return = {
+            'errors': [{'message': 'Parse error on "}" (RCURLY)'}],
+        }
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_return
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        with self.assertRaises(UnsuccessfulHttpRequestException) as context:
+            list(github.get_issue_list('a', 'b'))
+
+        self.assertEqual(400, context.exception.code)
+        self.assertEqual('An error occurred in the request.',
+                         github.parse_request_exception(context.exception))
+
+    def test_get_issue_list_graphql(self):
+        pages = [
+            {
+                'data': {
+                    'repository': {
+                        'issues': {
+                            'pageInfo': {
+                                'hasNextPage': True, 'endCursor': 'cursor'
+                            },
+                            'nodes': [{
+                                'number': 2,
+                                'title': 'second issue',
+                                'labels': {'nodes': []},
+                            }],
+                        }
+                    }
+                }
+            },
+            {
+                'data': {
+                    'repository': {
+                        'issues': {
+                            'pageInfo': {
+                                'hasNextPage': False, 'endCursor': None
+                            },
+                            'nodes': [{
+                                'number': 1,
+                                'title': 'first issue',
+                                'labels': {'nodes': []},
+                            }],
+                        }
+                    }
+                }
+            },
+        ]
+        requester_mock = mock.Mock()
+        requester_mock.request.side_effect = pages
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        actual = list(github.get_issue_list('a', 'b'))
+
+        self.assertEqual([2, 1], [issue.number for issue in actual])
+        requester_mock.request_pages.assert_not_called()
+        last_variables = \
+            requester_mock.request.call_args[1]['json_payload']['variables']
+        self.assertEqual('cursor', last_variables['cursor'])
+        self.assertEqual(['OPEN'], last_variables['states'])
+
+    def test_get_issue_list_with_description_token_uses_rest(self):
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter([[]])
+        github = Github(requester_mock, credentials={'token': 'TOKEN'})
+
+        list(github.get_issue_list('a', 'b', get_description=True))
+
+        requester_mock.request.assert_not_called()
+        requester_mock.request_pages.assert_called_once()
+
+    def test_get_updated_issues(self):
+        pages = [[{
+            'number': 3,
+            'title': 'third',
+            'body': None,
+            'state': 'closed',
+            'updated_at': '2017-01-02T10:00:00Z',
+            'labels': [{'id': 1, 'name': 'bug', 'color': 'ff0000'}],
+            'comments': 2,
+        }]]
+        expected = [Issue(3, 'third', '', [Label('bug', 'ff0000')],
+                          closed=True, updated_at='2017-01-02T10:00:00Z',
+                          comments=2)]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+        github = Github(requester_mock, credentials={})
+
+        actual = list(github.get_updated_issues('a', 'b',
+                                                '2017-01-01T00:00:00Z'))
+
+        self.assertEqual(expected, actual)
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://api.github.com/repos/a/b/issues?per_page=100&state=all'
+            '&sort=updated&direction=asc&since=2017-01-01T00%3A00%3A00Z',
+            {}, fields=Github._ISSUE_FIELDS
+        )
+
+    def test_get_issues_comments(self):
+        requester_mock = mock.Mock()
+        requester_mock.request.side_effect = lambda method, request, fields: [{
+            'user': {'login': 'julenpardo'},
+            'created_at': '2017-01-01T00:00:00Z',
+            'updated_at': '2017-01-01T00:00:00Z',
+            'body': request.split('/')[-2],
+        }]
+        github = Github(requester_mock, credentials={}, max_workers=2)
+
+        actual = github.get_issues_comments('a', 'b', [2, 1])
+
+        self.assertEqual(['2', '1'], [comments[0].body
+                                      for comments in actual])
+
+    def test_labels_shared_by_issues(self):
+        pages = [[
+            {
+                'number': number,
+                'title': 'issue {0}'.format(number),
+                'labels': [{'id': 1, 'name': 'bug', 'color': 'ff0000',
+                            'url': 'https://api.github.com/labels/bug'}],
+            } for number in (1, 2)
+        ]]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+        github = Github(requester_mock, credentials={})
+
+        first, second = github.get_issue_list('a', 'b')
+
+        self.assertEqual((Label('bug', 'ff0000'),), first.labels)
+        self.assertIs(first.labels[0], second.labels[0])
@@ -1,5 +1,8 @@
 import unittest
 from unittest import mock
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
 from gitssue.remote.gitlab import Gitlab
 from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
 
@@ -16,12 +19,17 @@ class GitlabTest(unittest.TestCase):
 
     mocked_request_response = None
 
-    def mock_request(self, method, request, credentials={}, extra_headers={}):
+    def mock_request(self, method, request, credentials={}, extra_headers={},
+                     fields=None):
         return self.mocked_request_response
 
     def mock_request_with_error(self, request, credentials={}):
         return False
 
+    def mock_request_pages(self, method, request, credentials={},
+                           extra_headers={}, fields=None):
+        yield self.mocked_request_response
+
     def test_get_issue_list(self):
         project_id = {'id': 1}
         mocked_issue_list = [
@@ -47,60 +55,47 @@ class GitlabTest(unittest.TestCase):
                     'color': '#ffffff'
                 }
             ]
-            if args[1].startswith('https://gitlab.com/api/v4/projects/1/issues'):
+            if args[1].startswith('https://gitlab.com/api/v4/projects/username%2Frepo/issues'):
                 return mocked_issue_list
             elif args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo':
                 return project_id
-            elif args[1] == 'https://gitlab.com/api/v4/projects/1/labels':
-                return labels
+            elif args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo/labels?per_page=100':
+                return iter([labels])
 
         requester_mock = mock.Mock()
         requester_mock.request.side_effect = side_effect
+        requester_mock.request_pages.side_effect = side_effect
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
-        expected = [{
-            'number': '1',
-            'title': 'first issue',
-            'labels': [{
-                'name': 'bug',
-                'color': 'f0f0f0',
-            }, {
-                'name': 'feature',
-                'color': 'ffffff'
-            }],
-            'description': ''
-        }]
+        expected = [Issue('1', 'first issue', '', [
+            Label('bug', 'f0f0f0'),
+            Label('feature', 'ffffff'),
+        ])]
 
         actual = gitlab.get_issue_list('username', 'repo')
 
         self.assertEqual(expected, actual)
 
     def test_get_project_id(self):
-        mocked_return = {
-            'id': 12345,
-            'description': 'project description',
-            'more_info': 'blablabla',
-        }
-
-        self.mocked_request_response = mocked_return
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
-        expected = mocked_return['id']
+        expected = 'julenpardo%2Fgitssue'
         actual = gitlab._get_project_id('julenpardo', 'gitssue')
 
         self.assertEqual(expected, actual)
+        requester_mock.request.assert_not_called()
 
-    def test_get_project_id_project_not_found(self):
+    def test_get_project_id_encodes_path(self):
         requester_mock = mock.Mock()
-        requester_mock.request.side_effect = UnsuccessfulHttpRequestException(404, {})
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
-        with self.assertRaises(UnsuccessfulHttpRequestException):
-            gitlab._get_project_id('whatever', 'whatever')
+        expected = 'user.name%2Fsome%20repo'
+        actual = gitlab._get_project_id('user.name', 'some repo')
+
+        self.assertEqual(expected, actual)
 
     def test_get_labels(self):
         mocked_return = [{
@@ -115,7 +110,7 @@ class GitlabTest(unittest.TestCase):
 
         self.mocked_request_response = mocked_return
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request
+        requester_mock.request_pages = self.mock_request_pages
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
@@ -126,7 +121,7 @@ class GitlabTest(unittest.TestCase):
 
     def test_get_labels_auth_token_error(self):
         requester_mock = mock.Mock()
-        requester_mock.request.side_effect = UnsuccessfulHttpRequestException(401, {})
+        requester_mock.request_pages.side_effect = UnsuccessfulHttpRequestException(401, {})
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
@@ -138,7 +133,7 @@ class GitlabTest(unittest.TestCase):
 
         self.mocked_request_response = mocked_return
         requester_mock = mock.Mock()
-        requester_mock.request = self.mock_request
+        requester_mock.request_pages = self.mock_request_pages
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
@@ -178,16 +173,14 @@ class GitlabTest(unittest.TestCase):
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
         expected = [
-            {
-                'name': 'first label',
-                'color': 'ffffff',
-            },
-            {
-                'name': 'second label',
-                'color': 'f0f0f0',
-            }
+            Label('first label', 'ffffff'),
+            Label('second label', 'f0f0f0'),
         ]
-        actual = gitlab._create_label_list(input_issues, mocked_return)
+        label_colors = {
+            label['name']: label['color'] for label in mocked_return
+        }
+        actual = gitlab._create_label_list('username', 'repo', input_issues,
+                                           label_colors)
 
         self.assertEqual(expected, actual)
 
@@ -231,12 +224,13 @@ class GitlabTest(unittest.TestCase):
                     'color': '#ffffff'
                 }
             ]
-            if args[1] == 'https://gitlab.com/api/v4/projects/1/issues':
+            if args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo/issues' \
+                    '?per_page=100&with_labels_details=true&iids[]=1&iids[]=2&iids[]=3':
                 return mocked_issue_list
             elif args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo':
                 return project_id
-            elif args[1] == 'https://gitlab.com/api/v4/projects/1/labels':
-                return labels
+            elif args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo/labels?per_page=100':
+                return iter([labels])
 
         username = 'username'
         repo = 'repo'
@@ -244,34 +238,18 @@ class GitlabTest(unittest.TestCase):
 
         requester_mock = mock.Mock()
         requester_mock.request.side_effect = side_effect
+        requester_mock.request_pages.side_effect = side_effect
 
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
         expected_found_issues = [
-            {
-                'number': '1',
-                'labels': [{
-                    'name': 'bug',
-                    'color': 'f0f0f0',
-                }, {
-                    'name': 'feature',
-                    'color': 'ffffff',
-                }],
-                'description': {
-                    'title': 'first issue',
-                    'body': 'first issue description',
-                }
-            }, {
-                'number': '3',
-                'labels': [{
-                    'name': 'feature',
-                    'color': 'ffffff'
-                }],
-                'description': {
-                    'title': 'third issue',
-                    'body': 'third issue description',
-                }
-            }
+            Issue('1', 'first issue', 'first issue description', [
+                Label('bug', 'f0f0f0'),
+                Label('feature', 'ffffff'),
+            ]),
+            Issue('3', 'third issue', 'third issue description', [
+                Label('feature', 'ffffff'),
+            ]),
         ]
         expected_not_found_issues = ['2']
         expected = expected_found_issues, expected_not_found_issues
@@ -338,7 +316,7 @@ class GitlabTest(unittest.TestCase):
         def side_effect(*args, **kwargs):
             if args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo':
                 return project_id
-            elif args[1] == 'https://gitlab.com/api/v4/projects/1/issues/1/notes':
+            elif args[1] == 'https://gitlab.com/api/v4/projects/username%2Frepo/issues/1/notes':
                 return mocked_issue_comments
 
         username = 'username'
@@ -351,18 +329,8 @@ class GitlabTest(unittest.TestCase):
         gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
 
         expected = [
-            {
-                'author': 'author 1',
-                'created_at': 'now',
-                'updated_at': 'later',
-                'body': 'first comment'
-            },
-            {
-                'author': 'author 1',
-                'created_at': 'later',
-                'updated_at': 'even later',
-                'body': 'second comment'
-            },
+            Comment('author 1', 'now', 'later', 'first comment'),
+            Comment('author 1', 'later', 'even later', 'second comment'),
         ]
         actual = gitlab.get_issue_comments(username, repo, issue_number)
 
@@ -451,14 +419,8 @@ class GitlabTest(unittest.TestCase):
         gitlab = Gitlab(requester_mock, {}, 'gitlab.com')
 
         expected = [
-            {
-                'number': 1,
-                'title': 'First closed issue'
-            },
-            {
-                'number': 2,
-                'title': 'Second closed issue'
-            },
+            Issue(1, 'First closed issue'),
+            Issue(2, 'Second closed issue'),
         ], [
             3
         ]
@@ -530,3 +492,111 @@ class GitlabTest(unittest.TestCase):
         actual = gitlab.parse_request_exception(input_exception)
 
         self.assertEqual(expected, actual)
+
+    def test_no_project_lookup_request(self):
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = []
+
+        gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
+        gitlab.get_issue_comments('username', 'repo', 1)
+
+        requester_mock.request.assert_called_once_with(
+            'GET',
+            'https://gitlab.com/api/v4/projects/username%2Frepo/issues/1/notes',
+            extra_headers=gitlab.auth_token_header,
+            fields=Gitlab._COMMENT_FIELDS
+        )
+
+    def test_get_issue_list_with_labels_details(self):
+        mocked_issue_list = [
+            {
+                'iid': 1,
+                'title': 'first issue',
+                'labels': [
+                    {'name': 'bug', 'color': '#f0f0f0'},
+                    {'name': 'feature', 'color': None},
+                ],
+                'description': 'first description',
+            },
+        ]
+
+        requester_mock = mock.Mock()
+        requester_mock.request.return_value = mocked_issue_list
+        gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com')
+
+        expected = [Issue(1, 'first issue', 'first description', [
+            Label('bug', 'f0f0f0'),
+            Label('feature', 'ffffff'),
+        ])]
+        actual = gitlab.get_issue_list('username', 'repo', True, True)
+
+        self.assertEqual(expected, actual)
+        requester_mock.request.assert_called_once_with(
+            'GET',
+            'https://gitlab.com/api/v4/projects/username%2Frepo/issues'
+            '?state=all&with_labels_details=true',
+            extra_headers=gitlab.auth_token_header,
+            fields=Gitlab._ISSUE_FIELDS
+        )
+        requester_mock.request_pages.assert_not_called()
+
+    def test_get_issues_description_chunks(self):
+        requested_iids = []
+
+        def side_effect(*args, **kwargs):
+            iids = [int(parameter.split('=')[1])
+                    for parameter in args[1].split('&')
+                    if parameter.startswith('iids[]')]
+            requested_iids.append(iids)
+
+            return [{
+                'iid': iid,
+                'title': 'issue {0}'.format(iid),
+                'labels': [],
+                'description': '',
+            } for iid in iids if iid != 150]
+
+        requester_mock = mock.Mock()
+        requester_mock.request.side_effect = side_effect
+        gitlab = Gitlab(requester_mock, self.CREDENTIALS, 'gitlab.com',
+                        max_workers=1)
+
+        issue_numbers = list(range(250, 0, -1))
+        issues, not_found_issues = gitlab.get_issues_description(
+            'username', 'repo', issue_numbers
+        )
+
+        self.assertEqual([100, 100, 50], [len(iids) for iids in requested_iids])
+        self.assertEqual([number for number in issue_numbers if number != 150],
+                         [issue.number for issue in issues])
+        self.assertEqual([150], not_found_issues)
+
+    def test_get_updated_issues(self):
+        pages = [[{
+            'iid': 4,
+            'title': 'fourth',
+            'description': 'body',
+            'state': 'opened',
+            'updated_at': '2017-01-02T10:00:00.000Z',
+            'labels': [{'name': 'bug', 'color': '#ff0000'}],
+            'user_notes_count': 0,
+        }]]
+        expected = [Issue(4, 'fourth', 'body', [Label('bug', 'ff0000')],
+                          closed=False,
+                          updated_at='2017-01-02T10:00:00.000Z', comments=0)]
+        requester_mock = mock.Mock()
+        requester_mock.request_pages.return_value = iter(pages)
+        gitlab = Gitlab(requester_mock, self.SECRET_TOKEN, 'gitlab.com')
+
+        actual = list(gitlab.get_updated_issues('username', 'repo',
+                                                '2017-01-01T00:00:00.000Z'))
+
+        self.assertEqual(expected, actual)
+        requester_mock.request_pages.assert_called_once_with(
+            'GET',
+            'https://gitlab.com/api/v4/projects/username%2Frepo/issues'
+            '?per_page=100&state=all&scope=all&order_by=updated_at&sort=asc'
+            '&with_labels_details=true'
+            '&updated_after=2017-01-01T00%3A00%3A00.000Z',
+            extra_headers=self.TOKEN_HEADER, fields=Gitlab._ISSUE_FIELDS
+        )
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+from click.testing import CliRunner
+from gitssue import gitssue
+
+
+class GitssueTest(unittest.TestCase):
+
+    def setUp(self):
+        gitssue._controller = None
+        gitssue._timings = None
+
+    def tearDown(self):
+        gitssue._controller = None
+        gitssue._timings = None
+
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_version_does_not_create_controller(self, controller_mock):
+        result = CliRunner().invoke(gitssue.cli, ['--version'])
+
+        self.assertEqual(0, result.exit_code)
+        self.assertIn(gitssue.GITSSUE_VERSION, result.output)
+        controller_mock.assert_not_called()
+
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_help_does_not_create_controller(self, controller_mock):
+        result = CliRunner().invoke(gitssue.cli, ['create', '--help'])
+
+        self.assertEqual(0, result.exit_code)
+        controller_mock.assert_not_called()
+
+    @mock.patch('gitssue.dependencies.dependencies.Dependencies')
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_controller_created_once(self, controller_mock, dependencies_mock):
+        controller_mock.return_value.list.return_value = 0
+
+        CliRunner().invoke(gitssue.cli, ['list'])
+        CliRunner().invoke(gitssue.cli, ['list'])
+
+        controller_mock.assert_called_once_with(dependencies_mock.return_value)
+
+    @mock.patch('gitssue.dependencies.dependencies.Dependencies')
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_timings(self, controller_mock, dependencies_mock):
+        controller_mock.return_value.list.return_value = 0
+        printer_mock = controller_mock.return_value.deps.printer
+
+        CliRunner().invoke(gitssue.cli, ['--timings', 'list'])
+
+        timings = dependencies_mock.call_args[0][0]
+        self.assertTrue(timings.enabled)
+        printer_mock.print_timings.assert_called_once_with(
+            timings.get_summary(), mock.ANY
+        )
+
+    @mock.patch('gitssue.dependencies.dependencies.Dependencies')
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_no_timings(self, controller_mock, dependencies_mock):
+        controller_mock.return_value.list.return_value = 0
+        printer_mock = controller_mock.return_value.deps.printer
+
+        CliRunner().invoke(gitssue.cli, ['list'])
+
+        dependencies_mock.assert_called_once_with(None, 'text')
+        printer_mock.print_timings.assert_not_called()
+
+    @mock.patch('gitssue.dependencies.dependencies.Dependencies')
+    @mock.patch('gitssue.controller.controller.Controller')
+    def test_format(self, controller_mock, dependencies_mock):
+        controller_mock.return_value.comments.return_value = 0
+
+        result = CliRunner().invoke(gitssue.cli,
+                                    ['comments', '1', '--format', 'tsv'])
+
+        self.assertEqual(0, result.exit_code)
+        dependencies_mock.assert_called_once_with(None, 'tsv')
+
+    def test_invalid_format(self):
+        result = CliRunner().invoke(gitssue.cli,
+                                    ['list', '--format', 'xml'])
+
+        self.assertEqual(2, result.exit_code)
+
+    def test_help_does_not_import_heavy_modules(self):
+        root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = 'import sys\n' \
+            'from gitssue import gitssue\n' \
+            'try:\n' \
+            '    gitssue.cli(["--help"])\n' \
+            'except SystemExit:\n' \
+            '    pass\n' \
+            'modules = ("requests", "colorconsole", "gitssue.remote.github",\n' \
+            '           "gitssue.remote.gitlab", "gitssue.remote.bitbucket")\n' \
+            'print(",".join(m for m in modules if m in sys.modules))\n'
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', script], cwd=root_path,
+            universal_newlines=True
+        )
+
+        self.assertEqual('', output.splitlines()[-1])
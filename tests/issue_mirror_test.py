@@ -0,0 +1,226 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from gitssue.mirror.issue_mirror import IssueMirror
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
+from gitssue.mirror.mirror_not_synced_exception \
+    import MirrorNotSyncedException
+
+
+class IssueMirrorTest(unittest.TestCase):
+
+    LABELS = [Label('bug', 'ff0000'), Label('feature', '00ff00')]
+    ISSUES = [
+        Issue(1, 'first issue', 'first body', LABELS, closed=False,
+              updated_at='2017-01-01T00:00:00Z'),
+        Issue(2, 'second issue', None, closed=True,
+              updated_at='2017-01-03T00:00:00Z'),
+    ]
+    COMMENTS = {
+        1: [
+            Comment('julenpardo', '2017-01-01T00:00:00Z',
+                    '2017-01-01T00:00:00Z', 'first comment'),
+        ],
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.mirror = IssueMirror(
+            os.path.join(self.directory, 'github.com', 'a', 'b.sqlite')
+        )
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self.directory)
+
+    def test_not_synced(self):
+        self.assertIsNone(self.mirror.get_last_synced())
+        self.assertIsNone(self.mirror.get_sync_cursor())
+
+        with self.assertRaises(MirrorNotSyncedException):
+            self.mirror.get_issue_list()
+
+    def test_update(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.assertEqual(1000, self.mirror.get_last_synced())
+        self.assertEqual('2017-01-03T00:00:00Z', self.mirror.get_sync_cursor())
+
+    def test_get_issue_list(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+        expected_open = [Issue(1, 'first issue', 'first body', self.LABELS)]
+
+        self.assertEqual(expected_open,
+                         self.mirror.get_issue_list(get_description=True))
+        self.assertEqual([2, 1], [issue.number for issue in
+                                  self.mirror.get_issue_list(show_all=True)])
+
+    def test_get_issues_description(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+        expected = [
+            Issue(2, 'second issue', ''),
+            Issue(1, 'first issue', 'first body', self.LABELS),
+        ]
+
+        issues, not_found_issues = self.mirror.get_issues_description(
+            [2, 3, 1]
+        )
+
+        self.assertEqual(expected, issues)
+        self.assertEqual([3], not_found_issues)
+
+    def test_get_issue_comments(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.assertEqual(self.COMMENTS[1], self.mirror.get_issue_comments(1))
+        self.assertEqual([], self.mirror.get_issue_comments(2))
+
+    def test_incremental_update(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+        updated_issue = Issue(1, 'renamed', 'first body',
+                              updated_at='2017-01-02T00:00:00Z')
+
+        self.mirror.update([updated_issue], {1: []}, 2000)
+
+        issues = self.mirror.get_issue_list(show_all=True)
+
+        self.assertEqual(['second issue', 'renamed'],
+                         [issue.title for issue in issues])
+        self.assertEqual((), issues[1].labels)
+        self.assertEqual([], self.mirror.get_issue_comments(1))
+        # The cursor never goes back.
+        self.assertEqual('2017-01-03T00:00:00Z', self.mirror.get_sync_cursor())
+        self.assertEqual(2000, self.mirror.get_last_synced())
+
+    def test_full_update(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.mirror.update(self.ISSUES[:1], {}, 2000, full=True)
+
+        issues = self.mirror.get_issue_list(show_all=True)
+
+        self.assertEqual([1], [issue.number for issue in issues])
+        self.assertEqual([], self.mirror.get_issue_comments(1))
+        self.assertEqual('2017-01-01T00:00:00Z', self.mirror.get_sync_cursor())
+
+    def test_full_update_search_not_available(self):
+        migrations = (IssueMirror._SCHEMA,
+                      'CREATE VIRTUAL TABLE issues_search USING no_fts (a);')
+
+        with mock.patch.object(IssueMirror, '_MIGRATIONS', migrations):
+            self.mirror.update(self.ISSUES, self.COMMENTS, 1000, full=True)
+
+        issues = self.mirror.get_issue_list(show_all=True)
+
+        self.assertFalse(self.mirror.search_available)
+        self.assertEqual([2, 1], [issue.number for issue in issues])
+        self.assertEqual('2017-01-03T00:00:00Z', self.mirror.get_sync_cursor())
+
+    def test_persisted(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+        self.mirror.close()
+
+        mirror = IssueMirror(self.mirror.path)
+
+        self.assertEqual(2, len(mirror.get_issue_list(show_all=True)))
+        mirror.close()
+
+    def test_search(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        results = self.mirror.search('first')
+
+        self.assertEqual([1], [issue.number for issue in results])
+        self.assertEqual('**first** issue', results[0].snippet)
+        self.assertEqual(['bug', 'feature'],
+                         [label.name for label in results[0].labels])
+        self.assertFalse(results[0].closed)
+
+    def test_search_ranking(self):
+        issues = [
+            Issue(1, 'other', 'crash', self.LABELS),
+            Issue(2, 'crash', 'other', self.LABELS),
+        ]
+        self.mirror.update(issues, {}, 1000)
+
+        results = self.mirror.search('crash')
+
+        self.assertEqual([2, 1], [issue.number for issue in results])
+
+    def test_search_comments_and_prefix(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.assertEqual([1], [issue.number for issue in
+                               self.mirror.search('comm*')])
+        self.assertEqual([], self.mirror.search('comm'))
+
+    def test_search_filters(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.assertEqual([2, 1], sorted(
+            (issue.number for issue in self.mirror.search('issue')),
+            reverse=True
+        ))
+        self.assertEqual([2], [issue.number for issue in
+                               self.mirror.search('issue', state='closed')])
+        self.assertEqual([1], [issue.number for issue in
+                               self.mirror.search('issue', state='open')])
+        self.assertEqual([1], [issue.number for issue in
+                               self.mirror.search('issue',
+                                                  labels=['bug', 'feature'])])
+        self.assertEqual([], self.mirror.search('issue', labels=['other']))
+        self.assertEqual(1, len(self.mirror.search('issue', limit=1)))
+
+    def test_search_special_characters(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+
+        self.assertEqual([], self.mirror.search('first-issue: "AND" NOT('))
+        self.assertEqual([], self.mirror.search('*'))
+
+    def test_search_updated(self):
+        self.mirror.update(self.ISSUES, self.COMMENTS, 1000)
+        updated_issue = Issue(1, 'renamed', 'first body', self.LABELS,
+                              updated_at='2017-01-01T00:00:00Z')
+
+        self.mirror.update([updated_issue], {}, 2000)
+
+        self.assertEqual([], self.mirror.search('first issue'))
+        self.assertEqual([1], [issue.number for issue in
+                               self.mirror.search('renamed comment')])
+
+        self.mirror.update([], {}, 3000, full=True)
+
+        self.assertEqual([], self.mirror.search('renamed'))
+
+    def test_search_not_synced(self):
+        with self.assertRaises(MirrorNotSyncedException):
+            self.mirror.search('first')
+
+    def test_search_index_created_for_existing_mirror(self):
+        os.makedirs(os.path.dirname(self.mirror.path))
+        connection = sqlite3.connect(self.mirror.path)
+        connection.executescript(IssueMirror._SCHEMA)
+        connection.execute(
+            "INSERT INTO issues VALUES (7, 'old issue', '', 0, NULL)"
+        )
+        connection.execute("INSERT INTO sync_state VALUES ('synced_at', '1')")
+        connection.execute('PRAGMA user_version = 1')
+        connection.commit()
+        connection.close()
+
+        self.assertEqual([7], [issue.number for issue in
+                               self.mirror.search('old')])
+
+    def test_labels_shared(self):
+        self.mirror.update(self.ISSUES + [
+            Issue(3, 'third issue', '', self.LABELS[:1])
+        ], {}, 1000)
+
+        issues = self.mirror.get_issue_list(show_all=True)
+
+        self.assertIs(issues[0].labels[0], issues[2].labels[0])
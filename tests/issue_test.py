@@ -0,0 +1,46 @@
+import unittest
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
+
+
+class IssueTest(unittest.TestCase):
+
+    def test_defaults(self):
+        issue = Issue(1, 'title')
+
+        self.assertEqual('', issue.body)
+        self.assertEqual((), issue.labels)
+        self.assertFalse(issue.closed)
+        self.assertIsNone(issue.updated_at)
+        self.assertIsNone(issue.comments)
+        self.assertIsNone(issue.snippet)
+
+    def test_labels_stored_as_tuple(self):
+        labels = [Label('bug', 'ff0000')]
+
+        issue = Issue(1, 'title', labels=labels)
+        labels.append(Label('feature', '00ff00'))
+
+        self.assertEqual((Label('bug', 'ff0000'),), issue.labels)
+
+    def test_equal(self):
+        self.assertEqual(Issue(1, 'title', 'body', closed=True),
+                         Issue(1, 'title', 'body', closed=True))
+        self.assertNotEqual(Issue(1, 'title'), Issue(1, 'title', closed=True))
+        self.assertNotEqual(Issue(1, 'title'), {'number': 1, 'title': 'title'})
+        self.assertEqual(Comment('a', 'b', 'c', 'd'),
+                         Comment('a', 'b', 'c', 'd'))
+
+    def test_slots(self):
+        issue = Issue(1, 'title')
+
+        with self.assertRaises(AttributeError):
+            issue.unknown = True
+
+        self.assertFalse(hasattr(issue, '__dict__'))
+        self.assertFalse(hasattr(Comment('a', 'b', 'c', 'd'), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from gitssue.request.json_projection import JsonProjection
+
+
+class JsonProjectionTest(unittest.TestCase):
+
+    def test_apply(self):
+        issue = {
+            'number': 1,
+            'title': 'title',
+            'user': {'login': 'user', 'id': 1},
+            'labels': [
+                {'id': 1, 'name': 'bug', 'color': 'ff0000'},
+                'label without details',
+            ],
+            'pull_request': {'url': 'url'},
+        }
+        projection = JsonProjection(('number', 'body', 'user.login',
+                                     'labels.name', 'labels.color'))
+
+        expected = {
+            'number': 1,
+            'user': {'login': 'user'},
+            'labels': [
+                {'name': 'bug', 'color': 'ff0000'},
+                'label without details',
+            ],
+        }
+        actual = projection.apply(issue)
+
+        self.assertEqual(expected, actual)
+
+    def test_apply_array(self):
+        projection = JsonProjection(('number',))
+
+        expected = [{'number': 1}, {'number': 2}]
+        actual = projection.apply([{'number': 1, 'title': 'first'},
+                                   {'number': 2, 'title': 'second'}])
+
+        self.assertEqual(expected, actual)
+
+    def test_apply_whole_value(self):
+        projection = JsonProjection(('content',))
+        page = {'content': {'raw': 'raw', 'html': 'html'}, 'size': 1}
+
+        self.assertEqual({'content': {'raw': 'raw', 'html': 'html'}},
+                         projection.apply(page))
+
+    def test_apply_without_fields(self):
+        value = {'number': 1, 'user': {'login': 'user'}}
+
+        self.assertIs(value, JsonProjection().apply(value))
+
+
+if __name__ == '__main__':
+    unittest.main()
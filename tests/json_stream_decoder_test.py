@@ -0,0 +1,109 @@
+import json
+import unittest
+from unittest import mock
+from gitssue.request.json_stream_decoder import JsonStreamDecoder
+
+
+class JsonStreamDecoderTest(unittest.TestCase):
+
+    @staticmethod
+    def split(body, size):
+        return [body[index:index + size]
+                for index in range(0, len(body), size)]
+
+    def test_items(self):
+        value = [{'number': 1, 'title': 'ñ €'}, [1, 2], 'text', 12345, None]
+        body = json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+        for size in (1, 2, 3, 7, len(body)):
+            decoder = JsonStreamDecoder(self.split(body, size))
+
+            self.assertTrue(decoder.is_array())
+            self.assertEqual(value, list(decoder.items()))
+
+    def test_items_split_numbers(self):
+        for chunks, value in (
+                ([b'[1.5e', b'3]'], [1500.0]),
+                ([b'[1.', b'25, 2]'], [1.25, 2]),
+                ([b'[2e', b'-', b'2, -', b'1]'], [0.02, -1]),
+                ([b'[37568', b'.32524042781]'], [37568.32524042781]),
+                ([b'[1E+', b'2 ', b']'], [100.0]),
+        ):
+            decoder = JsonStreamDecoder(chunks)
+
+            self.assertEqual(value, list(decoder.items()))
+
+    def test_items_numbers_any_chunk_size(self):
+        value = [37568.32524042781, -0.5e-7, 12, 1E+20, 0, -3.0]
+        body = json.dumps(value).encode('utf-8')
+
+        for size in range(1, 12):
+            decoder = JsonStreamDecoder(self.split(body, size))
+
+            self.assertEqual(value, list(decoder.items()))
+
+    def test_items_yielded_as_received(self):
+        chunks = [b'[{"number": 1}, ', b'{"number": 2}', b']']
+        read = []
+
+        def read_chunks():
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        items = JsonStreamDecoder(read_chunks()).items()
+
+        self.assertEqual({'number': 1}, next(items))
+        self.assertEqual(chunks[:1], read)
+
+    def test_items_whitespace(self):
+        decoder = JsonStreamDecoder([b' \n[ 1 ,\n 2 ] \n'])
+
+        self.assertEqual([1, 2], list(decoder.items()))
+
+    def test_items_empty_array(self):
+        decoder = JsonStreamDecoder([b'[', b' ]'])
+
+        self.assertEqual([], list(decoder.items()))
+
+    def test_items_invalid(self):
+        for body in (b'[1, 2', b'[1 2]', b'[1, ]', b'[1] 2'):
+            with self.assertRaises(ValueError):
+                list(JsonStreamDecoder([body]).items())
+
+    def test_items_not_array(self):
+        with self.assertRaises(ValueError):
+            list(JsonStreamDecoder([b'{}']).items())
+
+    def test_items_large_item_joined_when_doubled(self):
+        value = [{'body': 'x' * 100000}, 1]
+        body = json.dumps(value).encode('utf-8')
+        decoder = JsonStreamDecoder(self.split(body, 100))
+
+        with mock.patch.object(decoder, '_join_pending',
+                               wraps=decoder._join_pending) as join_mock:
+            self.assertEqual(value, list(decoder.items()))
+
+        self.assertLess(join_mock.call_count, 30)
+
+    def test_value_small_chunks(self):
+        value = {'values': [{'title': 'ñ €'}] * 100, 'next': None}
+        body = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        decoder = JsonStreamDecoder(self.split(body, 3))
+
+        self.assertFalse(decoder.is_array())
+        self.assertEqual(value, decoder.value())
+
+    def test_value(self):
+        decoder = JsonStreamDecoder([b'{"values": [1', b'], "next": null}'])
+
+        self.assertFalse(decoder.is_array())
+        self.assertEqual({'values': [1], 'next': None}, decoder.value())
+
+    def test_value_empty(self):
+        with self.assertRaises(ValueError):
+            JsonStreamDecoder([]).value()
+
+
+if __name__ == '__main__':
+    unittest.main()
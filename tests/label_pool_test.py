@@ -0,0 +1,37 @@
+import unittest
+from gitssue.model.label import Label
+from gitssue.model.label_pool import LabelPool
+
+
+class LabelPoolTest(unittest.TestCase):
+
+    def test_get_shared(self):
+        label_pool = LabelPool()
+
+        first = label_pool.get('bug', 'ff0000')
+        second = label_pool.get('bug', 'ff0000')
+
+        self.assertEqual(Label('bug', 'ff0000'), first)
+        self.assertIs(first, second)
+        self.assertEqual(1, len(label_pool))
+
+    def test_get_different_color(self):
+        label_pool = LabelPool()
+
+        first = label_pool.get('bug', 'ff0000')
+        second = label_pool.get('bug', '00ff00')
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(2, len(label_pool))
+
+    def test_label_immutable(self):
+        label = Label('bug', 'ff0000')
+
+        with self.assertRaises(AttributeError):
+            label.name = 'feature'
+
+        self.assertEqual(hash(Label('bug', 'ff0000')), hash(label))
+
+
+if __name__ == '__main__':
+    unittest.main()
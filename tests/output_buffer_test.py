@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+import contextlib
+from io import StringIO
+from gitssue.printer.output_buffer import OutputBuffer
+
+
+class OutputBufferTest(unittest.TestCase):
+
+    def test_write_buffered_until_flush(self):
+        stream = mock.Mock()
+        output = OutputBuffer(stream)
+
+        output.write('first\n')
+        output.write('second\n')
+
+        stream.write.assert_not_called()
+
+        output.flush()
+
+        stream.write.assert_called_once_with('first\nsecond\n')
+        stream.flush.assert_called_once_with()
+
+    def test_write_flushes_when_full(self):
+        stream = mock.Mock()
+        output = OutputBuffer(stream, size=10)
+
+        output.write('12345')
+        output.write('67890')
+        output.write('abc')
+
+        stream.write.assert_called_once_with('1234567890')
+
+    def test_flush_empty(self):
+        stream = mock.Mock()
+
+        OutputBuffer(stream).flush()
+
+        stream.write.assert_not_called()
+
+    def test_with_flushes_on_exception(self):
+        stream = StringIO()
+        output = OutputBuffer(stream)
+
+        with self.assertRaises(ValueError):
+            with output:
+                output.write('written\n')
+                raise ValueError
+
+        self.assertEqual('written\n', stream.getvalue())
+
+    def test_default_stream_is_current_stdout(self):
+        output = OutputBuffer()
+        output.write('line\n')
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            output.flush()
+
+        self.assertEqual('line\n', temp_stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,23 +1,29 @@
 import unittest
+from unittest import mock
 import contextlib
 import time
 from datetime import datetime
+from collections import Counter
 from io import StringIO
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
 from gitssue.printer.printer import Printer
+from gitssue.printer.output_buffer import OutputBuffer
 from gitssue.printer.color_printer_interface import ColorPrinterInterface
 
 
 class DummyColorPrinter(ColorPrinterInterface):
-    def print_colored_line(self, line, hex_color='ffffff'):
-        print(line)
+    def format_colored_line(self, line, hex_color='ffffff'):
+        return line + '\n'
 
-    def print_labels(self, labels):
+    def format_labels(self, labels):
         label_string = ''
         for label in labels:
-            label_string += '{0} '.format(label['name'])
+            label_string += '{0} '.format(label.name)
 
         label_string = label_string[:-1]
-        print(label_string)
+        return label_string + '\n'
 
 class PrinterTest(unittest.TestCase):
 
@@ -38,19 +44,13 @@ class PrinterTest(unittest.TestCase):
 
     def test_print_issue_list_no_description(self):
         issues_input = [
-            {
-                'number': '1',
-                'title': 'First issue title',
-            },
-            {
-                'number': '2',
-                'title': 'Second issue title',
-            }
+            Issue('1', 'First issue title'),
+            Issue('2', 'Second issue title'),
         ]
 
         expected = ''
         for issue in issues_input:
-            expected += '#{0}: {1}\n'.format(issue['number'], issue['title'])
+            expected += '#{0}: {1}\n'.format(issue.number, issue.title)
             expected += '\n\n'
 
         expected = expected[:-3]
@@ -65,22 +65,14 @@ class PrinterTest(unittest.TestCase):
 
     def test_print_issue_list_passing_description(self):
         issues_input = [
-            {
-                'number': '1',
-                'title': 'First issue title',
-                'description': 'Description of first issue',
-            },
-            {
-                'number': '2',
-                'title': 'Second issue title',
-                'description': 'Description of second issue',
-            }
+            Issue('1', 'First issue title', 'Description of first issue'),
+            Issue('2', 'Second issue title', 'Description of second issue'),
         ]
 
         expected = ''
         for issue in issues_input:
-            expected += '#{0}: {1}\n\n'.format(issue['number'], issue['title'])
-            expected += '{0}\n'.format(issue['description'])
+            expected += '#{0}: {1}\n\n'.format(issue.number, issue.title)
+            expected += '{0}\n'.format(issue.body)
             expected += '\n'
 
         expected = expected[:-2]
@@ -93,6 +85,13 @@ class PrinterTest(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_print_issue_list_with_desc_no_body(self):
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            self.printer.print_issue_list_with_desc([Issue(1, 'Title', None)])
+
+        self.assertEqual('#1: Title\n\n\n\n', temp_stdout.getvalue())
+
     def test_print_issue_list_with_desc_empty_dict(self):
         expected = 'No issue could be found.'
 
@@ -106,38 +105,22 @@ class PrinterTest(unittest.TestCase):
 
     def test_print_issue_list_with_desc(self):
         issues_input = [
-            {
-                'number': '1',
-                'description': {
-                    'title': 'first issue',
-                    'body': 'body of first issue',
-                },
-                'labels': [
-                    {
-                        'name': 'some label',
-                    }
-                ]
-            },
-            {
-                'number': '2',
-                'description': {
-                    'title': 'second issue',
-                    'body': 'body of second issue',
-                }
-            }
+            Issue('1', 'first issue', 'body of first issue',
+                  [Label('some label', 'ffffff')]),
+            Issue('2', 'second issue', 'body of second issue'),
         ]
 
         expected = ''
         for issue in issues_input:
-            expected += '#{0}: {1}\n'.format(issue['number'], issue['description']['title'])
-            if issue.get('labels'):
+            expected += '#{0}: {1}\n'.format(issue.number, issue.title)
+            if issue.labels:
 
-                for label in issue.get('labels'):
-                    expected += '{0} '.format(label['name'])
+                for label in issue.labels:
+                    expected += '{0} '.format(label.name)
                 expected = expected[:-1]
                 expected += '\n'
 
-            expected += '{0}\n'.format(issue['description']['body'])
+            expected += '{0}\n'.format(issue.body)
             expected += '\n\n'
 
         expected = expected[:-3]
@@ -152,17 +135,10 @@ class PrinterTest(unittest.TestCase):
 
     def test_print_issue_comment_thread(self):
         comments_input = [
-            {
-                'author': 'Julen Pardo',
-                'created_at': 'Right now',
-                'updated_at': 'never',
-                'body': 'this is the first comment'
-            }, {
-                'author': 'Pardo, Julen',
-                'created_at': 'A bit later',
-                'updated_at': 'never',
-                'body': 'this is the second and last comment'
-            },
+            Comment('Julen Pardo', 'Right now', 'never',
+                    'this is the first comment'),
+            Comment('Pardo, Julen', 'A bit later', 'never',
+                    'this is the second and last comment'),
         ]
         expected = 'Author: Julen Pardo\n'
         expected += 'Date: Right now\n'
@@ -262,3 +238,71 @@ class PrinterTest(unittest.TestCase):
         actual = temp_stdout.getvalue().strip()
 
         self.assertEqual(expected, actual)
+
+    def test_print_timings(self):
+        steps = [{
+            'category': 'git',
+            'name': 'get_remote_domain',
+            'calls': 1,
+            'total': 0.0012,
+            'self': 0.0012,
+            'max': 0.0012,
+            'size': 0,
+            'statuses': Counter(),
+            'cache': Counter(),
+        }, {
+            'category': 'http',
+            'name': 'GET api.github.com/repos/user/repo/issues',
+            'calls': 3,
+            'total': 0.3,
+            'self': 0.3,
+            'max': 0.15,
+            'size': 3072,
+            'statuses': Counter({200: 2, 304: 1}),
+            'cache': Counter({'miss': 2, 'hit': 1}),
+        }]
+
+        temp_stderr = StringIO()
+        temp_stdout = StringIO()
+        with mock.patch('sys.stderr', temp_stderr), \
+                contextlib.redirect_stdout(temp_stdout):
+            self.printer.print_timings(steps, 0.5)
+
+        lines = temp_stderr.getvalue().splitlines()
+
+        self.assertEqual('', temp_stdout.getvalue())
+        self.assertEqual('Timings (total: 500.0 ms)', lines[0])
+        self.assertEqual(
+            ['step', 'calls', 'total', 'ms', 'self', 'ms', 'max', 'ms',
+             'details'], lines[2].split()
+        )
+        self.assertEqual(['git', 'get_remote_domain', '1', '1.2', '1.2',
+                          '1.2'], lines[3].split())
+        self.assertEqual(
+            'http GET api.github.com/repos/user/repo/issues      3      300.0'
+            '      300.0      150.0  200 x2 304 x1, 3.0 KiB, cache: 1 hit, '
+            '2 miss', lines[4]
+        )
+
+    def test_print_issue_list_single_write(self):
+        issues = [Issue(number, 'Title') for number in range(100)]
+        stream = mock.Mock()
+        printer = Printer(DummyColorPrinter(), OutputBuffer(stream))
+
+        printer.print_issue_list(issues)
+
+        self.assertEqual(1, stream.write.call_count)
+        self.assertTrue(stream.write.call_args[0][0].startswith(
+            '#0: Title\n\n\n#1: Title'))
+
+    def test_print_issue_list_flushes_on_exception(self):
+        def issues():
+            yield Issue(1, 'Title')
+            raise ValueError
+
+        temp_stdout = StringIO()
+        with contextlib.redirect_stdout(temp_stdout):
+            with self.assertRaises(ValueError):
+                self.printer.print_issue_list(issues())
+
+        self.assertEqual('#1: Title\n\n\n', temp_stdout.getvalue())
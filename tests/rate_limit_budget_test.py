@@ -0,0 +1,246 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+from unittest import mock
+from gitssue.request.rate_limit_budget import RateLimitBudget
+
+
+class RateLimitBudgetTest(unittest.TestCase):
+
+    API_URL = 'https://api.github.com/repos/user/repo/issues'
+
+    def setUp(self):
+        self.budget = RateLimitBudget()
+        self.identity = RateLimitBudget.identity({'username': 'user'})
+
+    def headers(self, limit=5000, remaining=4999, reset=None, **extra):
+        headers = {
+            'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(reset or int(time.time()) + 3600),
+        }
+        headers.update(extra)
+
+        return headers
+
+    def test_record_and_get(self):
+        reset = int(time.time()) + 3600
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(reset=reset))
+
+        expected = 5000, 4999, reset
+        actual = self.budget.get('https://api.github.com', self.identity)
+
+        self.assertEqual(expected, actual)
+
+    def test_get_unknown(self):
+        self.assertIsNone(self.budget.get(self.API_URL, self.identity))
+
+    def test_get_other_identity(self):
+        self.budget.record(self.API_URL, self.identity, 200, self.headers())
+        other_identity = RateLimitBudget.identity({'username': 'other'})
+
+        self.assertIsNone(self.budget.get(self.API_URL, other_identity))
+
+    def test_get_other_resource(self):
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(**{'X-RateLimit-Resource': 'graphql'}))
+
+        self.assertIsNone(self.budget.get(self.API_URL, self.identity))
+        self.assertIsNotNone(self.budget.get(self.API_URL, self.identity,
+                                             'graphql'))
+
+    def test_get_already_reset(self):
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(reset=int(time.time()) - 1))
+
+        self.assertIsNone(self.budget.get(self.API_URL, self.identity))
+
+    def test_record_without_headers(self):
+        self.budget.record(self.API_URL, self.identity, 200, {})
+
+        self.assertIsNone(self.budget.get(self.API_URL, self.identity))
+
+    def test_record_gitlab_headers(self):
+        reset = int(time.time()) + 60
+        self.budget.record('https://gitlab.com/api/v4/projects', self.identity,
+                           200, {
+                               'RateLimit-Limit': '600',
+                               'RateLimit-Remaining': '599',
+                               'RateLimit-Reset': str(reset),
+                           })
+
+        expected = 600, 599, reset
+        actual = self.budget.get('https://gitlab.com', self.identity)
+
+        self.assertEqual(expected, actual)
+
+    def test_record_keeps_lowest_remaining_of_window(self):
+        reset = int(time.time()) + 3600
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(remaining=10, reset=reset))
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(remaining=12, reset=reset))
+
+        self.assertEqual(10, self.budget.get(self.API_URL, self.identity)[1])
+
+        new_reset = reset + 3600
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(remaining=4999, reset=new_reset))
+
+        self.assertEqual(4999, self.budget.get(self.API_URL, self.identity)[1])
+
+    @mock.patch('time.sleep')
+    def test_wait_enough_remaining(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 200, self.headers())
+
+        self.assertEqual(0, self.budget.wait(self.API_URL, self.identity))
+        sleep_mock.assert_not_called()
+
+    @mock.patch('time.sleep')
+    def test_wait_unknown(self, sleep_mock):
+        self.assertEqual(0, self.budget.wait(self.API_URL, self.identity))
+        sleep_mock.assert_not_called()
+
+    @mock.patch('time.sleep')
+    def test_wait_paces_few_remaining(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 200, self.headers(
+            limit=100, remaining=5, reset=int(time.time()) + 50
+        ))
+
+        delay = self.budget.wait(self.API_URL, self.identity)
+
+        self.assertAlmostEqual(10, delay, delta=1)
+        sleep_mock.assert_called_once_with(delay)
+
+    @mock.patch('time.sleep')
+    def test_wait_counts_the_request(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 200,
+                           self.headers(remaining=100))
+
+        self.budget.wait(self.API_URL, self.identity)
+        self.budget.wait(self.API_URL, self.identity)
+
+        self.assertEqual(98, self.budget.get(self.API_URL, self.identity)[1])
+
+    @mock.patch('time.sleep')
+    def test_wait_exhausted(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 403, self.headers(
+            remaining=0, reset=int(time.time()) + 30
+        ))
+
+        delay = self.budget.wait(self.API_URL, self.identity)
+
+        self.assertAlmostEqual(30, delay, delta=1)
+        sleep_mock.assert_called_once_with(delay)
+
+    @mock.patch('time.sleep')
+    def test_wait_exhausted_longer_than_max_wait(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 403, self.headers(
+            remaining=0, reset=int(time.time()) + 3600
+        ))
+
+        self.assertEqual(0, self.budget.wait(self.API_URL, self.identity))
+        sleep_mock.assert_not_called()
+
+    @mock.patch('time.sleep')
+    def test_wait_other_resource(self, sleep_mock):
+        self.budget.record(
+            'https://api.github.com/search/issues', self.identity, 200,
+            self.headers(limit=30, remaining=1,
+                         **{'X-RateLimit-Resource': 'search'})
+        )
+        self.budget.record(
+            'https://api.github.com/graphql', self.identity, 200,
+            self.headers(remaining=4000, **{'X-RateLimit-Resource': 'graphql'})
+        )
+
+        self.assertEqual(0, self.budget.wait(self.API_URL, self.identity))
+        self.assertEqual(4000, self.budget.get(self.API_URL, self.identity,
+                                               'graphql')[1])
+        self.assertEqual(1, self.budget.get(self.API_URL, self.identity,
+                                            'search')[1])
+        sleep_mock.assert_not_called()
+
+    @mock.patch('time.sleep')
+    def test_wait_counts_the_request_in_its_resource(self, sleep_mock):
+        graphql_url = 'https://api.github.com/graphql'
+        self.budget.record(graphql_url, self.identity, 200,
+                           self.headers(remaining=4000))
+
+        self.budget.wait(graphql_url, self.identity)
+
+        self.assertEqual(3999, self.budget.get(graphql_url, self.identity,
+                                               'graphql')[1])
+
+    def test_resource(self):
+        self.assertEqual('core', RateLimitBudget.resource(self.API_URL))
+        self.assertEqual('graphql', RateLimitBudget.resource(
+            'https://api.github.com/graphql'))
+        self.assertEqual('search', RateLimitBudget.resource(
+            'https://api.github.com/search/issues?q=bug'))
+
+    @mock.patch('time.sleep')
+    def test_wait_other_host(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 403, self.headers(
+            remaining=0, reset=int(time.time()) + 30
+        ))
+
+        self.assertEqual(0, self.budget.wait('https://gitlab.com/api/v4',
+                                             self.identity))
+
+    @mock.patch('time.sleep')
+    def test_wait_retry_after_seconds(self, sleep_mock):
+        self.budget.record(self.API_URL, self.identity, 429,
+                           {'Retry-After': '20'})
+
+        delay = self.budget.wait(self.API_URL, self.identity)
+
+        self.assertAlmostEqual(20, delay, delta=1)
+
+    @mock.patch('time.sleep')
+    def test_wait_retry_after_date(self, sleep_mock):
+        retry_date = formatdate(time.time() + 20, usegmt=True)
+        self.budget.record(self.API_URL, self.identity, 429,
+                           {'Retry-After': retry_date})
+
+        delay = self.budget.wait(self.API_URL, self.identity)
+
+        self.assertAlmostEqual(20, delay, delta=2)
+
+    def test_saved_budget(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'rate_limit', 'budget.json')
+        reset = int(time.time()) + 3600
+
+        budget = RateLimitBudget(path)
+        budget.record(self.API_URL, self.identity, 200,
+                      self.headers(reset=reset))
+
+        self.assertFalse(os.path.exists(path))
+
+        budget.save()
+
+        expected = 5000, 4999, reset
+        actual = RateLimitBudget(path).get(self.API_URL, self.identity)
+
+        self.assertEqual(expected, actual)
+
+    def test_invalid_saved_budget(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'budget.json')
+
+        with open(path, 'w') as file:
+            file.write('not json')
+
+        self.assertIsNone(RateLimitBudget(path).get(self.API_URL,
+                                                    self.identity))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import json
+from io import StringIO
+from unittest import mock
+from gitssue.model.comment import Comment
+from gitssue.model.issue import Issue
+from gitssue.model.label import Label
+from gitssue.printer.output_buffer import OutputBuffer
+from gitssue.printer.record_printer import RecordPrinter
+
+
+class RecordPrinterTest(unittest.TestCase):
+
+    issues = [
+        Issue(1, 'First issue', 'First body', [Label('bug', 'ff0000'),
+                                               Label('ui', '00ff00')]),
+        Issue(2, 'Second issue', 'Tab\there\nand "quotes" \\'),
+    ]
+
+    def print_records(self, output_format, method, *args):
+        stream = StringIO()
+        printer = RecordPrinter(output_format, OutputBuffer(stream))
+
+        getattr(printer, method)(*args)
+
+        return stream.getvalue()
+
+    def test_print_issue_list_jsonl(self):
+        expected = [
+            {'number': 1, 'title': 'First issue',
+             'labels': [{'name': 'bug', 'color': 'ff0000'},
+                        {'name': 'ui', 'color': '00ff00'}]},
+            {'number': 2, 'title': 'Second issue', 'labels': []},
+        ]
+
+        output = self.print_records('jsonl', 'print_issue_list', self.issues)
+        actual = [json.loads(line) for line in output.splitlines()]
+
+        self.assertEqual(expected, actual)
+        self.assertTrue(output.startswith('{"number": 1, "title"'))
+
+    def test_print_issue_list_tsv_with_description(self):
+        expected = 'number\ttitle\tlabels\tbody\n' \
+            '1\tFirst issue\tbug,ui\tFirst body\n' \
+            '2\tSecond issue\t\tTab\\there\\nand "quotes" \\\\\n'
+
+        actual = self.print_records('tsv', 'print_issue_list', self.issues,
+                                    True)
+
+        self.assertEqual(expected, actual)
+
+    def test_print_issue_list_with_desc_json(self):
+        output = self.print_records('json', 'print_issue_list_with_desc',
+                                    self.issues)
+        actual = json.loads(output)
+
+        self.assertEqual([1, 2], [issue['number'] for issue in actual])
+        self.assertEqual('Tab\there\nand "quotes" \\', actual[1]['body'])
+        self.assertEqual(4, len(output.splitlines()))
+
+    def test_print_issue_list_empty(self):
+        self.assertEqual('', self.print_records('jsonl', 'print_issue_list',
+                                                []))
+        self.assertEqual([], json.loads(self.print_records(
+            'json', 'print_issue_list', None
+        )))
+        self.assertEqual('number\ttitle\tlabels\n', self.print_records(
+            'tsv', 'print_issue_list', []
+        ))
+
+    def test_print_issue_comment_thread_tsv(self):
+        comments = [Comment('user', '2017-01-01', '2017-01-02', 'Body\n')]
+
+        expected = 'author\tcreated_at\tupdated_at\tbody\n' \
+            'user\t2017-01-01\t2017-01-02\tBody\\n\n'
+        actual = self.print_records('tsv', 'print_issue_comment_thread',
+                                    comments)
+
+        self.assertEqual(expected, actual)
+
+    def test_print_search_results_tsv(self):
+        issues = [Issue(1, 'Title', closed=True, snippet='the snippet')]
+
+        expected = 'number\ttitle\tlabels\tclosed\tsnippet\n' \
+            '1\tTitle\t\ttrue\tthe snippet\n'
+        actual = self.print_records('tsv', 'print_search_results', issues)
+
+        self.assertEqual(expected, actual)
+
+    def test_records_written_as_iterated(self):
+        stream = StringIO()
+        printer = RecordPrinter('jsonl', OutputBuffer(stream))
+        written = []
+
+        def issues():
+            for issue in self.issues:
+                written.append(stream.getvalue())
+                yield issue
+
+        printer.print_issue_list(issues())
+
+        self.assertEqual('', written[0])
+        self.assertEqual('{"number": 1', written[1][:12])
+
+    def test_messages_to_stderr(self):
+        stream = StringIO()
+        printer = RecordPrinter('jsonl', OutputBuffer(stream))
+
+        temp_stderr = StringIO()
+        with mock.patch('sys.stderr', temp_stderr):
+            printer.print_error('Something failed')
+            printer.print_not_found_issues([3, 4])
+            printer.print_last_synced(0)
+
+        messages = temp_stderr.getvalue().splitlines()
+
+        self.assertEqual('', stream.getvalue())
+        self.assertEqual('Error: Something failed', messages[0])
+        self.assertEqual("The following issues couldn't be found: 3, 4",
+                         messages[1])
+        self.assertTrue(messages[2].startswith('Read from the local mirror'))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            RecordPrinter('xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import sys
+import unittest
+from unittest import mock
+from requests.exceptions import ConnectionError, RequestException
+from gitssue.request.request_exception import get_request_exception
+
+
+class RequestExceptionTest(unittest.TestCase):
+
+    def test_imported_requests(self):
+        self.assertIs(RequestException, get_request_exception())
+
+        try:
+            raise ConnectionError('Connection refused')
+        except get_request_exception() as exception:
+            self.assertEqual('Connection refused', str(exception))
+
+    def test_not_imported_requests(self):
+        with mock.patch.dict(sys.modules):
+            del sys.modules['requests.exceptions']
+
+            exception_class = get_request_exception()
+
+        self.assertFalse(issubclass(ConnectionError, exception_class))
+        self.assertFalse(issubclass(ValueError, exception_class))
@@ -1,7 +1,13 @@
+import os
+import shutil
+import tempfile
+import time
 import unittest
 from unittest import mock
-from requests.exceptions import RequestException
+from requests.exceptions import ConnectionError, RequestException
 from gitssue.request.requests import Requests
+from gitssue.request.retry_policy import RetryPolicy
+from gitssue.timings.timings import Timings
 from gitssue.request.unsuccessful_http_request_exception import UnsuccessfulHttpRequestException
 
 
@@ -10,7 +16,7 @@ class RequestsTest(unittest.TestCase):
     def setUp(self):
         self.requests = Requests()
 
-    @mock.patch('requests.request')
+    @mock.patch('requests.Session.request')
     def test_request(self, requests_get_mock):
         response_mock = mock.Mock()
         mocked_return = """
@@ -27,7 +33,7 @@ class RequestsTest(unittest.TestCase):
         attributes = {
             'ok': True,
             'status_code': 200,
-            'text': mocked_return,
+            'iter_content.return_value': [mocked_return.encode()],
             'close.return_value': None,
         }
         response_mock.configure_mock(**attributes)
@@ -38,7 +44,7 @@ class RequestsTest(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
-    @mock.patch('requests.request')
+    @mock.patch('requests.Session.request')
     def test_request_status_not_200(self, requests_get_mock):
         response_mock = mock.Mock()
 
@@ -53,14 +59,14 @@ class RequestsTest(unittest.TestCase):
         with self.assertRaises(UnsuccessfulHttpRequestException):
             self.requests.request('GET', 'some request')
 
-    @mock.patch('requests.request')
+    @mock.patch('requests.Session.request')
     def test_request_request_exception(self, requests_get_mock):
         requests_get_mock.side_effect = RequestException
 
         with self.assertRaises(RequestException):
             self.requests.request('GET', 'some request')
 
-    @mock.patch('requests.request')
+    @mock.patch('requests.Session.request')
     def test_request_with_authentication(self, requests_get_mock):
         response_mock = mock.Mock()
         mocked_return = """
@@ -76,7 +82,7 @@ class RequestsTest(unittest.TestCase):
 
         attributes = {
             'status_code': 200,
-            'text': mocked_return,
+            'iter_content.return_value': [mocked_return.encode()],
             'close.return_value': None,
         }
         response_mock.configure_mock(**attributes)
@@ -89,3 +95,314 @@ class RequestsTest(unittest.TestCase):
         actual = self.requests.request('GET', 'some request', credentials)
 
         self.assertEqual(expected, actual)
+
+    @mock.patch('requests.Session.request')
+    def test_request_records_rate_limit(self, requests_mock):
+        reset = int(time.time()) + 3600
+        response_mock = mock.Mock()
+        response_mock.configure_mock(**{
+            'ok': False,
+            'status_code': 403,
+            'text': '{}',
+            'headers': {
+                'X-RateLimit-Limit': '60',
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': str(reset),
+            },
+        })
+        requests_mock.return_value = response_mock
+        credentials = {'username': 'user', 'password': 'pass'}
+
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            self.requests.request('GET', 'https://api.github.com/rate_limit',
+                                  credentials)
+
+        expected = 60, 0, reset
+        actual = self.requests.get_rate_limit('https://api.github.com',
+                                              credentials)
+
+        self.assertEqual(expected, actual)
+        self.assertIsNone(self.requests.get_rate_limit(
+            'https://api.github.com'
+        ))
+
+    @mock.patch('time.sleep')
+    @mock.patch('requests.Session.request')
+    def test_request_retried(self, requests_mock, sleep_mock):
+        failed_response = mock.Mock()
+        failed_response.configure_mock(**{
+            'ok': False,
+            'status_code': 502,
+            'text': 'Bad gateway',
+            'headers': {},
+        })
+        response = mock.Mock()
+        response.configure_mock(**{
+            'ok': True,
+            'status_code': 200,
+            'iter_content.return_value': [b'{"number": 1}'],
+            'headers': {},
+        })
+        requests_mock.side_effect = [
+            ConnectionError('Connection reset'), failed_response, response
+        ]
+
+        with self.assertLogs('gitssue.request.requests', 'WARNING') as logs:
+            actual = self.requests.request('GET', 'https://api.github.com')
+
+        self.assertEqual({'number': 1}, actual)
+        self.assertEqual(3, requests_mock.call_count)
+        self.assertEqual(2, sleep_mock.call_count)
+        self.assertEqual(2, len(logs.output))
+        self.assertIn('ConnectionError', logs.output[0])
+        self.assertIn('HTTP 502', logs.output[1])
+
+    @mock.patch('time.sleep')
+    @mock.patch('requests.Session.request')
+    def test_request_retries_exhausted(self, requests_mock, sleep_mock):
+        self.requests.configure(retry_policy=RetryPolicy(max_retries=2))
+        requests_mock.side_effect = ConnectionError('Connection refused')
+
+        with self.assertRaises(ConnectionError):
+            self.requests.request('GET', 'https://api.github.com')
+
+        self.assertEqual(3, requests_mock.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch('requests.Session.request')
+    def test_request_post_not_retried(self, requests_mock, sleep_mock):
+        response = mock.Mock()
+        response.configure_mock(**{
+            'ok': False,
+            'status_code': 502,
+            'text': 'Bad gateway',
+            'headers': {},
+        })
+        requests_mock.return_value = response
+
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            self.requests.request('POST', 'https://api.github.com/issues',
+                                  json_payload={'title': 'title'})
+
+        self.assertEqual(1, requests_mock.call_count)
+        sleep_mock.assert_not_called()
+
+    @mock.patch('requests.Session.request')
+    def test_request_timings(self, requests_mock):
+        timings = Timings(enabled=True)
+        self.requests = Requests(timings=timings)
+        response_mock = mock.Mock()
+        response_mock.configure_mock(**{
+            'ok': True,
+            'status_code': 200,
+            'iter_content.return_value': [b'{"number": 1}'],
+            'headers': {},
+        })
+        failed_response_mock = mock.Mock()
+        failed_response_mock.configure_mock(**{
+            'ok': False,
+            'status_code': 404,
+            'text': '{}',
+            'headers': {},
+        })
+        requests_mock.side_effect = [response_mock, failed_response_mock]
+
+        self.requests.request('GET', 'https://api.github.com/issues/1')
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            self.requests.request('GET', 'https://api.github.com/issues/2')
+
+        steps = {(step['category'], step['name']): step
+                 for step in timings.get_summary()}
+        http_step = steps[('http', 'GET api.github.com/issues/{n}')]
+
+        self.assertEqual(2, http_step['calls'])
+        self.assertEqual({200: 1, 404: 1}, http_step['statuses'])
+        self.assertEqual(13, http_step['size'])
+        self.assertEqual(1, steps[('json', 'decode')]['calls'])
+
+    def test_session_is_reused(self):
+        session = self.requests.session
+
+        self.assertIs(session, self.requests.session)
+
+    def test_configure(self):
+        session = self.requests.session
+
+        self.requests.configure(pool_size=3, keep_alive=False)
+
+        self.assertIsNot(session, self.requests.session)
+        self.assertEqual(3, self.requests.session.get_adapter(
+            'https://api.github.com')._pool_maxsize)
+        self.assertEqual('close',
+                         self.requests.session.headers['Connection'])
+
+    @mock.patch('requests.Session.request')
+    def test_request_pages(self, requests_mock):
+        first_page = mock.Mock()
+        first_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [b'[1, 2]'],
+            'links': {'next': {'url': 'second page'}},
+        })
+        second_page = mock.Mock()
+        second_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [b'[3]'],
+            'links': {},
+        })
+        requests_mock.side_effect = [first_page, second_page]
+
+        expected = [[1, 2], [3]]
+        actual = list(self.requests.request_pages('GET', 'first page'))
+
+        self.assertEqual(expected, actual)
+        self.assertEqual('second page', requests_mock.call_args[0][1])
+
+    @mock.patch('requests.Session.request')
+    def test_request_pages_fields(self, requests_mock):
+        response_mock = mock.Mock()
+        response_mock.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [
+                b'[{"number": 1, "user": {"login": "us',
+                b'er"}, "labels": [{"name": "bug", "id": 1}]}]',
+            ],
+            'links': {},
+        })
+        requests_mock.return_value = response_mock
+
+        expected = [[{'number': 1, 'labels': [{'name': 'bug'}]}]]
+        actual = list(self.requests.request_pages(
+            'GET', 'first page', fields=('number', 'labels.name')
+        ))
+
+        self.assertEqual(expected, actual)
+        self.assertTrue(requests_mock.call_args[1]['stream'])
+        response_mock.close.assert_called_once_with()
+
+    @mock.patch('requests.Session.request')
+    def test_request_pages_fields_next_in_body(self, requests_mock):
+        first_page = mock.Mock()
+        first_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [
+                b'{"values": [{"id": 1, "title": "first"}], "next": "second"}'
+            ],
+            'links': {},
+        })
+        second_page = mock.Mock()
+        second_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [
+                b'{"values": [{"id": 2, "title": "second"}]}'
+            ],
+            'links': {},
+        })
+        requests_mock.side_effect = [first_page, second_page]
+
+        expected = [{'values': [{'id': 1}]}, {'values': [{'id': 2}]}]
+        actual = list(self.requests.request_pages('GET', 'first',
+                                                  fields=('values.id',)))
+
+        self.assertEqual(expected, actual)
+
+    @mock.patch('requests.Session.request')
+    def test_request_invalid_body_closes_response(self, requests_mock):
+        response_mock = mock.Mock()
+        response_mock.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [b'[{"number": 1}'],
+            'links': {},
+        })
+        requests_mock.return_value = response_mock
+
+        with self.assertRaises(ValueError):
+            self.requests.request('GET', 'some request')
+
+        response_mock.close.assert_called_once_with()
+
+    @mock.patch('requests.Session.request')
+    @mock.patch('time.sleep')
+    def test_request_pages_status_not_200(self, sleep_mock, requests_mock):
+        response_mock = mock.Mock()
+        response_mock.configure_mock(**{
+            'ok': False,
+            'status_code': 500,
+            'headers': {},
+        })
+        requests_mock.return_value = response_mock
+
+        with self.assertRaises(UnsuccessfulHttpRequestException):
+            list(self.requests.request_pages('GET', 'some request'))
+
+    @mock.patch('requests.Session.request')
+    def test_request_pages_next_in_body(self, requests_mock):
+        first_page = mock.Mock()
+        first_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [b'{"values": [1], "next": "second page"}'],
+            'links': {},
+        })
+        second_page = mock.Mock()
+        second_page.configure_mock(**{
+            'ok': True,
+            'iter_content.return_value': [b'{"values": [2]}'],
+            'links': {},
+        })
+        requests_mock.side_effect = [first_page, second_page]
+
+        expected = [{'values': [1], 'next': 'second page'}, {'values': [2]}]
+        actual = list(self.requests.request_pages('GET', 'first page'))
+
+        self.assertEqual(expected, actual)
+
+    @mock.patch('requests.Session.request')
+    def test_request_not_modified_served_from_cache(self, requests_mock):
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_directory)
+        requests = Requests(cache_directory=cache_directory)
+
+        first_response = mock.Mock()
+        first_response.configure_mock(**{
+            'ok': True,
+            'status_code': 200,
+            'iter_content.return_value': [b'[1, 2]'],
+            'links': {},
+            'headers': {'ETag': '"etag"'},
+        })
+        not_modified_response = mock.Mock()
+        not_modified_response.configure_mock(**{
+            'ok': True,
+            'status_code': 304,
+            'text': '',
+            'links': {},
+            'headers': {},
+        })
+        requests_mock.side_effect = [first_response, not_modified_response]
+
+        self.assertEqual([1, 2], requests.request('GET', 'some request'))
+        self.assertEqual([1, 2], requests.request('GET', 'some request'))
+
+        sent_headers = requests_mock.call_args[1]['headers']
+        self.assertEqual('"etag"', sent_headers['If-None-Match'])
+
+    @mock.patch('requests.Session.request')
+    def test_request_time_cursor_not_cached(self, requests_mock):
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_directory)
+        requests = Requests(cache_directory=cache_directory)
+
+        response = mock.Mock()
+        response.configure_mock(**{
+            'ok': True,
+            'status_code': 200,
+            'iter_content.return_value': [b'[1, 2]'],
+            'links': {},
+            'headers': {'ETag': '"etag"'},
+        })
+        requests_mock.return_value = response
+
+        self.assertEqual([1, 2], requests.request('GET', 'issues?since=now'))
+
+        self.assertEqual([], os.listdir(cache_directory))
+        self.assertEqual({}, requests_mock.call_args[1]['headers'])
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from gitssue.request.response_cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.directory + '/http')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_not_cached(self):
+        self.assertIsNone(self.cache.get('unknown'))
+
+    def test_set_and_get(self):
+        entry = {
+            'etag': '"abc"',
+            'last_modified': None,
+            'body': [{'number': 1}],
+            'next': None,
+        }
+
+        self.cache.set('key', entry)
+
+        self.assertEqual(entry, self.cache.get('key'))
+
+    def test_key_depends_on_credentials(self):
+        first_key = ResponseCache.key('url', {'username': 'first'})
+        second_key = ResponseCache.key('url', {'username': 'second'})
+        headers_key = ResponseCache.key('url', headers={'PRIVATE-TOKEN': 'x'})
+
+        self.assertNotEqual(first_key, second_key)
+        self.assertNotEqual(ResponseCache.key('url'), headers_key)
+        self.assertEqual(first_key, ResponseCache.key('url',
+                                                      {'username': 'first'}))
+
+    def test_key_depends_on_fields(self):
+        fields_key = ResponseCache.key('url', fields=('number', 'title'))
+
+        self.assertNotEqual(ResponseCache.key('url'), fields_key)
+        self.assertEqual(fields_key,
+                         ResponseCache.key('url', fields=('title', 'number')))
+
+    def test_is_cacheable(self):
+        self.assertTrue(ResponseCache.is_cacheable(
+            'https://api.github.com/repos/a/b/issues?state=all&page=2'
+        ))
+        self.assertFalse(ResponseCache.is_cacheable(
+            'https://api.github.com/repos/a/b/issues?state=all'
+            '&since=2018-01-01T00%3A00%3A00Z'
+        ))
+        self.assertFalse(ResponseCache.is_cacheable(
+            'https://gitlab.com/api/v4/projects/1/issues?state=all'
+            '&updated_after=2018-01-01T00%3A00%3A00Z'
+        ))
+        self.assertFalse(ResponseCache.is_cacheable(
+            'https://api.bitbucket.org/2.0/repositories/a/b/issues'
+            '?sort=updated_on&q=updated_on%20%3E%3D%202018-01-01'
+        ))
+        self.assertTrue(ResponseCache.is_cacheable(
+            'https://api.bitbucket.org/2.0/repositories/a/b/issues'
+            '?sort=updated_on&q=state%3D%22new%22'
+        ))
+
+    def test_set_prunes_unused_entries(self):
+        self.cache.set('old', {'body': 'old'})
+        self.cache.set('used', {'body': 'used'})
+        old_time = time.time() - ResponseCache.DEFAULT_MAX_AGE - 60
+        os.utime(os.path.join(self.cache.directory, 'old.json'),
+                 (old_time, old_time))
+        os.utime(os.path.join(self.cache.directory, 'used.json'),
+                 (old_time, old_time))
+        self.assertEqual({'body': 'used'}, self.cache.get('used'))
+
+        cache = ResponseCache(self.cache.directory)
+        cache.set('new', {'body': 'new'})
+
+        self.assertIsNone(cache.get('old'))
+        self.assertEqual({'body': 'used'}, cache.get('used'))
+        self.assertEqual({'body': 'new'}, cache.get('new'))
+
+    def test_prune_without_directory(self):
+        self.cache.prune()
+
+        self.assertFalse(os.path.exists(self.cache.directory))
@@ -0,0 +1,122 @@
+import random
+import time
+import unittest
+from unittest import mock
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+from gitssue.request.retry_policy import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.retry_policy = RetryPolicy(random_generator=random.Random(0))
+
+    def response(self, status_code, headers=None, text=''):
+        response = mock.Mock()
+        response.configure_mock(**{
+            'status_code': status_code,
+            'headers': headers or {},
+            'text': text,
+        })
+
+        return response
+
+    def test_backoff_is_exponential_with_jitter(self):
+        for retries in range(4):
+            delay = self.retry_policy.get_delay('GET', retries, 0,
+                                                self.response(503))
+            backoff = RetryPolicy.DEFAULT_BACKOFF * 2 ** retries
+
+            self.assertGreaterEqual(delay, backoff / 2)
+            self.assertLessEqual(delay, backoff)
+
+    def test_backoff_is_capped(self):
+        retry_policy = RetryPolicy(max_retries=20, max_backoff=10)
+
+        delay = retry_policy.get_delay('GET', 15, 0, self.response(503))
+
+        self.assertLessEqual(delay, 10)
+
+    def test_max_retries(self):
+        self.assertIsNone(self.retry_policy.get_delay(
+            'GET', RetryPolicy.DEFAULT_MAX_RETRIES, 0, self.response(503)
+        ))
+
+    def test_max_time(self):
+        self.assertIsNone(self.retry_policy.get_delay(
+            'GET', 0, RetryPolicy.DEFAULT_MAX_TIME, self.response(503)
+        ))
+
+    def test_not_retryable_status(self):
+        for status_code in (400, 401, 403, 404, 422):
+            self.assertIsNone(self.retry_policy.get_delay(
+                'GET', 0, 0, self.response(status_code)
+            ))
+
+    def test_server_error_not_retried_for_non_idempotent(self):
+        for method in ('POST', 'PATCH'):
+            self.assertIsNone(self.retry_policy.get_delay(
+                method, 0, 0, self.response(500)
+            ))
+
+    def test_connection_error(self):
+        self.assertIsNotNone(self.retry_policy.get_delay(
+            'GET', 0, 0, exception=ConnectionError()
+        ))
+        self.assertIsNotNone(self.retry_policy.get_delay(
+            'GET', 0, 0, exception=ReadTimeout()
+        ))
+        self.assertIsNone(self.retry_policy.get_delay(
+            'POST', 0, 0, exception=ConnectionError()
+        ))
+        self.assertIsNone(self.retry_policy.get_delay(
+            'POST', 0, 0, exception=ReadTimeout()
+        ))
+
+    def test_connect_timeout_retried_for_non_idempotent(self):
+        self.assertIsNotNone(self.retry_policy.get_delay(
+            'POST', 0, 0, exception=ConnectTimeout()
+        ))
+
+    def test_retry_after(self):
+        delay = self.retry_policy.get_delay(
+            'POST', 0, 0, self.response(429, {'Retry-After': '20'})
+        )
+
+        self.assertAlmostEqual(20, delay, delta=1)
+
+    def test_retry_after_longer_than_max_time(self):
+        self.assertIsNone(self.retry_policy.get_delay(
+            'GET', 0, 0, self.response(429, {'Retry-After': '3600'})
+        ))
+
+    def test_secondary_rate_limit(self):
+        delay = self.retry_policy.get_delay('POST', 0, 0, self.response(
+            403, text='You have exceeded a secondary rate limit.'
+        ))
+
+        self.assertEqual(60, delay)
+
+    def test_rate_limit_reached(self):
+        reset = int(time.time()) + 30
+
+        delay = self.retry_policy.get_delay('GET', 0, 0, self.response(403, {
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': str(reset),
+        }))
+
+        self.assertAlmostEqual(30, delay, delta=1)
+
+    def test_rate_limit_reached_resets_later(self):
+        reset = int(time.time()) + 3600
+
+        self.assertIsNone(self.retry_policy.get_delay(
+            'GET', 0, 0, self.response(403, {
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': str(reset),
+            })
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
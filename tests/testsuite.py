@@ -5,15 +5,34 @@ from unittest import makeSuite
 
 from controller_test import ControllerTest
 from git_wrapper_test import GitWrapperTest
+from git_config_test import GitConfigTest
 from github_test import GithubTest
 from gitlab_test import GitlabTest
 from bitbucket_test import BitbucketTest
 from printer_test import PrinterTest
+from issue_test import IssueTest
+from label_pool_test import LabelPoolTest
+from output_buffer_test import OutputBufferTest
+from record_printer_test import RecordPrinterTest
 from shell_wrapper_test import ShellWrapperTest
 from requests_test import RequestsTest
+from json_stream_decoder_test import JsonStreamDecoderTest
+from json_projection_test import JsonProjectionTest
+from response_cache_test import ResponseCacheTest
+from rate_limit_budget_test import RateLimitBudgetTest
+from retry_policy_test import RetryPolicyTest
+from request_exception_test import RequestExceptionTest
+from issue_mirror_test import IssueMirrorTest
 from colorconsole_color_printer_test import ColorConsoleColorPrinterTest
 from config_reader_test import ConfigReaderTest
 from dependencies_test import DependenciesTest
+from timings_test import TimingsTest
+from gitssue_test import GitssueTest
+
+# The asyncio API uses "async def", which requires Python 3.5.
+if sys.version_info >= (3, 5):
+    from async_remote_test import AsyncRemoteTest
+    from async_requests_test import AsyncRequestsTest
 
 
 def suite():
@@ -21,15 +40,33 @@ def suite():
 
     suite.addTest(makeSuite(ControllerTest))
     suite.addTest(makeSuite(GitWrapperTest))
+    suite.addTest(makeSuite(GitConfigTest))
     suite.addTest(makeSuite(GithubTest))
     suite.addTest(makeSuite(GitlabTest))
     suite.addTest(makeSuite(BitbucketTest))
     suite.addTest(makeSuite(PrinterTest))
+    suite.addTest(makeSuite(IssueTest))
+    suite.addTest(makeSuite(LabelPoolTest))
+    suite.addTest(makeSuite(OutputBufferTest))
+    suite.addTest(makeSuite(RecordPrinterTest))
     suite.addTest(makeSuite(ShellWrapperTest))
     suite.addTest(makeSuite(RequestsTest))
+    suite.addTest(makeSuite(JsonStreamDecoderTest))
+    suite.addTest(makeSuite(JsonProjectionTest))
+    suite.addTest(makeSuite(ResponseCacheTest))
+    suite.addTest(makeSuite(RateLimitBudgetTest))
+    suite.addTest(makeSuite(RetryPolicyTest))
+    suite.addTest(makeSuite(RequestExceptionTest))
+    suite.addTest(makeSuite(IssueMirrorTest))
     suite.addTest(makeSuite(ColorConsoleColorPrinterTest))
     suite.addTest(makeSuite(ConfigReaderTest))
     suite.addTest(makeSuite(DependenciesTest))
+    suite.addTest(makeSuite(TimingsTest))
+    suite.addTest(makeSuite(GitssueTest))
+
+    if sys.version_info >= (3, 5):
+        suite.addTest(makeSuite(AsyncRemoteTest))
+        suite.addTest(makeSuite(AsyncRequestsTest))
 
     return suite
 
@@ -0,0 +1,146 @@
+import threading
+import unittest
+from gitssue.timings.timings import Timings
+
+
+class TimingsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.timings = Timings(enabled=True)
+
+    def get_step(self, category, name):
+        return next(step for step in self.timings.get_summary()
+                    if step['category'] == category and step['name'] == name)
+
+    def test_measure(self):
+        for _ in range(2):
+            with self.timings.measure('git', 'get_remote_domain'):
+                pass
+
+        step = self.get_step('git', 'get_remote_domain')
+
+        self.assertEqual(2, step['calls'])
+        self.assertGreaterEqual(step['total'], step['max'])
+        self.assertEqual(step['total'], step['self'])
+
+    def test_measure_exception(self):
+        with self.assertRaises(ValueError):
+            with self.timings.measure('config', 'read config'):
+                raise ValueError
+
+        self.assertEqual(1, self.get_step('config', 'read config')['calls'])
+
+    def test_measure_nested_not_counted_in_self(self):
+        with self.timings.measure('render', 'print_issue_list'):
+            with self.timings.measure('json', 'decode'):
+                pass
+            self.timings.record_request('GET', 'https://api.github.com/x',
+                                        0.0, 200)
+
+        render = self.get_step('render', 'print_issue_list')
+        json_decode = self.get_step('json', 'decode')
+
+        self.assertGreaterEqual(render['total'], json_decode['total'])
+        self.assertAlmostEqual(render['total'] - json_decode['total'],
+                               render['self'])
+
+    def test_measure_other_thread_not_nested(self):
+        def measure():
+            with self.timings.measure('http', 'other thread'):
+                pass
+
+        with self.timings.measure('render', 'print_issue_list'):
+            thread = threading.Thread(target=measure)
+            thread.start()
+            thread.join()
+
+        render = self.get_step('render', 'print_issue_list')
+
+        self.assertEqual(render['total'], render['self'])
+
+    def test_record_request(self):
+        self.timings.record_request(
+            'GET', 'https://api.github.com/repos/user/repo/issues/1?page=2',
+            0.1, 200, 1024, 'miss'
+        )
+        self.timings.record_request(
+            'GET', 'https://api.github.com/repos/user/repo/issues/2', 0.3, 304,
+            0, 'hit'
+        )
+        self.timings.record_request(
+            'GET', 'https://api.github.com/repos/user/repo/issues/3', 0.2, 404
+        )
+
+        step = self.get_step(
+            'http', 'GET api.github.com/repos/user/repo/issues/{n}'
+        )
+
+        self.assertEqual(3, step['calls'])
+        self.assertAlmostEqual(0.6, step['total'])
+        self.assertAlmostEqual(0.3, step['max'])
+        self.assertEqual(1024, step['size'])
+        self.assertEqual({200: 1, 304: 1, 404: 1}, step['statuses'])
+        self.assertEqual({'hit': 1, 'miss': 1}, step['cache'])
+
+    def test_record_nested_not_counted_in_self(self):
+        with self.timings.measure('render', 'print_issue_list'):
+            self.timings.record('json', 'decode', 10.0)
+
+        render = self.get_step('render', 'print_issue_list')
+
+        self.assertEqual(1, self.get_step('json', 'decode')['calls'])
+        self.assertAlmostEqual(render['total'] - 10.0, render['self'])
+
+    def test_url_template(self):
+        expected = 'gitlab.com/api/v4/projects/user%2Frepo/issues/{n}/notes'
+        actual = Timings.url_template(
+            'https://gitlab.com/api/v4/projects/user%2Frepo/issues/12/notes'
+            '?per_page=100'
+        )
+
+        self.assertEqual(expected, actual)
+
+    def test_summary_order(self):
+        with self.timings.measure('git', 'get_remote_domain'):
+            pass
+        with self.timings.measure('config', 'read config'):
+            pass
+        with self.timings.measure('git', 'get_remote_domain'):
+            pass
+
+        expected = [('git', 'get_remote_domain'), ('config', 'read config')]
+        actual = [(step['category'], step['name'])
+                  for step in self.timings.get_summary()]
+
+        self.assertEqual(expected, actual)
+
+    def test_disabled(self):
+        timings = Timings()
+
+        with timings.measure('git', 'get_remote_domain'):
+            pass
+        timings.record_request('GET', 'https://api.github.com', 0.1, 200)
+
+        self.assertEqual([], timings.get_summary())
+
+    def test_wrap(self):
+        class Printer:
+            name = 'printer'
+
+            def print_error(self, error):
+                return error
+
+        printer = self.timings.wrap(Printer(), 'render')
+
+        self.assertEqual('error', printer.print_error('error'))
+        self.assertEqual('printer', printer.name)
+        self.assertEqual(1, self.get_step('render', 'print_error')['calls'])
+
+    def test_wrap_disabled(self):
+        printer = object()
+
+        self.assertIs(printer, Timings().wrap(printer, 'render'))
+
+
+if __name__ == '__main__':
+    unittest.main()